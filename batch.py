@@ -0,0 +1,222 @@
+"""Run large batches of web searches across worker processes.
+
+Queries are read from a JSONL file (one WebSearchRequest object, or a bare
+query string, per line) or a CSV file whose header names WebSearchRequest
+fields. They are split into chunks that worker processes fetch with their
+own BraveClient. All workers draw from one SharedLimiter and one SqliteCache
+kept in the output directory.
+
+Each finished chunk is written atomically as ``part-<first index>.jsonl``
+(or ``.parquet``), so a rerun skips the chunks already written. Responses
+fetched for a chunk that was interrupted are still in the shared cache and
+are not charged against the quota again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Literal
+
+from pydantic import ValidationError
+
+from cache import DEFAULT_FRESHNESS_TTL, SqliteCache
+from decoding import loads
+from httpobjects import PreparedWebSearchRequest, WebSearchApiResponse, WebSearchRequest
+from lib import BraveApiError, BraveClient
+from ratelimit import SharedLimiter
+from retry import RetryPolicy
+
+log = logging.getLogger(__name__)
+
+OutputFormat = Literal["jsonl", "parquet"]
+
+# Shared limiter and cache files, kept next to the part files
+RATE_BUCKET_FILE = ".rate.bucket"
+CACHE_FILE = ".cache.db"
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    """Settings for a batch run; passed as-is to every worker process."""
+
+    output: str
+    format: OutputFormat = "jsonl"
+    workers: int = 4
+    chunk_size: int = 1000
+    # Requests per second for all workers together
+    rps: float = 1.0
+    # Requests in flight per worker
+    max_concurrent_requests: int = 8
+    api_key: str | None = None
+    api_host: str | None = None
+    # Validate each response against WebSearchApiResponse before writing it
+    validate: bool = False
+    # How long fetched responses stay reusable by a resumed run
+    cache_ttl: float = 30 * 24 * 3600.0
+
+
+@dataclass
+class BatchSummary:
+    chunks_written: int = 0
+    chunks_skipped: int = 0
+    ok: int = 0
+    errors: int = 0
+
+
+def read_queries(path: str) -> Iterator[dict[str, Any]]:
+    """Yield WebSearchRequest fields for each query in a JSONL or CSV file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield {k: v for k, v in row.items() if v not in (None, "")}
+            return
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                yield {"q": item} if isinstance(item, str) else item
+
+
+def part_path(config: BatchConfig, start: int) -> str:
+    return os.path.join(config.output, f"part-{start:09d}.{config.format}")
+
+
+def _parse(body: bytes, validate: bool) -> dict[str, Any]:
+    if validate:
+        WebSearchApiResponse.model_validate_json(body)
+    return loads(body)
+
+
+def _error_record(index: int, query: Any, exc: Exception) -> dict[str, Any]:
+    status = exc.status if isinstance(exc, BraveApiError) else None
+    return {"index": index, "query": query, "ok": False, "status": status, "error": repr(exc), "response": None}
+
+
+async def _fetch_chunk(config: BatchConfig, start: int, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    records: list[dict[str, Any]] = []
+    requests: list[PreparedWebSearchRequest] = []
+    indexes: list[int] = []
+    for index, row in enumerate(rows, start):
+        try:
+            # Rejects rows over the API limits before they use any rate budget
+            requests.append(WebSearchRequest(**row).prepare())
+            indexes.append(index)
+        except ValueError as exc:
+            records.append(_error_record(index, row.get("q"), exc))
+
+    ttl = config.cache_ttl
+    limiter = SharedLimiter(os.path.join(config.output, RATE_BUCKET_FILE), config.rps)
+    cache = SqliteCache(
+        os.path.join(config.output, CACHE_FILE),
+        maxsize=10_000_000,
+        ttl=ttl,
+        freshness_ttl=dict.fromkeys(DEFAULT_FRESHNESS_TTL, ttl),
+    )
+    client = BraveClient(
+        api_key=config.api_key,
+        api_host=config.api_host,
+        max_concurrent_requests=config.max_concurrent_requests,
+        limiter=limiter,
+        cache=cache,
+        retry=RetryPolicy(max_attempts=5),
+        decode_mode="bytes",
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        async for result in client.web_search_many(requests, ordered=False):
+            index = indexes[result.index]
+            query = requests[result.index].request.q
+            if not result.ok:
+                records.append(_error_record(index, query, result.error))
+                continue
+            try:
+                # Parse in a thread so the event loop keeps sending requests
+                data = await loop.run_in_executor(None, _parse, result.response, config.validate)
+            except (ValueError, ValidationError) as exc:
+                records.append(_error_record(index, query, exc))
+                continue
+            records.append(
+                {"index": index, "query": query, "ok": True, "status": 200, "error": None, "response": data}
+            )
+    finally:
+        await client.close()
+        cache.close()
+        limiter.close()
+    records.sort(key=lambda record: record["index"])
+    return records
+
+
+def _write_part(path: str, records: list[dict[str, Any]], format: OutputFormat) -> None:
+    tmp = path + ".tmp"
+    if format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet output requires pyarrow. Install with: pip install pyarrow") from exc
+        columns = {name: [record[name] for record in records] for name in ("index", "query", "ok", "status", "error")}
+        # Responses vary in shape, so they are stored as JSON text
+        columns["response"] = [None if r["response"] is None else json.dumps(r["response"]) for r in records]
+        pq.write_table(pa.table(columns), tmp)
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    os.replace(tmp, path)
+
+
+def run_chunk(config: BatchConfig, start: int, rows: list[dict[str, Any]]) -> tuple[int, int]:
+    """Fetch one chunk and write its part file. Returns (ok, error) counts."""
+    records = asyncio.run(_fetch_chunk(config, start, rows))
+    _write_part(part_path(config, start), records, config.format)
+    ok = sum(record["ok"] for record in records)
+    return ok, len(records) - ok
+
+
+def _chunks(queries: Iterable[dict[str, Any]], size: int) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+    it = iter(queries)
+    start = 0
+    while rows := list(islice(it, size)):
+        yield start, rows
+        start += len(rows)
+
+
+def run_batch(input_path: str, config: BatchConfig) -> BatchSummary:
+    """Run every query in `input_path`, skipping chunks already written."""
+    os.makedirs(config.output, exist_ok=True)
+    # A resumed run keeps its cache but not the previous run's rate or pauses
+    SharedLimiter(os.path.join(config.output, RATE_BUCKET_FILE), config.rps, reset=True).close()
+    summary = BatchSummary()
+    # Spawned workers start clean instead of inheriting the parent's threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(config.workers, mp_context=context) as pool:
+        pending: set[Future[tuple[int, int]]] = set()
+
+        def collect(done: set[Future[tuple[int, int]]]) -> None:
+            for future in done:
+                ok, errors = future.result()
+                summary.chunks_written += 1
+                summary.ok += ok
+                summary.errors += errors
+            log.info("Batch progress: %d chunks written, %d results", summary.chunks_written, summary.ok + summary.errors)
+
+        # Input is read lazily; only a few chunks per worker are held at once
+        for start, rows in _chunks(read_queries(input_path), config.chunk_size):
+            if os.path.exists(part_path(config, start)):
+                summary.chunks_skipped += 1
+                continue
+            if len(pending) >= 2 * config.workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(run_chunk, config, start, rows))
+        if pending:
+            collect(wait(pending).done)
+    return summary
@@ -0,0 +1,271 @@
+"""Benchmark BraveClient hot paths against a local stub server.
+
+Measures request serialization, response parsing, and end-to-end
+``web_search`` / ``summarizer_search`` throughput at several concurrency levels
+and payload sizes. The stub server runs in a separate process so CPU time is
+the client's alone, and each scenario runs in a fresh interpreter so its peak
+RSS is its own rather than the high-water mark of every scenario before it.
+
+Usage:
+  python -m benchmarks.bench_client [--requests 500] [--concurrency 1 8 32 128]
+      [--latency 0.01] [--output results.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pydantic
+
+from benchmarks.payloads import web_search_payload
+from decoding import decode
+from httpobjects import Summarizer, WebSearchApiResponse, WebSearchRequest
+from lib import BraveClient
+from replay import Cassette, Recording, recording_key
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOAD_SIZES = {
+    "small": {"results": 5, "extra_snippets": False},
+    "large": {"results": 20, "extra_snippets": True},
+}
+
+SUMMARY_PAYLOAD = {
+    "type": "summarizer",
+    "status": "complete",
+    "title": "K2",
+    "summary": [{"type": "token", "data": "K2 is the second highest mountain on Earth. " * 20}],
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS. It is a process
+    # high-water mark, hence one process per scenario
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def summarize(latencies: list[float], wall: float, cpu: float) -> dict[str, float]:
+    n = len(latencies)
+    return {
+        "requests": n,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p95_ms": percentile(latencies, 95) * 1e3,
+        "p99_ms": percentile(latencies, 99) * 1e3,
+        "mean_ms": statistics.fmean(latencies) * 1e3,
+        "rps": n / wall if wall else 0.0,
+        "cpu_us_per_request": cpu / n * 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_sync(func: Callable[[], Any], n: int) -> dict[str, float]:
+    latencies = []
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(n):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+
+async def bench_async(
+    call: Callable[[int], Awaitable[Any]], n: int, concurrency: int
+) -> dict[str, float]:
+    """Run `call(i)` for i in range(n) from `concurrency` workers."""
+    latencies: list[float] = []
+    counter = iter(range(n))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - start)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+
+def write_cassette(path: str, size: str) -> None:
+    cassette = Cassette(path)
+    body = json.dumps(web_search_payload(**PAYLOAD_SIZES[size])).encode()
+    cassette.record(recording_key("/res/v1/web/search", {"q": "k2"}), Recording(200, {}, body))
+    cassette.record(
+        recording_key("/res/v1/summarizer/search", {"key": "k2"}),
+        Recording(200, {}, json.dumps(SUMMARY_PAYLOAD).encode()),
+    )
+
+
+class StubServer:
+    """Run stubserver.py in a child process for the duration of a `with` block."""
+
+    def __init__(self, cassette: str, latency: float) -> None:
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            self.port = sock.getsockname()[1]
+        self.args = [
+            sys.executable, os.path.join(ROOT, "stubserver.py"),
+            "--cassette", cassette, "--port", str(self.port), "--latency", str(latency),
+        ]
+
+    def __enter__(self) -> str:
+        self.proc = subprocess.Popen(self.args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("localhost", self.port), timeout=0.1).close()
+                return f"http://localhost:{self.port}"
+            except OSError:
+                time.sleep(0.05)
+        self.proc.kill()
+        raise RuntimeError("stub server did not start")
+
+    def __exit__(self, *exc: Any) -> None:
+        self.proc.terminate()
+        self.proc.wait()
+
+
+async def bench_endpoint(api_host: str, endpoint: str, n: int, concurrency: int) -> dict[str, float]:
+    client = BraveClient(
+        api_key="bench", api_host=api_host, rps=1_000_000, max_concurrent_requests=concurrency
+    )
+    try:
+        if endpoint == "web_search":
+            # Distinct queries so single-flight does not collapse the load
+            async def call(i: int) -> Any:
+                return await client.web_search(WebSearchRequest(q=f"k2 {i}"))
+        else:
+            async def call(i: int) -> Any:
+                return await client.summarizer_search(f"k2 {i}")
+        await call(-1)  # open a connection and build schemas before timing
+        return await bench_async(call, n, concurrency)
+    finally:
+        await client.close()
+
+
+def run_scenario(name: str, requests: int, api_host: str | None = None) -> dict[str, float]:
+    """Run one scenario, e.g. ``parse/small`` or ``web_search/small/c8``, in this process."""
+    kind, _, rest = name.partition("/")
+    if kind == "serialize":
+        request = WebSearchRequest(q="what is the second highest mountain", count=10, extra_snippets=True)
+        return bench_sync(request.prepare, requests * 10)
+    if kind == "parse":
+        if rest == "summarizer":
+            model, raw = Summarizer, json.dumps(SUMMARY_PAYLOAD).encode()
+        else:
+            model, raw = WebSearchApiResponse, json.dumps(web_search_payload(**PAYLOAD_SIZES[rest])).encode()
+        decode(model, raw)  # build the schema before timing
+        return bench_sync(lambda: decode(model, raw), requests)
+    concurrency = int(rest.rpartition("/c")[2])
+    return asyncio.run(bench_endpoint(api_host, kind, requests, concurrency))
+
+
+def run_isolated(name: str, requests: int, api_host: str | None = None) -> dict[str, float]:
+    """Run one scenario in a fresh interpreter and return its results."""
+    cmd = [sys.executable, "-m", "benchmarks.bench_client", "--scenario", name, "--requests", str(requests)]
+    if api_host:
+        cmd += ["--api-host", api_host]
+    proc = subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(proc.stdout)
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+
+    def record(name: str, api_host: str | None = None) -> None:
+        row = results[name] = run_isolated(name, args.requests, api_host)
+        print(f"{name:<32} {format_row(row)}", flush=True)
+
+    record("serialize/prepare")
+    for size in PAYLOAD_SIZES:
+        record(f"parse/{size}")
+    record("parse/summarizer")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in PAYLOAD_SIZES:
+            cassette = os.path.join(tmp, f"{size}.jsonl")
+            write_cassette(cassette, size)
+            with StubServer(cassette, args.latency) as api_host:
+                for endpoint in ("web_search", "summarizer_search"):
+                    if endpoint == "summarizer_search" and size != "small":
+                        continue  # summarizer payloads do not vary with size
+                    for concurrency in args.concurrency:
+                        record(f"{endpoint}/{size}/c{concurrency}", api_host)
+    return results
+
+
+def format_row(row: dict[str, float]) -> str:
+    return (
+        f"p50 {row['p50_ms']:8.2f}ms  p95 {row['p95_ms']:8.2f}ms  p99 {row['p99_ms']:8.2f}ms  "
+        f"{row['rps']:9.0f} req/s  {row['cpu_us_per_request']:8.0f}us cpu/req  "
+        f"rss {row['peak_rss_mb']:6.1f}MB"
+    )
+
+
+def compare(results: dict[str, Any], baseline_path: str) -> None:
+    """Print throughput and CPU changes relative to an earlier results file."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nvs {baseline_path}:")
+    for name, row in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        rps = (row["rps"] / old["rps"] - 1) * 100 if old["rps"] else 0.0
+        cpu = (row["cpu_us_per_request"] / old["cpu_us_per_request"] - 1) * 100
+        print(f"{name:<32} rps {rps:+6.1f}%  cpu/req {cpu:+6.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BraveClient hot paths")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server delay (s)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    # Used by run_isolated to run a single scenario in a child process
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--api-host", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.requests, args.api_host)))
+        return
+    results = run(args)
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pydantic": pydantic.VERSION,
+            "platform": platform.platform(),
+            "args": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
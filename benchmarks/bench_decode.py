@@ -0,0 +1,55 @@
+"""Compare response decoding modes on web search payloads.
+
+Usage:
+  python -m benchmarks.bench_decode [--payload recorded.json] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from benchmarks.payloads import encoded_payloads
+from decoding import JSON_BACKEND, decode
+from httpobjects import WebSearchApiResponse
+
+
+def legacy(raw: bytes) -> WebSearchApiResponse:
+    """The original path: json.loads followed by model_validate."""
+    return WebSearchApiResponse.model_validate(json.loads(raw))
+
+
+def time_per_call(func, raw: bytes, repeat: int) -> float:
+    func(raw)  # warm up schema and caches
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(raw)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload", help="Recorded response body to decode")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    modes = {
+        "legacy": legacy,
+        "validate": lambda raw: decode(WebSearchApiResponse, raw, "validate"),
+        "raw": lambda raw: decode(WebSearchApiResponse, raw, "raw"),
+        # A typical consumer that only reads the web results
+        "lazy-web": lambda raw: decode(WebSearchApiResponse, raw, "lazy").web,
+    }
+    print(f"JSON backend: {JSON_BACKEND}")
+    print(f"{'payload':<10} {'bytes':>9} " + " ".join(f"{m:>10}" for m in modes))
+    for name, raw in encoded_payloads(args.payload).items():
+        timings = [time_per_call(func, raw, args.repeat) for func in modes.values()]
+        print(
+            f"{name:<10} {len(raw):>9} "
+            + " ".join(f"{t * 1e6:>8.0f}us" for t in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
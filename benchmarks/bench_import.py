@@ -0,0 +1,149 @@
+"""Measure the cold import cost of the client modules.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and
+reports the median cumulative import time of each module, the heaviest
+modules it pulls in, and whether heavy optional dependencies (aiohttp, rich,
+aiolimiter) were loaded. Then times the first validation after import, which
+is where the deferred pydantic schema build is now paid.
+
+Usage:
+  python -m benchmarks.bench_import [--modules lib httpobjects] [--runs 7]
+      [--top 8] [--output imports.json] [--compare baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that should only be imported when actually used
+HEAVY_MODULES = ("aiohttp", "rich", "aiolimiter")
+
+FIRST_USE = """
+import time
+start = time.perf_counter()
+from httpobjects import WebSearchApiResponse
+imported = time.perf_counter()
+WebSearchApiResponse.model_validate({"type": "search"})
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map each imported module to its (self, cumulative) time in microseconds."""
+    times: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def bench_module(module: str, runs: int, top: int) -> dict[str, Any]:
+    samples = [import_times(module) for _ in range(runs)]
+    last = samples[-1]
+    heaviest = sorted(
+        (name for name in last if name != module),
+        key=lambda name: last[name][1],
+        reverse=True,
+    )
+    return {
+        "cumulative_ms": statistics.median(s[module][1] for s in samples) / 1000,
+        "self_ms": statistics.median(s[module][0] for s in samples) / 1000,
+        "modules": len(last),
+        "heavy": [name for name in HEAVY_MODULES if name in last],
+        "top": {name: last[name][1] / 1000 for name in heaviest[:top]},
+    }
+
+
+def bench_first_use(runs: int) -> dict[str, float]:
+    imports, validations = [], []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", FIRST_USE], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        imported, validated = map(float, out.split())
+        imports.append(imported)
+        validations.append(validated)
+    return {
+        "import_ms": statistics.median(imports) * 1000,
+        "first_validate_ms": statistics.median(validations) * 1000,
+    }
+
+
+def compare(results: dict[str, Any], baseline_path: str) -> None:
+    """Print import time changes relative to an earlier results file."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nvs {baseline_path}:")
+    for name, row in results.get("modules", {}).items():
+        old = baseline.get("modules", {}).get(name)
+        if not old:
+            continue
+        change = (row["cumulative_ms"] / old["cumulative_ms"] - 1) * 100
+        print(f"{name:<16} {old['cumulative_ms']:7.1f}ms -> {row['cumulative_ms']:7.1f}ms  {change:+6.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["lib", "httpobjects"])
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {"modules": {}}
+    for module in args.modules:
+        row = results["modules"][module] = bench_module(module, args.runs, args.top)
+        heavy = ", ".join(row["heavy"]) or "none"
+        print(
+            f"{module:<16} {row['cumulative_ms']:7.1f}ms cumulative  {row['self_ms']:6.1f}ms self  "
+            f"{row['modules']:4d} modules  heavy deps: {heavy}"
+        )
+        for name, ms in row["top"].items():
+            print(f"    {name:<40} {ms:7.1f}ms")
+
+    first_use = results["first_use"] = bench_first_use(args.runs)
+    print(
+        f"\nhttpobjects import {first_use['import_ms']:.1f}ms, "
+        f"first WebSearchApiResponse validation {first_use['first_validate_ms']:.1f}ms"
+    )
+
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
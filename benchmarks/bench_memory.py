@@ -0,0 +1,88 @@
+"""Compare the memory held per search result by each representation.
+
+Decodes many distinct responses, keeps only their web and discussion
+results in each representation, and reports the traced bytes retained per
+result (the result text itself included).
+
+Usage:
+  python -m benchmarks.bench_memory [--responses 200] [--results 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.payloads import web_search_payload
+from compact import ResultBatch, iter_results
+from decoding import decode, loads
+from httpobjects import WebSearchApiResponse
+
+
+def models(bodies: list[bytes]) -> Any:
+    kept = []
+    for body in bodies:
+        response = decode(WebSearchApiResponse, body)
+        kept.extend(response.web.results)
+        kept.extend(response.discussions.results)
+    return kept
+
+
+def dicts(bodies: list[bytes]) -> Any:
+    kept = []
+    for body in bodies:
+        data = loads(body)
+        kept.extend(data["web"]["results"])
+        kept.extend(data["discussions"]["results"])
+    return kept
+
+
+def records(bodies: list[bytes]) -> Any:
+    return [r for body in bodies for r in iter_results(loads(body)) if r.kind != "news"]
+
+
+def batch(bodies: list[bytes]) -> Any:
+    kept = ResultBatch()
+    for record in records(bodies):
+        kept.append(record)
+    return kept
+
+
+def retained(build: Callable[[list[bytes]], Any], bodies: list[bytes]) -> tuple[int, int]:
+    """Bytes still allocated once `build` returns, and the number of results kept."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build(bodies)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(kept)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=200)
+    parser.add_argument("--results", type=int, default=20, help="Web results per response")
+    args = parser.parse_args()
+
+    bodies = [
+        json.dumps(web_search_payload(results=args.results, extra_snippets=False, seed=seed)).encode()
+        for seed in range(args.responses)
+    ]
+    decode(WebSearchApiResponse, bodies[0])  # build the schema outside the measurement
+
+    baseline = None
+    print(f"{'representation':<16} {'results':>8} {'bytes/result':>13} {'vs models':>10}")
+    for name, build in (("models", models), ("dicts", dicts), ("records", records), ("batch", batch)):
+        size, count = retained(build, bodies)
+        per_result = size / count
+        baseline = baseline or per_result
+        print(f"{name:<16} {count:>8} {per_result:>13.0f} {per_result / baseline:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare validation time of a response model union with and without its discriminator.
+
+The response models in ``httpobjects_gen.py`` are produced by
+``docs/utils/generate_models.py``, with unions discriminated on their
+``type``/``subtype`` literals. This times the infobox union validated both
+ways; ``python -m benchmarks.bench_decode`` times whole responses.
+
+Usage:
+  python -m benchmarks.bench_models [--count 50] [--repeat 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Any, Union
+
+from pydantic import TypeAdapter
+
+import httpobjects_gen
+from benchmarks.bench_decode import time_per_call
+
+INFOBOX_TYPES = (
+    httpobjects_gen.GenericInfobox,
+    httpobjects_gen.QAInfobox,
+    httpobjects_gen.InfoboxPlace,
+    httpobjects_gen.InfoboxWithLocation,
+    httpobjects_gen.EntityInfobox,
+)
+
+
+def _infobox(i: int, subtype: str) -> dict[str, Any]:
+    base = {
+        "title": f"Entity {i}",
+        "url": f"https://example.com/{i}",
+        "is_source_local": False,
+        "is_source_both": False,
+        "family_friendly": True,
+    }
+    infobox: dict[str, Any] = {**base, "type": "infobox", "subtype": subtype, "position": i}
+    if subtype == "code":
+        infobox["data"] = {"question": "How?", "answer": {"text": "Like this."}}
+    elif subtype == "location":
+        infobox.update(is_location=True, zoom_level=12)
+    elif subtype == "place":
+        infobox["location"] = {
+            **base,
+            "type": "location_result",
+            "provider_url": f"https://maps.example.com/{i}",
+            "zoom_level": 14,
+        }
+    return infobox
+
+
+def infobox_payload(count: int = 50) -> bytes:
+    """Infoboxes cycling through the subtypes, last union member first."""
+    subtypes = ["entity", "location", "place", "code", "generic"]
+    return json.dumps([_infobox(i, subtypes[i % len(subtypes)]) for i in range(count)]).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50, help="Infoboxes in the payload")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    raw = infobox_payload(args.count)
+    smart = TypeAdapter(list[Union[INFOBOX_TYPES]]).validate_json
+    discriminated = TypeAdapter(httpobjects_gen.GraphInfobox.model_fields["results"].annotation).validate_json
+    print(f"{len(json.loads(raw))} infoboxes ({len(raw)} bytes)")
+    print(f"{'union, tried in turn':<26} {time_per_call(smart, raw, args.repeat) * 1e6:>8.0f}us")
+    print(f"{'union, discriminated':<26} {time_per_call(discriminated, raw, args.repeat) * 1e6:>8.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Representative Brave Search response payloads for benchmarks.
+
+The generated payloads follow the shape of recorded `res/v1/web/search`
+responses: every section is populated, and `extra_snippets` inflates each
+result the same way it does on the live API. Pass a recorded response with
+``--payload`` to any benchmark to measure that instead.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+WORDS = (
+    "mountain climbing k2 himalaya summit expedition route weather base camp "
+    "oxygen altitude karakoram pakistan china everest ascent glacier ridge"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _meta_url(rng: random.Random, host: str, path: str) -> dict[str, Any]:
+    return {
+        "scheme": "https",
+        "netloc": host,
+        "hostname": host,
+        "favicon": f"https://imgs.search.brave.com/{rng.getrandbits(64):x}/{host}",
+        "path": f"› {path.strip('/').replace('/', ' › ')}",
+    }
+
+
+def _result(rng: random.Random, i: int, kind: str, extra_snippets: bool) -> dict[str, Any]:
+    host = f"www.site{rng.randrange(50)}.com"
+    path = f"/{rng.choice(WORDS)}/{rng.choice(WORDS)}-{i}"
+    result: dict[str, Any] = {
+        "title": _sentence(rng, 8),
+        "url": f"https://{host}{path}",
+        "is_source_local": False,
+        "is_source_both": False,
+        "description": _sentence(rng, 40),
+        "page_age": "2024-05-10T00:00:00",
+        "profile": {
+            "name": host,
+            "url": f"https://{host}",
+            "long_name": host,
+            "img": f"https://imgs.search.brave.com/{rng.getrandbits(64):x}",
+        },
+        "language": "en",
+        "family_friendly": True,
+        "type": kind,
+        "subtype": "generic",
+        "is_live": False,
+        "meta_url": _meta_url(rng, host, path),
+        "thumbnail": {
+            "src": f"https://imgs.search.brave.com/{rng.getrandbits(64):x}",
+            "original": f"https://{host}/img/{i}.jpg",
+            "logo": False,
+        },
+        "age": "May 10, 2024",
+    }
+    if kind == "news_result":
+        result["breaking"] = False
+    if kind == "video_result":
+        result["video"] = {"duration": "12:34", "views": str(rng.randrange(10**6)), "creator": host}
+    if extra_snippets:
+        result["extra_snippets"] = [_sentence(rng, 30) for _ in range(5)]
+    return result
+
+
+def web_search_payload(
+    results: int = 20, extra_snippets: bool = True, seed: int = 0
+) -> dict[str, Any]:
+    """Build a full web search response with `results` items per section."""
+    rng = random.Random(seed)
+    discussions = [_result(rng, i, "discussion", extra_snippets) for i in range(results // 4)]
+    for item in discussions:
+        item["data"] = {
+            "forum_name": "Reddit",
+            "num_answers": rng.randrange(200),
+            "score": str(rng.randrange(1000)),
+            "title": item["title"],
+            "question": _sentence(rng, 20),
+            "top_comment": _sentence(rng, 40),
+        }
+    faq = [
+        {
+            "question": _sentence(rng, 10),
+            "answer": _sentence(rng, 40),
+            "title": _sentence(rng, 6),
+            "url": f"https://faq.example.com/{i}",
+            "meta_url": _meta_url(rng, "faq.example.com", f"/{i}"),
+        }
+        for i in range(5)
+    ]
+    return {
+        "type": "search",
+        "query": {
+            "original": "what is the second highest mountain",
+            "show_strict_warning": False,
+            "is_navigational": False,
+            "is_news_breaking": False,
+            "spellcheck_off": True,
+            "country": "us",
+            "bad_results": False,
+            "should_fallback": False,
+            "postal_code": "",
+            "city": "",
+            "header_country": "",
+            "more_results_available": True,
+            "state": "",
+        },
+        "mixed": {
+            "type": "mixed",
+            "main": [{"type": "web", "index": i, "all": False} for i in range(results)],
+            "top": [],
+            "side": [],
+        },
+        "discussions": {"type": "search", "results": discussions, "mutated_by_goggles": False},
+        "faq": {"type": "faq", "results": faq},
+        "news": {
+            "type": "news",
+            "results": [_result(rng, i, "news_result", extra_snippets) for i in range(results // 2)],
+            "mutated_by_goggles": False,
+        },
+        "videos": {
+            "type": "videos",
+            "results": [_result(rng, i, "video_result", False) for i in range(results // 2)],
+            "mutated_by_goggles": False,
+        },
+        "web": {
+            "type": "search",
+            "results": [_result(rng, i, "search_result", extra_snippets) for i in range(results)],
+            "family_friendly": True,
+        },
+        "summarizer": {"type": "summarizer", "key": f"{{\"query\": \"k2\", \"seed\": {seed}}}"},
+    }
+
+
+def load_payload(path: str) -> bytes:
+    """Read a recorded response body from disk."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def encoded_payloads(path: str | None = None) -> dict[str, bytes]:
+    """Payloads to benchmark: a recorded one if `path` is given, else generated sizes."""
+    if path:
+        return {path: load_payload(path)}
+    return {
+        "small": json.dumps(web_search_payload(results=5, extra_snippets=False)).encode(),
+        "medium": json.dumps(web_search_payload(results=20, extra_snippets=False)).encode(),
+        "large": json.dumps(web_search_payload(results=20, extra_snippets=True)).encode(),
+    }
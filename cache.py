@@ -0,0 +1,208 @@
+"""Response caches for BraveClient keyed on normalized request parameters."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+# Default time-to-live (seconds) for a cached response, per `freshness` value.
+# Narrow freshness windows change quickly, so they expire sooner.
+DEFAULT_FRESHNESS_TTL: dict[str | None, float] = {
+    None: 3600.0,
+    "pd": 900.0,
+    "pw": 3600.0,
+    "pm": 6 * 3600.0,
+    "py": 24 * 3600.0,
+}
+
+
+def cache_key(endpoint: str, params: dict[str, Any]) -> str:
+    """Build a stable cache key from an endpoint name and its query params."""
+    return endpoint + ":" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache(ABC):
+    """Base class for response caches with per-entry TTL and hit/miss counters."""
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        freshness_ttl: dict[str | None, float] | None = None,
+    ) -> None:
+        self._freshness_ttl = dict(DEFAULT_FRESHNESS_TTL)
+        if freshness_ttl:
+            self._freshness_ttl.update(freshness_ttl)
+        if ttl is not None:
+            self._freshness_ttl[None] = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, freshness: str | None) -> float:
+        """Return the TTL to use for a request with the given `freshness`."""
+        if freshness in self._freshness_ttl:
+            return self._freshness_ttl[freshness]
+        # Custom date ranges ("YYYY-MM-DDtoYYYY-MM-DD") are stable once past.
+        return self._freshness_ttl[None]
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached payload for `key`, or None on a miss."""
+        payload = self._get(key)
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    def set(self, key: str, payload: Any, ttl: float) -> None:
+        """Store `payload` under `key` for `ttl` seconds."""
+        if ttl > 0:
+            self._set(key, payload, time.time() + ttl)
+
+    @abstractmethod
+    def _get(self, key: str) -> Any | None:
+        """Return the unexpired payload for `key`, or None."""
+
+    @abstractmethod
+    def _set(self, key: str, payload: Any, expires_at: float) -> None:
+        """Store `payload` under `key` until `expires_at` (a time.time() value)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+
+class MemoryCache(ResponseCache):
+    """In-process LRU cache bounded by entry count."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        freshness_ttl: dict[str | None, float] | None = None,
+    ) -> None:
+        super().__init__(ttl=ttl, freshness_ttl=freshness_ttl)
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _set(self, key: str, payload: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SqliteCache(ResponseCache):
+    """On-disk cache in a SQLite file, evicting least recently used entries.
+
+    Payloads must be bytes (BraveClient caches raw response bodies). The
+    entry count is tracked in memory rather than counted on every insert.
+    Once it passes `maxsize`, the table is recounted (picking up rows other
+    processes added) and the least recently used entries are evicted in one
+    batch, down to `maxsize` less a tenth, so the next recount is that many
+    inserts away.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 100_000,
+        ttl: float | None = None,
+        freshness_ttl: dict[str | None, float] | None = None,
+    ) -> None:
+        super().__init__(ttl=ttl, freshness_ttl=freshness_ttl)
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)"
+        )
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                deleted = self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._count -= deleted.rowcount
+                return None
+            self._db.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (now, key)
+            )
+        return bytes(row[0])
+
+    def _set(self, key: str, payload: Any, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO responses VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            if not inserted.rowcount:
+                self._db.execute(
+                    "UPDATE responses SET payload = ?, expires_at = ?, used_at = ? WHERE key = ?",
+                    (payload, expires_at, now, key),
+                )
+                return
+            self._count += 1
+            if self._count > self._maxsize:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if self._count > self._maxsize:
+            deleted = self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY used_at LIMIT ?)",
+                (self._count - self._maxsize + self._maxsize // 10,),
+            )
+            self._count -= deleted.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._count = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._db.close()
@@ -0,0 +1,58 @@
+"""Command line entry point: ``braveapi <command>``.
+
+Usage:
+  braveapi batch queries.jsonl --output results/ [--format parquet] \\
+      [--workers 4] [--rps 20] [--chunk-size 1000] [--validate]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from batch import BatchConfig, run_batch
+
+
+def _batch(args: argparse.Namespace) -> None:
+    config = BatchConfig(
+        output=args.output,
+        format=args.format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        rps=args.rps,
+        max_concurrent_requests=args.concurrency,
+        api_key=args.api_key,
+        api_host=args.api_host,
+        validate=args.validate,
+    )
+    summary = run_batch(args.input, config)
+    print(
+        f"{summary.chunks_written} chunks written, {summary.chunks_skipped} already done; "
+        f"{summary.ok} ok, {summary.errors} errors"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="braveapi", description="Brave Search API tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Run a file of queries across worker processes")
+    batch.add_argument("input", help="JSONL or CSV file of queries")
+    batch.add_argument("--output", required=True, help="Directory for part files; reruns resume from it")
+    batch.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    batch.add_argument("--workers", type=int, default=4, help="Worker processes")
+    batch.add_argument("--chunk-size", type=int, default=1000, help="Queries per part file")
+    batch.add_argument("--rps", type=float, default=1.0, help="Requests per second across all workers")
+    batch.add_argument("--concurrency", type=int, default=8, help="Requests in flight per worker")
+    batch.add_argument("--api-key", help="Defaults to $BRAVE_API_KEY")
+    batch.add_argument("--api-host")
+    batch.add_argument("--validate", action="store_true", help="Validate responses before writing them")
+    batch.set_defaults(func=_batch)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
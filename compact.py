@@ -0,0 +1,121 @@
+"""Compact representations of search results for keeping millions in memory.
+
+A validated SearchResult carries a per-instance ``__dict__`` plus nested
+MetaUrl, Profile and Thumbnail models. ResultRecord keeps only the fields
+used for deduplication and ranking in a slotted, frozen dataclass, and
+ResultBatch stores them column by column with repeated values (netloc,
+language, subtype, kind) dictionary-encoded.
+
+Both accept a WebSearchApiResponse in any decode mode, including the raw
+dicts of ``decode_mode="raw"``.
+
+Compare the footprint with ``python -m benchmarks.bench_memory``.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# Response sections holding result lists, and the kind recorded for them
+SECTIONS = (("web", "web"), ("discussions", "discussion"), ("news", "news"))
+
+
+def _get(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+@dataclass(frozen=True, slots=True)
+class ResultRecord:
+    kind: str
+    url: str | None
+    title: str | None
+    description: str | None
+    age: str | None
+    netloc: str | None
+    language: str | None
+    subtype: str | None
+
+
+def iter_results(response: Any) -> Iterator[ResultRecord]:
+    """Yield a ResultRecord for every web, discussion and news result."""
+    for section, kind in SECTIONS:
+        for result in _get(_get(response, section), "results") or ():
+            yield ResultRecord(
+                kind,
+                _get(result, "url"),
+                _get(result, "title"),
+                _get(result, "description"),
+                _get(result, "age"),
+                _intern(_get(_get(result, "meta_url"), "netloc")),
+                _intern(_get(result, "language")),
+                _intern(_get(result, "subtype")),
+            )
+
+
+class ResultBatch:
+    """Column-oriented store of results from many responses.
+
+    Text columns are plain lists; netloc, language, subtype and kind are
+    stored as 32-bit codes into one vocabulary shared by all four.
+    """
+
+    TEXT_COLUMNS = ("url", "title", "description", "age")
+    CODED_COLUMNS = ("kind", "netloc", "language", "subtype")
+
+    def __init__(self, responses: Iterable[Any] = ()) -> None:
+        self.vocabulary: list[str | None] = [None]
+        self._codes: dict[str | None, int] = {None: 0}
+        self._text: dict[str, list[str | None]] = {name: [] for name in self.TEXT_COLUMNS}
+        self._coded: dict[str, array] = {name: array("I") for name in self.CODED_COLUMNS}
+        for response in responses:
+            self.extend(response)
+
+    def __len__(self) -> int:
+        return len(self._text["url"])
+
+    def _code(self, value: str | None) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.vocabulary)
+            self.vocabulary.append(value)
+        return code
+
+    def append(self, record: ResultRecord) -> None:
+        for name in self.TEXT_COLUMNS:
+            self._text[name].append(getattr(record, name))
+        for name in self.CODED_COLUMNS:
+            self._coded[name].append(self._code(getattr(record, name)))
+
+    def extend(self, response: Any) -> None:
+        """Add every result of a web search response."""
+        for record in iter_results(response):
+            self.append(record)
+
+    def column(self, name: str) -> list[str | None]:
+        """All values of one column, decoded."""
+        if name in self._text:
+            return list(self._text[name])
+        vocabulary = self.vocabulary
+        return [vocabulary[code] for code in self._coded[name]]
+
+    def __getitem__(self, index: int) -> ResultRecord:
+        vocabulary = self.vocabulary
+        coded = {name: vocabulary[self._coded[name][index]] for name in self.CODED_COLUMNS}
+        text = {name: self._text[name][index] for name in self.TEXT_COLUMNS}
+        return ResultRecord(**coded, **text)
+
+    def __iter__(self) -> Iterator[ResultRecord]:
+        for index in range(len(self)):
+            yield self[index]
@@ -0,0 +1,104 @@
+"""Response body decoding for BraveClient.
+
+Four modes are supported:
+
+* ``"validate"`` (default) parses and validates the raw bytes in one step with
+  pydantic's ``model_validate_json``.
+* ``"raw"`` decodes with the fastest JSON backend available (orjson, then
+  msgspec, then the standard library) and returns plain dicts.
+* ``"lazy"`` decodes with the same backend and wraps web search responses in
+  a LazyWebSearchApiResponse, validating each section on first access.
+* ``"bytes"`` returns the undecoded body, so the caller can parse it later or
+  in another thread (the batch runner does this).
+
+``"validate"`` avoids building an intermediate dict and is the fastest way to
+get models; ``"raw"`` is the cheapest overall (see
+``python -m benchmarks.bench_decode``).
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Callable, Literal
+
+from pydantic import BaseModel
+
+from httpobjects import LazyWebSearchApiResponse, WebSearchApiResponse
+
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        loads = msgspec.json.decode
+    except ImportError:
+        JSON_BACKEND = "json"
+        loads = json.loads
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Content codings the client can decode, advertised in Accept-Encoding
+CONTENT_ENCODINGS: tuple[str, ...] = ("gzip", "br") if brotli is not None else ("gzip",)
+ACCEPT_ENCODING = ", ".join(CONTENT_ENCODINGS)
+
+
+class _BrotliDecompressor:
+    def __init__(self) -> None:
+        self._decompressor = brotli.Decompressor()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if hasattr(self._decompressor, "process"):
+            return self._decompressor.process(chunk)
+        return self._decompressor.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def make_decompressor(encoding: str) -> Any | None:
+    """Return an incremental decompressor for a Content-Encoding, or None for identity."""
+    encoding = encoding.strip().lower()
+    if encoding in ("", "identity"):
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    if encoding == "br" and brotli is not None:
+        return _BrotliDecompressor()
+    raise ValueError(f"Unsupported Content-Encoding {encoding!r}")
+
+
+DecodeMode = Literal["validate", "raw", "lazy", "bytes"]
+DECODE_MODES: tuple[str, ...] = ("validate", "raw", "lazy", "bytes")
+
+# Models with a lazily validated counterpart; others are validated eagerly
+LAZY_MODELS: dict[type[BaseModel], Callable[[dict[str, Any]], Any]] = {
+    WebSearchApiResponse: LazyWebSearchApiResponse,
+}
+
+
+def decode(model: type[BaseModel], raw: bytes, mode: DecodeMode = "validate") -> Any:
+    """Decode a response body into `model` according to `mode`."""
+    if mode == "validate" or (mode == "lazy" and model not in LAZY_MODELS):
+        return model.model_validate_json(raw)
+    if mode == "bytes":
+        return bytes(raw)
+    data = loads(raw)
+    if mode == "raw":
+        return data
+    if mode == "lazy":
+        return LAZY_MODELS[model](data)
+    raise ValueError(f"Unknown decode mode {mode!r}; expected one of {DECODE_MODES}")
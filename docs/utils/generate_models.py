@@ -2,107 +2,262 @@
 """
 Generate Pydantic models from parsed API documentation HTML.
 
+Every documented model is emitted, subclassing its documented parent
+(``SearchResult(Result)``, ``GenericInfobox(AbstractGraphInfobox)``...).
+Fields documented as a union of models become discriminated unions keyed on
+the ``type`` or ``subtype`` literal that tells the members apart, so pydantic
+picks the member to validate from a single lookup instead of trying each one.
+
 Usage:
-  python generate_models.py \
+  python docs/utils/generate_models.py \
       -i docs/raw/parsed_api_docs.html \
       -o httpobjects_gen.py
 """
 
+import argparse
 import re
 import sys
-import argparse
+from dataclasses import dataclass
 
 from bs4 import BeautifulSoup
 
+BASIC_TYPES = {
+    "string": "str",
+    "str": "str",
+    "integer": "int",
+    "int": "int",
+    "number": "float",
+    "float": "float",
+    "boolean": "bool",
+    "bool": "bool",
+    "list": "list",
+}
+
+# Fields whose documented type contradicts the API's actual responses
+SPEC_FIXES = {
+    # Documented as a single infobox, described and returned as a list
+    ("GraphInfobox", "results"): "list[GenericInfobox|QAInfobox|InfoboxPlace|InfoboxWithLocation|EntityInfobox]",
+    # Documented as "generic" only; live results also carry "article", "video"...
+    ("SearchResult", "subtype"): "string",
+}
+
+# Required fields the API leaves out of some responses, and the default to use
+SPEC_DEFAULTS = {
+    ("Discussions", "mutated_by_goggles"): "False",
+}
+
+# Literal fields a union can be discriminated on, in order of preference
+DISCRIMINATORS = ("type", "subtype")
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    raw_type: str
+    required: bool
+    description: str
+
+
+@dataclass
+class ModelSpec:
+    name: str
+    base: str | None
+    description: str
+    fields: list[FieldSpec]
+
+
+# A parsed type: ("name", str) | ("literal", str) | ("list", T) | ("union", [T, ...])
+TypeNode = tuple
+
+
+def parse_type(raw: str) -> TypeNode:
+    """Parse a documented type such as ``list[Product|Review]``."""
+    tokens = re.findall(r'"[^"]*"|\w+|[\[\]|]', raw)
+    node, pos = _parse_union(tokens, 0)
+    if pos != len(tokens):
+        raise ValueError(f"Cannot parse type {raw!r}")
+    return node
+
+
+def _parse_union(tokens: list[str], pos: int) -> tuple[TypeNode, int]:
+    members = []
+    while True:
+        node, pos = _parse_item(tokens, pos)
+        members.append(node)
+        if pos < len(tokens) and tokens[pos] == "|":
+            pos += 1
+            continue
+        break
+    return (members[0] if len(members) == 1 else ("union", members)), pos
+
+
+def _parse_item(tokens: list[str], pos: int) -> tuple[TypeNode, int]:
+    token = tokens[pos]
+    if token.startswith('"'):
+        return ("literal", token.strip('"')), pos + 1
+    if token.lower() == "list" and pos + 1 < len(tokens) and tokens[pos + 1] == "[":
+        inner, pos = _parse_union(tokens, pos + 2)
+        return ("list", inner), pos + 1  # skip "]"
+    return ("name", token), pos + 1
+
+
+def _heading_base(section) -> str | None:
+    heading = section.find("h4")
+    if heading is None:
+        return None
+    # "<span>Name</span> (<a href="#Parent">Parent</a>)"
+    links = [a.get("href", "") for a in heading.find_all("a")]
+    parents = [href[1:] for href in links[1:] if href.startswith("#")]
+    return parents[0] if parents else None
 
-def parse_type(raw: str) -> str:
-    s = raw.strip()
-    # Literal strings in quotes
-    if s.startswith('"') and s.endswith('"'):
-        val = s.strip('"')
-        return f'Literal["{val}"]'
-    # List of items
-    m = re.match(r"list\s*\[\s*(.+?)\s*\]$", s, re.IGNORECASE)
-    if m:
-        inner = m.group(1)
-        # Recursively parse inner type
-        inner_type = parse_type(inner)
-        return f"list[{inner_type}]"
-    # Basic type mappings
-    low = s.lower()
-    if low in ("string", "str"):
-        return "str"
-    if low in ("integer", "int"):
-        return "int"
-    if low in ("number", "float"):
-        return "float"
-    if low in ("boolean", "bool"):
-        return "bool"
-    # Fallback to raw
-    return s
-
-
-def extract_models(
-    soup: BeautifulSoup,
-) -> list[tuple[str, str, list[tuple[str, str, bool, str]]]]:
-    models: list[tuple[str, str, list[tuple[str, str, bool, str]]]] = []
+
+def extract_models(soup: BeautifulSoup) -> list[ModelSpec]:
+    models: list[ModelSpec] = []
     for section in soup.find_all("section", id=True):
         name = section.get("id") or ""
-        # description text
         desc_el = section.find("div", class_="model-description")
-        description = desc_el.get_text(strip=True) if desc_el else ""
+        description = desc_el.get_text(" ", strip=True) if desc_el else ""
+        description = re.sub(r"\s+", " ", description)
         table = section.find("table")
         if not table:
             continue
-        fields: list[tuple[str, str, bool, str]] = []
-        rows = table.find_all("tr")
-        for tr in rows[1:]:
+        fields: list[FieldSpec] = []
+        for tr in table.find_all("tr")[1:]:
             cols = tr.find_all("td")
             if len(cols) < 4:
                 continue
             field = cols[0].get_text(strip=True)
-            raw_type = cols[1].get_text(strip=True)
+            raw_type = SPEC_FIXES.get((name, field), cols[1].get_text(strip=True))
             required = cols[2].get_text(strip=True).lower() == "true"
-            desc = cols[3].get_text(strip=True)
-            ftype = parse_type(raw_type)
-            fields.append((field, ftype, required, desc))
-        models.append((name, description, fields))
+            desc = cols[3].get_text(" ", strip=True)
+            fields.append(FieldSpec(field, raw_type, required, desc))
+        models.append(ModelSpec(name, _heading_base(section), description, fields))
     return models
 
 
-def render_models(
-    models: list[tuple[str, str, list[tuple[str, str, bool, str]]]],
-) -> str:
-    lines: list[str] = []
-    imports: set[str] = {
-        "from __future__ import annotations",
-        "from pydantic import BaseModel",
-    }
-    # detect typing imports
-    for _, _, fields in models:
-        for _, ftype, required, _ in fields:
-            if not required:
-                imports.add("from typing import Optional")
-            if "Literal[" in ftype:
-                imports.add("from typing import Literal")
-            if re.match(r"list\[", ftype):
-                imports.add("from typing import List")
-    # write imports
-    for imp in sorted(imports):
-        lines.append(imp)
-    lines.append("")
+class Renderer:
+    """Turns parsed type trees into annotations, resolving names against the model set."""
+
+    def __init__(self, models: list[ModelSpec]) -> None:
+        self.models = {model.name: model for model in models}
+        self.discriminated = 0
+
+    def inherited_fields(self, name: str) -> dict[str, FieldSpec]:
+        model = self.models[name]
+        fields = self.inherited_fields(model.base) if model.base in self.models else {}
+        fields.update((field.name, field) for field in model.fields)
+        return fields
+
+    def literal(self, model: str, field: str) -> str | None:
+        spec = self.inherited_fields(model).get(field)
+        if spec is None:
+            return None
+        node = self.resolve(parse_type(spec.raw_type), field)
+        return node[1] if node[0] == "literal" else None
+
+    def resolve(self, node: TypeNode, field: str) -> TypeNode:
+        """Classify bare names as models, basic types or unquoted literals."""
+        if node[0] != "name":
+            return node
+        name = node[1]
+        if name in self.models or name.lower() in BASIC_TYPES:
+            return node
+        # The spec writes some constants unquoted, e.g. `type | videos`
+        return ("literal", name)
+
+    def discriminator(self, members: list[TypeNode]) -> str | None:
+        if not all(member[0] == "name" and member[1] in self.models for member in members):
+            return None
+        for field in DISCRIMINATORS:
+            values = [self.literal(member[1], field) for member in members]
+            if None not in values and len(set(values)) == len(values):
+                return field
+        return None
+
+    def render(self, node: TypeNode, field: str) -> str:
+        node = self.resolve(node, field)
+        kind, value = node
+        if kind == "literal":
+            return f'Literal["{value}"]'
+        if kind == "list":
+            return f"list[{self.render(value, field)}]"
+        if kind == "union":
+            union = f"Union[{', '.join(self.render(member, field) for member in value)}]"
+            discriminator = self.discriminator(value)
+            if discriminator is None:
+                return union
+            self.discriminated += 1
+            return f'Annotated[{union}, Field(discriminator="{discriminator}")]'
+        return BASIC_TYPES.get(value.lower(), value)
+
 
-    # render each model
-    for name, description, fields in models:
-        lines.append(f"class {name}(BaseModel):")
-        if description:
-            lines.append(f'    """{description}"""')
-        if not fields:
+def _ordered(models: list[ModelSpec]) -> list[ModelSpec]:
+    """Order models so every parent class is defined before its subclasses."""
+    by_name = {model.name: model for model in models}
+    ordered: list[ModelSpec] = []
+    seen: set[str] = set()
+
+    def visit(model: ModelSpec) -> None:
+        if model.name in seen:
+            return
+        seen.add(model.name)
+        if model.base in by_name:
+            visit(by_name[model.base])
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def render_models(models: list[ModelSpec], source: str = "") -> str:
+    renderer = Renderer(models)
+    lines: list[str] = [
+        f'"""Brave Search API response models generated from {source or "the API docs"}.',
+        "",
+        "Do not edit by hand; regenerate with docs/utils/generate_models.py.",
+        '"""',
+        "",
+        "from __future__ import annotations",
+        "",
+        "from typing import Annotated, Literal, Optional, Union",
+        "",
+        "from pydantic import BaseModel, ConfigDict, Field",
+        "",
+        "",
+        "class _Model(BaseModel):",
+        "    # Build validators on first use rather than at import, as httpobjects does",
+        "    model_config = ConfigDict(defer_build=True)",
+        "",
+    ]
+    ordered = _ordered(models)
+    for model in ordered:
+        base = model.base if model.base in renderer.models else "_Model"
+        lines.append("")
+        lines.append(f"class {model.name}({base}):")
+        if model.description:
+            lines.append(f'    """{model.description}"""')
+        if not model.fields:
             lines.append("    pass")
-        for field, ftype, required, _ in fields:
-            default = "" if required else " = None"
-            lines.append(f"    {field}: {ftype}{default}")
+        for field in model.fields:
+            annotation = renderer.render(parse_type(field.raw_type), field.name)
+            default = SPEC_DEFAULTS.get((model.name, field.name))
+            if default is not None:
+                lines.append(f"    {field.name}: {annotation} = {default}")
+            elif field.required:
+                lines.append(f"    {field.name}: {annotation}")
+            else:
+                lines.append(f"    {field.name}: Optional[{annotation}] = None")
         lines.append("")
+
+    lines.append("")
+    lines.append("# Forward references are resolved against this module when each schema is")
+    lines.append("# first built, so no model_rebuild() is needed here")
+    lines.append("")
+    print(
+        f"Generated {len(ordered)} models with {renderer.discriminated} discriminated unions",
+        file=sys.stderr,
+    )
     return "\n".join(lines)
 
 
@@ -129,7 +284,7 @@ def main() -> None:
         sys.exit(1)
 
     models = extract_models(soup)
-    code = render_models(models)
+    code = render_models(models, source=args.input)
 
     if args.output:
         try:
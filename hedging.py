@@ -0,0 +1,88 @@
+"""Hedged requests: re-send a slow request and keep whichever copy answers first.
+
+Once a request has been on the wire longer than most requests take (the
+policy's percentile of recent latencies), a second identical request is
+sent. The first success wins and the other copy is cancelled.
+
+Each hedge spends rate budget, so hedges draw on a credit that primary
+requests refill: every primary earns ``budget`` credits and a hedge costs
+one. Hedges therefore stay below that share of the traffic, however slow
+the API gets.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to hedge and how much of the rate budget hedges may use.
+
+    The hedge delay is the `percentile` of the last `window` latencies of
+    the endpoint, clamped to ``[min_delay, max_delay]``. Until `min_samples`
+    latencies have been seen it is `initial_delay`. `budget` is the most
+    hedges per primary request, and `burst` caps the credit saved up while
+    no hedges are needed.
+    """
+
+    percentile: float = 95.0
+    initial_delay: float = 1.0
+    min_delay: float = 0.01
+    max_delay: float = 10.0
+    min_samples: int = 20
+    window: int = 1000
+    budget: float = 0.05
+    burst: float = 10.0
+    endpoints: frozenset[str] = frozenset({"web"})
+
+
+class Hedger:
+    """Latency history and hedge credit for one client."""
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self._latencies: dict[str, deque[float]] = {}
+        self._credit = 1.0
+
+    def hedges(self, endpoint: str) -> bool:
+        return endpoint in self.policy.endpoints
+
+    def delay(self, endpoint: str) -> float:
+        """Seconds to wait for a request to `endpoint` before hedging it."""
+        policy = self.policy
+        samples = self._latencies.get(endpoint)
+        if not samples or len(samples) < policy.min_samples:
+            return policy.initial_delay
+        ordered = sorted(samples)
+        value = ordered[min(len(ordered) - 1, int(policy.percentile / 100 * len(ordered)))]
+        return min(policy.max_delay, max(policy.min_delay, value))
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """Record how long a request to `endpoint` took, once sent."""
+        samples = self._latencies.get(endpoint)
+        if samples is None:
+            samples = self._latencies[endpoint] = deque(maxlen=self.policy.window)
+        samples.append(seconds)
+
+    def sent(self) -> None:
+        """Earn hedge credit for a primary request."""
+        self._credit = min(self.policy.burst, self._credit + self.policy.budget)
+
+    def try_hedge(self) -> bool:
+        """Spend one credit on a hedge, if there is one to spend."""
+        # Tolerate rounding, e.g. ten budget=0.1 refills summing to 0.999...
+        if self._credit < 1.0 - 1e-9:
+            return False
+        self._credit -= 1.0
+        return True
+
+    def saved(self, endpoint: str, elapsed: float) -> float:
+        """Estimate the time a winning hedge saved over a primary still running after `elapsed`.
+
+        Uses the mean of recent latencies above `elapsed`, the expected
+        finishing time of a request known to be that slow, or 0 without any.
+        """
+        slower = [s for s in self._latencies.get(endpoint, ()) if s > elapsed]
+        return sum(slower) / len(slower) - elapsed if slower else 0.0
@@ -5,12 +5,35 @@ from __future__ import annotations
 
 
 
-from typing import List, Optional, Literal, Union
-from pydantic import BaseModel
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Literal, Union
+from urllib.parse import urlencode
+
+from pydantic import BaseModel, ConfigDict
+
+from cache import cache_key
+
+
+# Web search request limits from docs/WebRequestSpec.md
+MAX_QUERY_CHARS = 400
+MAX_QUERY_WORDS = 50
+MAX_COUNT = 20
+MAX_OFFSET = 9
+SAFESEARCH_VALUES = ("off", "moderate", "strict")
+UNITS_VALUES = ("metric", "imperial")
+FRESHNESS_PATTERN = re.compile(r"p[dwmy]|\d{4}-\d{2}-\d{2}to\d{4}-\d{2}-\d{2}")
+
+
+class _Model(BaseModel):
+    # Build validators on first use rather than at import, so importing this
+    # module (and lib) stays cheap for short-lived processes
+    model_config = ConfigDict(defer_build=True)
 
 
 # Web Search Request Object (res/v1/web/search)
-class WebSearchRequest(BaseModel):
+class WebSearchRequest(_Model):
     q: str
     country: str = "US"
     count: Optional[int] = 20
@@ -27,180 +50,267 @@ class WebSearchRequest(BaseModel):
     ui_lang: str = "en-US"
     units: Optional[str] = None
 
-
-# ----- Response object stubs and models based on docs/WebResponseSpec.md -----
-
-# Submodel definitions based on ResponseDocsMk2.md
-class ForumData(BaseModel):
-    forum_name: str
-    num_answers: Optional[int] = None
-    score: Optional[str] = None
+    def _limit_problems(self, q: str) -> list[str]:
+        """List every API limit the request breaks, given its collapsed query text."""
+        problems = []
+        if not q:
+            problems.append("q must not be empty")
+        if len(q) > MAX_QUERY_CHARS:
+            problems.append(f"q is {len(q)} characters; the limit is {MAX_QUERY_CHARS}")
+        if q.count(" ") + 1 > MAX_QUERY_WORDS:
+            problems.append(f"q is {q.count(' ') + 1} words; the limit is {MAX_QUERY_WORDS}")
+        if self.count is not None and not 1 <= self.count <= MAX_COUNT:
+            problems.append(f"count must be between 1 and {MAX_COUNT}")
+        if self.offset is not None and not 0 <= self.offset <= MAX_OFFSET:
+            problems.append(f"offset must be between 0 and {MAX_OFFSET}")
+        if self.safesearch is not None and self.safesearch.lower() not in SAFESEARCH_VALUES:
+            problems.append(f"safesearch must be one of {SAFESEARCH_VALUES}")
+        if self.units is not None and self.units.lower() not in UNITS_VALUES:
+            problems.append(f"units must be one of {UNITS_VALUES}")
+        if self.freshness is not None and not FRESHNESS_PATTERN.fullmatch(self.freshness):
+            problems.append("freshness must be pd, pw, pm, py or YYYY-MM-DDtoYYYY-MM-DD")
+        return problems
+
+    def prepare(self) -> PreparedWebSearchRequest:
+        """Check the request against the API limits and encode it once.
+
+        Whitespace in `q` is collapsed and country/language codes are
+        normalized to the case the API uses, so equivalent requests share a
+        key. The query text's case is kept, since operators such as ``OR``
+        depend on it. Raises ValueError listing every limit the request breaks.
+        """
+        q = " ".join(self.q.split())
+        problems = self._limit_problems(q)
+        if problems:
+            raise ValueError("Invalid web search request: " + "; ".join(problems))
+
+        lang, _, region = self.ui_lang.partition("-")
+        normalized = self.model_copy(
+            update={
+                "q": q,
+                "country": self.country.upper(),
+                "search_lang": self.search_lang.lower(),
+                "ui_lang": f"{lang.lower()}-{region.upper()}" if region else lang.lower(),
+                "safesearch": self.safesearch.lower() if self.safesearch else self.safesearch,
+                "units": self.units.lower() if self.units else self.units,
+            }
+        )
+        # Unset and default fields are left out to avoid unwanted params
+        params = normalized.model_dump(exclude_none=True, exclude_defaults=True)
+        for name, value in params.items():
+            if isinstance(value, bool):
+                params[name] = int(value)
+            elif isinstance(value, list):
+                params[name] = tuple(value)
+        return PreparedWebSearchRequest(
+            request=normalized,
+            params=MappingProxyType(params),
+            query_string=urlencode(params, doseq=True),
+            key=cache_key("web", params),
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class PreparedWebSearchRequest:
+    """A WebSearchRequest validated and encoded once, reusable across calls.
+
+    Instances are immutable. They compare and hash by `key`, the canonical
+    cache key of their params, so they can be used directly for dedup.
+    """
+
+    request: WebSearchRequest
+    # Query params as sent, with booleans as 0/1
+    params: Mapping[str, Any]
+    # `params` URL-encoded
+    query_string: str
+    key: str
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, PreparedWebSearchRequest) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def replace(self, **changes: Any) -> PreparedWebSearchRequest:
+        """Prepare a copy of the request with some fields changed."""
+        return self.request.model_copy(update=changes).prepare()
+
+    def page(self, offset: int) -> PreparedWebSearchRequest:
+        """The same request for another results page."""
+        return self.replace(offset=offset)
+
+
+# ----- Response models -----
+
+# Web search response models are generated from the API docs; see
+# docs/utils/generate_models.py
+from httpobjects_gen import (  # noqa: E402, F401
+    FAQ,
+    QA,
+    Answer,
+    DeepResult,
+    DiscussionResult,
+    Discussions,
+    ForumData,
+    GraphInfobox,
+    Language,
+    LocalDescriptionsSearchApiResponse,
+    LocalPoiSearchApiResponse,
+    LocationDescription,
+    LocationResult,
+    Locations,
+    MetaUrl,
+    MixedResponse,
+    News,
+    NewsResult,
+    Profile,
+    QAPage,
+    Query,
+    Result,
+    ResultReference,
+    RichCallbackInfo,
+    Search,
+    SearchResult,
+    Thumbnail,
+    VideoResult,
+    Videos,
+    WebSearchApiResponse,
+)
+from httpobjects_gen import Summarizer as SummarizerKey  # noqa: E402
+
+
+# The summarizer endpoint response, which the API docs leave undocumented
+class SummaryInlineReference(_Model):
+    type: Literal["inline_reference"] = "inline_reference"
+    url: str
+    start_index: Optional[int] = None
+    end_index: Optional[int] = None
+    number: Optional[int] = None
+    favicon: Optional[str] = None
+
+class SummaryEnumItem(_Model):
+    uuid: Optional[str] = None
+    text: Optional[str] = None
+    children: Optional[List[SummaryMessage]] = None
+
+class SummaryMessage(_Model):
+    # "token", "enum_start", "enum_item", "enum_end" or "inline_reference"
+    type: str
+    data: Optional[Union[str, SummaryInlineReference, SummaryEnumItem]] = None
+
+class SummaryContext(_Model):
     title: Optional[str] = None
-    question: Optional[str] = None
-    top_comment: Optional[str] = None
-
-class MetaUrl(BaseModel):
-    scheme: str
-    netloc: str
-    hostname: Optional[str] = None
-    favicon: str
-    path: str
-
-class QA(BaseModel):
-    question: str
-    answer: str
-    title: str
     url: str
     meta_url: Optional[MetaUrl] = None
 
-class Answer(BaseModel):
-    text: str
-    author: Optional[str] = None
-    upvote_count: Optional[int] = None
-    downvote_count: Optional[int] = None
-
-class QAPage(BaseModel):
-    question: str
-    answer: Answer
-
-class GraphInfobox(BaseModel):
-    pass
-
-class LocationResult(BaseModel):
-    pass
-
-class LocationDescription(BaseModel):
-    pass
-
-class DeepResult(BaseModel):
-    pass
-
-class Thumbnail(BaseModel):
-    pass
-
-class Language(BaseModel):
-    pass
-
-class ResultReference(BaseModel):
-    pass
-
-class NewsResult(BaseModel):
-    pass
-
-class VideoResult(BaseModel):
-    pass
-
-class Summarizer(BaseModel):
-    pass
-
-class RichCallbackInfo(BaseModel):
-    pass
-
-# Top-level response models
-class WebSearchApiResponse(BaseModel):
-    type: Literal["search"]
-    discussions: Optional["Discussions"] = None
-    faq: Optional["FAQ"] = None
-    infobox: Optional[GraphInfobox] = None
-    locations: Optional["Locations"] = None
-    mixed: Optional["MixedResponse"] = None
-    news: Optional["News"] = None
-    query: Optional["Query"] = None
-    videos: Optional["Videos"] = None
-    web: Optional["Search"] = None
-    summarizer: Optional[Summarizer] = None
-    rich: Optional[RichCallbackInfo] = None
-
-class LocalPoiSearchApiResponse(BaseModel):
-    type: Literal["local_pois"]
-    results: Optional[List[LocationResult]] = None
-
-class LocalDescriptionsSearchApiResponse(BaseModel):
-    type: Literal["local_descriptions"]
-    results: Optional[List[LocationDescription]] = None
-
-class Query(BaseModel):
-    original: str
-    show_strict_warning: Optional[bool] = None
-    altered: Optional[str] = None
-    safesearch: Optional[bool] = None
-    is_navigational: Optional[bool] = None
-    is_geolocal: Optional[bool] = None
-    local_decision: Optional[str] = None
-    local_locations_idx: Optional[int] = None
-    is_trending: Optional[bool] = None
-    is_news_breaking: Optional[bool] = None
-    ask_for_location: Optional[bool] = None
-    language: Optional[Language] = None
-    spellcheck_off: Optional[bool] = None
-    country: Optional[str] = None
-    bad_results: Optional[bool] = None
-    should_fallback: Optional[bool] = None
-    lat: Optional[str] = None
-    long: Optional[str] = None
-    postal_code: Optional[str] = None
-    city: Optional[str] = None
-    state: Optional[str] = None
-    header_country: Optional[str] = None
-    more_results_available: Optional[bool] = None
-    custom_location_label: Optional[str] = None
-    reddit_cluster: Optional[str] = None
-
-class Discussions(BaseModel):
-    type: Literal["search"]
-    results: List[DiscussionResult]
-    mutated_by_goggles: bool = False
-
-class FAQ(BaseModel):
-    type: Literal["faq"]
-    results: List[QA]
-
-class Search(BaseModel):
-    type: Literal["search"]
-    results: List["SearchResult"]
-    family_friendly: bool
-
-class SearchResult(BaseModel):
-    type: Literal["search_result"]
-    subtype: str
-    is_live: bool
-    deep_results: Optional[DeepResult] = None
-    schemas: Optional[List[List]] = None
-    meta_url: Optional[MetaUrl] = None
-    thumbnail: Optional[Thumbnail] = None
-    age: Optional[str] = None
-    language: str
-    location: Optional[LocationResult] = None
-
-class DiscussionResult(SearchResult):
-    type: Literal["discussion"]
-    data: Optional[ForumData] = None
-
-class Locations(BaseModel):
-    type: Literal["locations"]
-    results: List[LocationResult]
-
-class MixedResponse(BaseModel):
-    type: Literal["mixed"]
-    main: Optional[List[ResultReference]] = None
-    top: Optional[List[ResultReference]] = None
-    side: Optional[List[ResultReference]] = None
-
-class News(BaseModel):
-    type: Literal["news"]
-    results: List[NewsResult]
-    mutated_by_goggles: Optional[bool] = None
-
-class Videos(BaseModel):
-    type: Literal["videos"]
-    results: List[VideoResult]
-    mutated_by_goggles: Optional[bool] = None
-
-# allow forward references
-WebSearchApiResponse.update_forward_refs()
-Search.update_forward_refs()
-Discussions.update_forward_refs()
-
-
-
+class SummaryAnswer(_Model):
+    answer: str
+    score: Optional[float] = None
+    highlight: Optional[Dict[str, Any]] = None
+
+class SummaryImage(_Model):
+    url: Optional[str] = None
+    src: Optional[str] = None
+    alt: Optional[str] = None
+
+class SummaryEntity(_Model):
+    uuid: Optional[str] = None
+    name: Optional[str] = None
+    url: Optional[str] = None
+    text: Optional[str] = None
+    images: Optional[List[SummaryImage]] = None
+    highlight: Optional[List[Dict[str, Any]]] = None
+
+class SummaryEnrichments(_Model):
+    raw: Optional[str] = None
+    images: Optional[List[SummaryImage]] = None
+    qa: Optional[List[SummaryAnswer]] = None
+    entities: Optional[List[SummaryEntity]] = None
+    context: Optional[List[SummaryContext]] = None
+
+class SummaryEntityInfo(_Model):
+    provider: Optional[str] = None
+    description: Optional[str] = None
+
+class Summarizer(_Model):
+    """Summary key on a web search response, or a summarizer endpoint response."""
+    type: Optional[str] = None
+    key: Optional[str] = None
+    # "complete" or "failed" once finished; absent while still being generated
+    status: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[List[SummaryMessage]] = None
+    enrichments: Optional[SummaryEnrichments] = None
+    followups: Optional[List[str]] = None
+    entities_infos: Optional[Dict[str, SummaryEntityInfo]] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("complete", "failed")
+
+    @property
+    def text(self) -> str:
+        """The summary tokens joined into plain text."""
+        return "".join(
+            m.data for m in self.summary or [] if m.type == "token" and isinstance(m.data, str)
+        )
+
+# Forward references are resolved against this module when each schema is
+# first built, so no model_rebuild() is needed here
+
+
+# ----- Lazy response wrapper -----
+
+class _LazySection:
+    """Validate a response section on first access and cache it on the instance."""
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        raw = instance.raw.get(self.name)
+        value = None if raw is None else self.model.model_validate(raw)
+        # Non-data descriptor: later lookups find the cached value first
+        instance.__dict__[self.name] = value
+        return value
+
+
+class LazyWebSearchApiResponse:
+    """WebSearchApiResponse that validates each section only when it is read.
+
+    Holds the decoded payload and builds sub-models (``web``, ``news``,
+    ``videos``...) on first attribute access, so sections a consumer never
+    touches are never validated or materialized.
+    """
+
+    discussions = _LazySection(Discussions)
+    faq = _LazySection(FAQ)
+    infobox = _LazySection(GraphInfobox)
+    locations = _LazySection(Locations)
+    mixed = _LazySection(MixedResponse)
+    news = _LazySection(News)
+    query = _LazySection(Query)
+    videos = _LazySection(Videos)
+    web = _LazySection(Search)
+    summarizer = _LazySection(SummarizerKey)
+    rich = _LazySection(RichCallbackInfo)
+
+    def __init__(self, raw: Dict[str, Any]):
+        if raw.get("type") != "search":
+            raise ValueError(f"Expected a search response, got type {raw.get('type')!r}")
+        self.raw = raw
+        self.type = raw["type"]
+
+    def to_model(self) -> WebSearchApiResponse:
+        """Validate the whole payload into a regular WebSearchApiResponse."""
+        return WebSearchApiResponse.model_validate(self.raw)
+
+    def __repr__(self) -> str:
+        sections = [name for name in self.raw if name != "type"]
+        return f"{type(self).__name__}(sections={sections})"
 
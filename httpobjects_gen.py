@@ -0,0 +1,662 @@
+"""Brave Search API response models generated from docs/raw/parsed_api_docs.html.
+
+Do not edit by hand; regenerate with docs/utils/generate_models.py.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class _Model(BaseModel):
+    # Build validators on first use rather than at import, as httpobjects does
+    model_config = ConfigDict(defer_build=True)
+
+
+class WebSearchApiResponse(_Model):
+    """Top level response model for successful Web Search API requests. The response will include the relevant keys based on the plan subscribed, query relevance or applied result_filter as a query parameter. The API can also respond back with an error response based on invalid subscription keys and rate limit events."""
+    type: Literal["search"]
+    discussions: Optional[Discussions] = None
+    faq: Optional[FAQ] = None
+    infobox: Optional[GraphInfobox] = None
+    locations: Optional[Locations] = None
+    mixed: Optional[MixedResponse] = None
+    news: Optional[News] = None
+    query: Optional[Query] = None
+    videos: Optional[Videos] = None
+    web: Optional[Search] = None
+    summarizer: Optional[Summarizer] = None
+    rich: Optional[RichCallbackInfo] = None
+
+
+class LocalPoiSearchApiResponse(_Model):
+    """Top level response model for successful Local Search API request to get extra information for locations. The response will include a list of location results corresponding to the ids in the request. The API can also respond back with an error response in cases like too many ids being requested, invalid subscription keys, and rate limit events. Access to Local Search API requires a subscription to a Pro plan."""
+    type: Literal["local_pois"]
+    results: Optional[list[LocationResult]] = None
+
+
+class LocalDescriptionsSearchApiResponse(_Model):
+    """Top level response model for successful Local Search API request to get AI generated description for locations. The response includes a list of generated descriptions corresponding to the ids in the request. The API can also respond back with an error response in cases like too many ids being requested, invalid subscription keys, and rate limit events. Access to Local Search API requires a subscription to a Pro plan."""
+    type: Literal["local_descriptions"]
+    results: Optional[list[LocationDescription]] = None
+
+
+class Query(_Model):
+    """A model representing information gathered around the requested query."""
+    original: str
+    show_strict_warning: Optional[bool] = None
+    altered: Optional[str] = None
+    safesearch: Optional[bool] = None
+    is_navigational: Optional[bool] = None
+    is_geolocal: Optional[bool] = None
+    local_decision: Optional[str] = None
+    local_locations_idx: Optional[int] = None
+    is_trending: Optional[bool] = None
+    is_news_breaking: Optional[bool] = None
+    ask_for_location: Optional[bool] = None
+    language: Optional[Language] = None
+    spellcheck_off: Optional[bool] = None
+    country: Optional[str] = None
+    bad_results: Optional[bool] = None
+    should_fallback: Optional[bool] = None
+    lat: Optional[str] = None
+    long: Optional[str] = None
+    postal_code: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    header_country: Optional[str] = None
+    more_results_available: Optional[bool] = None
+    custom_location_label: Optional[str] = None
+    reddit_cluster: Optional[str] = None
+
+
+class Discussions(_Model):
+    """A model representing a discussion cluster relevant to the query."""
+    type: Literal["search"]
+    results: list[DiscussionResult]
+    mutated_by_goggles: bool = False
+
+
+class Result(_Model):
+    """A model representing a web search result."""
+    title: str
+    url: str
+    is_source_local: bool
+    is_source_both: bool
+    description: Optional[str] = None
+    page_age: Optional[str] = None
+    page_fetched: Optional[str] = None
+    profile: Optional[Profile] = None
+    language: Optional[str] = None
+    family_friendly: bool
+
+
+class SearchResult(Result):
+    """Aggregated information on a web search result, relevant to the query."""
+    type: Literal["search_result"]
+    subtype: str
+    is_live: bool
+    deep_results: Optional[DeepResult] = None
+    schemas: Optional[list[list]] = None
+    meta_url: Optional[MetaUrl] = None
+    thumbnail: Optional[Thumbnail] = None
+    age: Optional[str] = None
+    language: str
+    location: Optional[LocationResult] = None
+    video: Optional[VideoData] = None
+    movie: Optional[MovieData] = None
+    faq: Optional[FAQ] = None
+    qa: Optional[QAPage] = None
+    book: Optional[Book] = None
+    rating: Optional[Rating] = None
+    article: Optional[Article] = None
+    product: Optional[Annotated[Union[Product, Review], Field(discriminator="type")]] = None
+    product_cluster: Optional[list[Annotated[Union[Product, Review], Field(discriminator="type")]]] = None
+    cluster_type: Optional[str] = None
+    cluster: Optional[list[Result]] = None
+    creative_work: Optional[CreativeWork] = None
+    music_recording: Optional[MusicRecording] = None
+    review: Optional[Review] = None
+    software: Optional[Software] = None
+    recipe: Optional[Recipe] = None
+    organization: Optional[Organization] = None
+    content_type: Optional[str] = None
+    extra_snippets: Optional[list[str]] = None
+
+
+class DiscussionResult(SearchResult):
+    """A discussion result. These are forum posts and discussions that are relevant to the search query."""
+    type: Literal["discussion"]
+    data: Optional[ForumData] = None
+
+
+class ForumData(_Model):
+    """Defines a result from a discussion forum."""
+    forum_name: str
+    num_answers: Optional[int] = None
+    score: Optional[str] = None
+    title: Optional[str] = None
+    question: Optional[str] = None
+    top_comment: Optional[str] = None
+
+
+class FAQ(_Model):
+    """Frequently asked questions relevant to the search query term."""
+    type: Literal["faq"]
+    results: list[QA]
+
+
+class QA(_Model):
+    """A question/answer result."""
+    question: str
+    answer: str
+    title: str
+    url: str
+    meta_url: Optional[MetaUrl] = None
+
+
+class MetaUrl(_Model):
+    """Aggregated information about a URL."""
+    scheme: str
+    netloc: str
+    hostname: Optional[str] = None
+    favicon: str
+    path: str
+
+
+class Search(_Model):
+    """A model representing a collection of web search results."""
+    type: Literal["search"]
+    results: list[SearchResult]
+    family_friendly: bool
+
+
+class AbstractGraphInfobox(Result):
+    """Shared aggregated information on an entity from a knowledge graph."""
+    type: Literal["infobox"]
+    position: int
+    label: Optional[str] = None
+    category: Optional[str] = None
+    long_desc: Optional[str] = None
+    thumbnail: Optional[Thumbnail] = None
+    attributes: Optional[list[list[str]]] = None
+    profiles: Optional[Union[list[Profile], list[DataProvider]]] = None
+    website_url: Optional[str] = None
+    ratings: Optional[list[Rating]] = None
+    providers: Optional[list[DataProvider]] = None
+    distance: Optional[Unit] = None
+    images: Optional[list[Thumbnail]] = None
+    movie: Optional[MovieData] = None
+
+
+class GenericInfobox(AbstractGraphInfobox):
+    """Aggregated information on a generic entity from a knowledge graph."""
+    subtype: Literal["generic"]
+    found_in_urls: Optional[list[str]] = None
+
+
+class EntityInfobox(AbstractGraphInfobox):
+    """Aggregated information on an entity from a knowledge graph."""
+    subtype: Literal["entity"]
+
+
+class QAInfobox(AbstractGraphInfobox):
+    """A question answer infobox."""
+    subtype: Literal["code"]
+    data: QAPage
+    meta_url: Optional[MetaUrl] = None
+
+
+class InfoboxWithLocation(AbstractGraphInfobox):
+    """An infobox with location."""
+    subtype: Literal["location"]
+    is_location: bool
+    coordinates: Optional[list[float]] = None
+    zoom_level: int
+    location: Optional[LocationResult] = None
+
+
+class InfoboxPlace(AbstractGraphInfobox):
+    """An infobox for a place, such as a business."""
+    subtype: Literal["place"]
+    location: LocationResult
+
+
+class GraphInfobox(_Model):
+    """Aggregated information on an entity shown as an infobox."""
+    type: Literal["graph"]
+    results: list[Annotated[Union[GenericInfobox, QAInfobox, InfoboxPlace, InfoboxWithLocation, EntityInfobox], Field(discriminator="subtype")]]
+
+
+class QAPage(_Model):
+    """Aggreated result from a question answer page."""
+    question: str
+    answer: Answer
+
+
+class Answer(_Model):
+    """A response representing an answer to a question on a forum."""
+    text: str
+    author: Optional[str] = None
+    upvoteCount: Optional[int] = None
+    downvoteCount: Optional[int] = None
+
+
+class Thumbnail(_Model):
+    """Aggregated details representing a picture thumbnail."""
+    src: str
+    original: Optional[str] = None
+
+
+class LocationWebResult(Result):
+    """A model representing a web result related to a location."""
+    meta_url: MetaUrl
+
+
+class LocationResult(Result):
+    """A result that is location relevant."""
+    type: Literal["location_result"]
+    id: Optional[str] = None
+    provider_url: str
+    coordinates: Optional[list[float]] = None
+    zoom_level: int
+    thumbnail: Optional[Thumbnail] = None
+    postal_address: Optional[PostalAddress] = None
+    opening_hours: Optional[OpeningHours] = None
+    contact: Optional[Contact] = None
+    price_range: Optional[str] = None
+    rating: Optional[Rating] = None
+    distance: Optional[Unit] = None
+    profiles: Optional[list[DataProvider]] = None
+    reviews: Optional[Reviews] = None
+    pictures: Optional[PictureResults] = None
+    action: Optional[Action] = None
+    serves_cuisine: Optional[list[str]] = None
+    categories: Optional[list[str]] = None
+    icon_category: Optional[str] = None
+    results: Optional[LocationWebResult] = None
+    timezone: Optional[str] = None
+    timezone_offset: Optional[str] = None
+
+
+class LocationDescription(_Model):
+    """AI generated description of a location result."""
+    type: Literal["local_description"]
+    id: str
+    description: Optional[str] = None
+
+
+class Locations(_Model):
+    """A model representing location results."""
+    type: Literal["locations"]
+    results: list[LocationResult]
+
+
+class MixedResponse(_Model):
+    """The ranking order of results on a search result page."""
+    type: Literal["mixed"]
+    main: Optional[list[ResultReference]] = None
+    top: Optional[list[ResultReference]] = None
+    side: Optional[list[ResultReference]] = None
+
+
+class ResultReference(_Model):
+    """The ranking order of results on a search result page."""
+    type: str
+    index: Optional[int] = None
+    all: bool
+
+
+class Videos(_Model):
+    """A model representing video results."""
+    type: Literal["videos"]
+    results: list[VideoResult]
+    mutated_by_goggles: Optional[bool] = None
+
+
+class News(_Model):
+    """A model representing news results."""
+    type: Literal["news"]
+    results: list[NewsResult]
+    mutated_by_goggles: Optional[bool] = None
+
+
+class NewsResult(Result):
+    """A model representing news results."""
+    meta_url: Optional[MetaUrl] = None
+    source: Optional[str] = None
+    breaking: bool
+    is_live: bool
+    thumbnail: Optional[Thumbnail] = None
+    age: Optional[str] = None
+    extra_snippets: Optional[list[str]] = None
+
+
+class PictureResults(_Model):
+    """A model representing a list of pictures."""
+    viewMoreUrl: Optional[str] = None
+    results: list[Thumbnail]
+
+
+class Action(_Model):
+    """A model representing an action to be taken."""
+    type: str
+    url: str
+
+
+class PostalAddress(_Model):
+    """A model representing a postal address of a location."""
+    type: Literal["PostalAddress"]
+    country: Optional[str] = None
+    postalCode: Optional[str] = None
+    streetAddress: Optional[str] = None
+    addressRegion: Optional[str] = None
+    addressLocality: Optional[str] = None
+    displayAddress: str
+
+
+class OpeningHours(_Model):
+    """Opening hours of a bussiness at a particular location."""
+    current_day: Optional[list[DayOpeningHours]] = None
+    days: Optional[list[list[DayOpeningHours]]] = None
+
+
+class DayOpeningHours(_Model):
+    """A model representing the opening hours for a particular day for a business at a particular location."""
+    abbr_name: str
+    full_name: str
+    opens: str
+    closes: str
+
+
+class Contact(_Model):
+    """A model representing contact information for an entity."""
+    email: Optional[str] = None
+    telephone: Optional[str] = None
+
+
+class DataProvider(_Model):
+    """A model representing the data provider associated with the entity."""
+    type: Literal["external"]
+    name: str
+    url: str
+    long_name: Optional[str] = None
+    img: Optional[str] = None
+
+
+class Profile(_Model):
+    """A profile of an entity."""
+    name: str
+    long_name: str
+    url: Optional[str] = None
+    img: Optional[str] = None
+
+
+class Unit(_Model):
+    """A model representing a unit of measurement."""
+    value: float
+    units: str
+
+
+class MovieData(_Model):
+    """Aggregated data for a movie result."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    url: Optional[str] = None
+    thumbnail: Optional[Thumbnail] = None
+    release: Optional[str] = None
+    directors: Optional[list[Person]] = None
+    actors: Optional[list[Person]] = None
+    rating: Optional[Rating] = None
+    duration: Optional[str] = None
+    genre: Optional[list[str]] = None
+    query: Optional[str] = None
+
+
+class Thing(_Model):
+    """A model describing a generic thing."""
+    type: Literal["thing"]
+    name: str
+    url: Optional[str] = None
+    thumbnail: Optional[Thumbnail] = None
+
+
+class Person(Thing):
+    """A model describing a person entity."""
+    type: Literal["person"]
+    email: Optional[str] = None
+
+
+class Rating(_Model):
+    """The rating associated with an entity."""
+    ratingValue: float
+    bestRating: float
+    reviewCount: Optional[int] = None
+    profile: Optional[Profile] = None
+    is_tripadvisor: bool
+
+
+class Book(_Model):
+    """A model representing a book result."""
+    title: str
+    author: list[Person]
+    date: Optional[str] = None
+    price: Optional[Price] = None
+    pages: Optional[int] = None
+    publisher: Optional[Person] = None
+    rating: Optional[Rating] = None
+
+
+class Price(_Model):
+    """A model representing the price for an entity."""
+    price: str
+    price_currency: str
+
+
+class Article(_Model):
+    """A model representing an article."""
+    author: Optional[list[Person]] = None
+    date: Optional[str] = None
+    publisher: Optional[Organization] = None
+    thumbnail: Optional[Thumbnail] = None
+    isAccessibleForFree: Optional[bool] = None
+
+
+class ContactPoint(Thing):
+    """A way to contact an entity."""
+    type: Literal["contact_point"]
+    telephone: Optional[str] = None
+    email: Optional[str] = None
+
+
+class Organization(Thing):
+    """An entity responsible for another entity."""
+    type: Literal["organization"]
+    contact_points: Optional[list[ContactPoint]] = None
+
+
+class HowTo(_Model):
+    """Aggregated information on a how to."""
+    text: str
+    name: Optional[str] = None
+    url: Optional[str] = None
+    image: Optional[list[str]] = None
+
+
+class Recipe(_Model):
+    """Aggregated information on a recipe."""
+    title: str
+    description: str
+    thumbnail: Thumbnail
+    url: str
+    domain: str
+    favicon: str
+    time: Optional[str] = None
+    prep_time: Optional[str] = None
+    cook_time: Optional[str] = None
+    ingredients: Optional[str] = None
+    instructions: Optional[list[HowTo]] = None
+    servings: Optional[int] = None
+    calories: Optional[int] = None
+    rating: Optional[Rating] = None
+    recipeCategory: Optional[str] = None
+    recipeCuisine: Optional[str] = None
+    video: Optional[VideoData] = None
+
+
+class Product(_Model):
+    """A model representing a product."""
+    type: Literal["Product"]
+    name: str
+    category: Optional[str] = None
+    price: str
+    thumbnail: Thumbnail
+    description: Optional[str] = None
+    offers: Optional[list[Offer]] = None
+    rating: Optional[Rating] = None
+
+
+class Offer(_Model):
+    """An offer associated with a product."""
+    url: str
+    priceCurrency: str
+    price: str
+
+
+class Review(_Model):
+    """A model representing a review for an entity."""
+    type: Literal["review"]
+    name: str
+    thumbnail: Thumbnail
+    description: str
+    rating: Rating
+
+
+class Reviews(_Model):
+    """The reviews associated with an entity."""
+    results: list[TripAdvisorReview]
+    viewMoreUrl: str
+    reviews_in_foreign_language: bool
+
+
+class TripAdvisorReview(_Model):
+    """A model representing a Tripadvisor review."""
+    title: str
+    description: str
+    date: str
+    rating: Rating
+    author: Person
+    review_url: str
+    language: str
+
+
+class CreativeWork(_Model):
+    """A creative work relevant to the query. An example can be enriched metadata for an app."""
+    name: str
+    thumbnail: Thumbnail
+    rating: Optional[Rating] = None
+
+
+class MusicRecording(_Model):
+    """Result classified as a music label or a song."""
+    name: str
+    thumbnail: Optional[Thumbnail] = None
+    rating: Optional[Rating] = None
+
+
+class Software(_Model):
+    """A model representing a software entity."""
+    name: Optional[str] = None
+    author: Optional[str] = None
+    version: Optional[str] = None
+    codeRepository: Optional[str] = None
+    homepage: Optional[str] = None
+    datePublisher: Optional[str] = None
+    is_npm: Optional[bool] = None
+    is_pypi: Optional[bool] = None
+    stars: Optional[int] = None
+    forks: Optional[int] = None
+    ProgrammingLanguage: Optional[str] = None
+
+
+class DeepResult(_Model):
+    """Aggregated deep results from news, social, videos and images."""
+    news: Optional[list[NewsResult]] = None
+    buttons: Optional[list[ButtonResult]] = None
+    videos: Optional[list[VideoResult]] = None
+    images: Optional[list[Image]] = None
+
+
+class VideoResult(Result):
+    """A model representing a video result."""
+    type: Literal["video_result"]
+    video: VideoData
+    meta_url: Optional[MetaUrl] = None
+    thumbnail: Optional[Thumbnail] = None
+    age: Optional[str] = None
+
+
+class VideoData(_Model):
+    """A model representing metadata gathered for a video."""
+    duration: Optional[str] = None
+    views: Optional[str] = None
+    creator: Optional[str] = None
+    publisher: Optional[str] = None
+    thumbnail: Optional[Thumbnail] = None
+    tags: Optional[list[str]] = None
+    author: Optional[Profile] = None
+    requires_subscription: Optional[bool] = None
+
+
+class ButtonResult(_Model):
+    """A result which can be used as a button."""
+    type: Literal["button_result"]
+    title: str
+    url: str
+
+
+class Image(_Model):
+    """A model describing an image."""
+    thumbnail: Thumbnail
+    url: Optional[str] = None
+    properties: Optional[ImageProperties] = None
+
+
+class Language(_Model):
+    """A model representing a language."""
+    main: str
+
+
+class ImageProperties(_Model):
+    """Metadata on an image."""
+    url: str
+    resized: str
+    placeholder: str
+    height: Optional[int] = None
+    width: Optional[int] = None
+    format: Optional[str] = None
+    content_size: Optional[str] = None
+
+
+class Summarizer(_Model):
+    """Details on getting the summary."""
+    type: Literal["summarizer"]
+    key: str
+
+
+class RichCallbackInfo(_Model):
+    """Callback information for rich results."""
+    type: Literal["rich"]
+    hint: Optional[RichCallbackHint] = None
+
+
+class RichCallbackHint(_Model):
+    """The hint for the rich result."""
+    vertical: str
+    callback_key: str
+
+
+# Forward references are resolved against this module when each schema is
+# first built, so no model_rebuild() is needed here
@@ -0,0 +1,141 @@
+"""Spread requests across several Brave subscription tokens.
+
+Each key gets its own AdaptiveLimiter, so its send rate follows the
+X-RateLimit-* headers of its own responses. A request goes to the key with
+the least work per unit of rate, and a key that is throttled or out of
+quota is ejected until its window resets.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+from ratelimit import AdaptiveLimiter, parse_rate_limit_header, parse_retry_after
+
+
+class KeyPoolExhausted(RuntimeError):
+    """Raised when every key is ejected for longer than the pool will wait."""
+
+
+@dataclass
+class ApiKey:
+    """One subscription token and its plan.
+
+    `rps` is the starting send rate until the API reports the real one.
+    `weight` sets the key's share of traffic and defaults to its current rate.
+    """
+
+    token: str
+    rps: float = 1.0
+    weight: float | None = None
+    limiter: AdaptiveLimiter = field(init=False, repr=False)
+    in_flight: int = field(default=0, init=False)
+    requests: int = field(default=0, init=False)
+    throttled: int = field(default=0, init=False)
+    # Requests left in each rate-limit window, as last reported by the API
+    remaining: list[int] = field(default_factory=list, init=False)
+    ejected_until: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        self.limiter = AdaptiveLimiter(self.rps)
+
+    @property
+    def share(self) -> float:
+        return self.weight if self.weight is not None else self.limiter.rate
+
+    def load(self) -> float:
+        return (self.in_flight + 1) / self.share
+
+
+class KeyPool:
+    """Least-loaded balancing over API keys with temporary ejection.
+
+    A key is ejected after a 429, or when the last (longest) rate-limit
+    window reports no requests remaining, for the reset time the API reports
+    (at least `eject_seconds`). When every key is ejected, `acquire` waits for
+    the first to come back, or raises KeyPoolExhausted if that is more than
+    `max_wait` seconds away.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str | ApiKey],
+        eject_seconds: float = 1.0,
+        max_wait: float = 60.0,
+    ) -> None:
+        self.keys = [key if isinstance(key, ApiKey) else ApiKey(key) for key in keys]
+        if not self.keys:
+            raise ValueError("KeyPool needs at least one key")
+        self.eject_seconds = eject_seconds
+        self.max_wait = max_wait
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _pick(self, now: float) -> ApiKey | None:
+        available = [key for key in self.keys if key.ejected_until <= now]
+        if not available:
+            return None
+        return min(available, key=ApiKey.load)
+
+    async def acquire(self) -> ApiKey:
+        """Choose a key and wait for its rate limiter."""
+        while True:
+            now = time.monotonic()
+            key = self._pick(now)
+            if key is not None:
+                break
+            wait = min(k.ejected_until for k in self.keys) - now
+            if wait > self.max_wait:
+                raise KeyPoolExhausted(f"All {len(self.keys)} API keys are ejected for {wait:.0f}s")
+            await asyncio.sleep(wait)
+        key.in_flight += 1
+        try:
+            await key.limiter.acquire()
+        except BaseException:
+            key.in_flight -= 1
+            raise
+        key.requests += 1
+        return key
+
+    def release(self, key: ApiKey, headers: Mapping[str, str] | None, status: int | None) -> None:
+        """Return a key after its request, learning from the response headers."""
+        key.in_flight -= 1
+        if headers is None:
+            return
+        key.limiter.update(headers, status or 200)
+        remaining = parse_rate_limit_header(headers.get("X-RateLimit-Remaining"))
+        if remaining:
+            key.remaining = remaining
+        quota_spent = bool(remaining) and remaining[-1] <= 0
+        if status == 429 or quota_spent:
+            if status == 429:
+                key.throttled += 1
+            self._eject(key, headers, remaining)
+
+    def _eject(self, key: ApiKey, headers: Mapping[str, str], remaining: list[int]) -> None:
+        resets = parse_rate_limit_header(headers.get("X-RateLimit-Reset"))
+        seconds = max(
+            [float(reset) for left, reset in zip(remaining, resets, strict=False) if left <= 0]
+            + [parse_retry_after(headers.get("Retry-After")) or 0.0, self.eject_seconds]
+        )
+        key.ejected_until = max(key.ejected_until, time.monotonic() + seconds)
+
+    def stats(self) -> list[dict[str, float | int | bool]]:
+        """Per-key request counts, current rate and ejection state."""
+        now = time.monotonic()
+        return [
+            {
+                "key": key.token[-4:],
+                "rate": key.limiter.rate,
+                "in_flight": key.in_flight,
+                "requests": key.requests,
+                "throttled": key.throttled,
+                "remaining": key.remaining[-1] if key.remaining else -1,
+                "ejected": key.ejected_until > now,
+            }
+            for key in self.keys
+        ]
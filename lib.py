@@ -1,37 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import json
 import logging
 import os
+import threading
+import time
+from collections import deque
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+)
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
 # Utilities for URL handling
 from urllib.parse import urljoin
 
-try:
-    from aiohttp import ClientSession, ClientTimeout, TCPConnector
-except ImportError:
-    ClientSession = None
-    ClientTimeout = None
-    TCPConnector = None
-
-try:
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
     from aiolimiter import AsyncLimiter
-except ImportError:
-    class AsyncLimiter:
-        """No-op async limiter when aiolimiter is not installed."""
 
-        def __init__(self, *args, **kwargs):
-            pass
+from cache import ResponseCache, cache_key
+from decoding import (
+    ACCEPT_ENCODING,
+    DECODE_MODES,
+    DecodeMode,
+    decode,
+    loads,
+    make_decompressor,
+)
+from hedging import HedgePolicy, Hedger
+from httpobjects import (
+    PreparedWebSearchRequest,
+    SearchResult,
+    Summarizer,
+    SummaryMessage,
+    WebSearchApiResponse,
+    WebSearchRequest,
+)
+from keypool import ApiKey, KeyPool
+from ratelimit import AdaptiveLimiter, parse_retry_after
+from retry import PollPolicy, RetryPolicy
+from scheduler import DeadlineExceeded, Scheduler, current_job, with_job
+from tracing import Tracer, aiohttp_trace_config
 
-        async def __aenter__(self):
-            pass
+log = logging.getLogger(__name__)
 
-        async def __aexit__(self, exc_type, exc, tb):
-            pass
 
-from httpobjects import WebSearchRequest, WebSearchApiResponse, Summarizer
+class _NoopLimiter:
+    """No-op async limiter when aiolimiter is not installed."""
 
+    async def __aenter__(self):
+        pass
 
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _fixed_rate_limiter(rps: int) -> AsyncLimiter | _NoopLimiter:
+    # Imported on first use: aiolimiter pulls in importlib.metadata
+    try:
+        from aiolimiter import AsyncLimiter
+    except ImportError:
+        return _NoopLimiter()
+    return AsyncLimiter(rps, 1)
 
 
 API_HOST = "https://api.search.brave.com"
 
+# Highest page `offset` the web search endpoint accepts
+MAX_WEB_OFFSET = 9
+
+# Chunk size for streamed response body reads
+BODY_CHUNK_SIZE = 64 * 1024
+
+# How many times a throttled request waits out the reset window before failing
+MAX_THROTTLE_WAITS = 3
+
 
 class BraveApiError(Exception):
     """Exception raised when the Brave API returns a non-200 response."""
@@ -42,6 +94,93 @@ class BraveApiError(Exception):
         self.data = data
 
 
+def _summary_complete(body: bytes) -> bool:
+    """Whether a summarizer response body holds a finished summary worth caching."""
+    return loads(body).get("status") == "complete"
+
+
+def _error_data(body: bytes) -> dict:
+    """Decode an error response body, keeping non-JSON bodies as text."""
+    try:
+        return json.loads(body)
+    except ValueError:
+        return {"body": body.decode(errors="replace")}
+
+
+async def _whole_body(resp: Any) -> AsyncIterator[bytes]:
+    """Yield a response body in one chunk, for responses without a content stream."""
+    yield await resp.read()
+
+
+@dataclass
+class ClientStats:
+    """Counters describing how a BraveClient has spent its request budget."""
+
+    # Calls served by joining an identical request already in flight
+    coalesced: int = 0
+    # Attempts re-sent by the retry policy, and the time slept before them
+    retries: int = 0
+    backoff_seconds: float = 0.0
+    # Response body bytes as received on the wire and after decompression
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+    # Requests eligible for hedging, hedges sent, hedges that answered first,
+    # hedges skipped for lack of budget, and the estimated latency they saved
+    hedge_candidates: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    hedges_skipped: int = 0
+    hedge_saved_seconds: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.bytes_decoded / self.bytes_received if self.bytes_received else 1.0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.hedge_candidates if self.hedge_candidates else 0.0
+
+
+@dataclass(frozen=True)
+class ConnectionConfig:
+    """Connection pool settings for the session a BraveClient creates itself.
+
+    `limit` is the pool size (defaults to `max_concurrent_requests`) and is
+    independent of the client's concurrency cap. `warmup` connections are
+    opened when the client is entered with ``async with``.
+
+    With `compress`, responses are requested gzip (and brotli, when a brotli
+    package is installed) encoded and decompressed incrementally as chunks
+    arrive. `stream_body` reads every body in chunks into a single growing
+    buffer, so the received chunks and their joined copy are never held at
+    the same time.
+    """
+
+    limit: int | None = None
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int | None = 300
+    warmup: int = 0
+    compress: bool = True
+    stream_body: bool = False
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a batch: either a response or the error it raised."""
+
+    index: int
+    request: WebSearchRequest | PreparedWebSearchRequest
+    response: WebSearchApiResponse | None = None
+    error: Exception | None = None
+    # Filled in by search_and_summarize_many when a summary was available
+    summary: Summarizer | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class BraveClient:
     """Asynchronous client for interacting with the Brave Search API."""
 
@@ -54,8 +193,23 @@ class BraveClient:
         timeout: int = 20,
         session: ClientSession | None = None,
         limiter: AsyncLimiter | None = None,
+        cache: ResponseCache | None = None,
+        adaptive_rate_limit: bool = False,
+        retry: RetryPolicy | None = None,
+        decode_mode: DecodeMode = "validate",
+        connection: ConnectionConfig | None = None,
+        tracer: Tracer | None = None,
+        api_keys: KeyPool | Iterable[str | ApiKey] | None = None,
+        scheduler: Scheduler | None = None,
+        hedge: HedgePolicy | None = None,
     ) -> None:
+        if api_keys is not None and not isinstance(api_keys, KeyPool):
+            api_keys = KeyPool(api_keys)
+        # With a key pool each request carries the token of the key it was given
+        self._keys = api_keys
         self._api_key = api_key or os.getenv("BRAVE_API_KEY")
+        if not self._api_key and self._keys is not None:
+            self._api_key = self._keys.keys[0].token
         if not self._api_key:
             raise ValueError("BRAVE_API_KEY must be provided via api_key or environment variable")
 
@@ -70,59 +224,827 @@ class BraveClient:
         }
 
         self._session = session
+        # Builds pre-encoded request URLs; only set for the client's own session
+        self._encoded_url: Callable[[str], Any] | None = None
         self._max_concurrent_requests = max_concurrent_requests
+        # Caps in-flight requests to the connector limit for every caller
+        self._concurrency = asyncio.Semaphore(max_concurrent_requests)
+        # Requests holding a concurrency slot, and those of them on the wire
+        self._in_flight = 0
+        self._on_wire = 0
+        # Connections the client's own session opened and reused (see _pool_trace_config)
+        self._connections = {"opened": 0, "reused": 0}
         self._timeout_seconds = timeout
-        self._limiter = limiter or AsyncLimiter(rps, 1)
+        self._connection = connection or ConnectionConfig()
+        if self._connection.compress:
+            for headers in self._headers.values():
+                headers["Accept-Encoding"] = ACCEPT_ENCODING
+        if limiter is None:
+            limiter = AdaptiveLimiter(rps) if adaptive_rate_limit else _fixed_rate_limiter(rps)
+        self._limiter = limiter
+        self._cache = cache
+        self._retry = retry
+        if decode_mode not in DECODE_MODES:
+            raise ValueError(f"decode_mode must be one of {DECODE_MODES}")
+        self._decode_mode = decode_mode
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._tracer = tracer or Tracer()
+        # Orders waiting requests by priority, tenant and deadline; FIFO without
+        self._scheduler = scheduler
+        self._hedger = Hedger(hedge) if hedge is not None else None
+        self.stats = ClientStats()
 
     async def _ensure_session(self) -> None:
         """Lazily initialize the HTTP session in an async context."""
         if self._session is None:
+            # aiohttp is imported here, not at module load, so importing lib
+            # stays cheap for CLIs and code that passes its own session
+            from aiohttp import ClientSession, ClientTimeout, TCPConnector
+            from yarl import URL
+
+            config = self._connection
             self._session = ClientSession(
-                connector=TCPConnector(limit=self._max_concurrent_requests),
+                connector=TCPConnector(
+                    limit=config.limit or self._max_concurrent_requests,
+                    limit_per_host=config.limit_per_host,
+                    keepalive_timeout=config.keepalive_timeout,
+                    use_dns_cache=config.ttl_dns_cache is not None,
+                    ttl_dns_cache=config.ttl_dns_cache,
+                ),
                 timeout=ClientTimeout(self._timeout_seconds),
+                # Bodies are decompressed in _read_body so wire bytes can be counted
+                auto_decompress=False,
+                trace_configs=[self._pool_trace_config()]
+                + ([aiohttp_trace_config(self._tracer)] if self._tracer.enabled else []),
             )
+            self._encoded_url = partial(URL, encoded=True)
+
+    async def warmup(self, connections: int = 1) -> int:
+        """Open up to `connections` keep-alive connections to the API host.
 
-    async def web_search(self, request: WebSearchRequest) -> WebSearchApiResponse:
-        """Perform a web search query and return a parsed WebSearchApiResponse."""
+        Sends lightweight HEAD requests to the host root, which do not count
+        against the search quota, so the DNS lookup and TLS handshake happen
+        before the first real request. Returns the number of connections that
+        were established.
+        """
         await self._ensure_session()
-        # Exclude unset (None) and default fields to avoid unwanted boolean/query params
-        params = request.model_dump(exclude_none=True, exclude_defaults=True)
-        for key, value in list(params.items()):
-            if isinstance(value, bool):
-                params[key] = int(value)
-        async with self._limiter:
-            async with self._session.get(
-                self._api_path["web"], params=params, headers=self._headers["web"]
-            ) as resp:
-                data = await resp.json()
-                if resp.status != 200:
-                    raise BraveApiError(resp.status, data)
-                return WebSearchApiResponse.model_validate(data)
 
-    async def summarizer_search(
-        self, key: str, entity_info: bool = False
-    ) -> Summarizer:
-        """Fetch a summary using a summary key from a previous web search."""
+        async def connect() -> bool:
+            try:
+                async with self._session.head(self._api_host, allow_redirects=False) as resp:
+                    await resp.read()
+                return True
+            except Exception as exc:
+                log.debug("Warmup connection to %s failed: %s", self._api_host, exc)
+                return False
+
+        opened = await asyncio.gather(*(connect() for _ in range(connections)))
+        return sum(opened)
+
+    def _pool_trace_config(self) -> Any:
+        """Build an aiohttp TraceConfig counting connections opened and reused."""
+        from aiohttp import TraceConfig
+
+        config = TraceConfig()
+        connections = self._connections
+
+        async def opened(session, ctx, params) -> None:
+            connections["opened"] += 1
+
+        async def reused(session, ctx, params) -> None:
+            connections["reused"] += 1
+
+        config.on_connection_create_end.append(opened)
+        config.on_connection_reuseconn.append(reused)
+        return config
+
+    def pool_stats(self) -> dict[str, int | float]:
+        """Report connection pool and concurrency-cap utilization.
+
+        `busy` counts requests on the wire, `in_flight` those holding a
+        concurrency slot, and `opened`/`reused` the connections the client's
+        own session opened and requests sent on a kept-alive one.
+        """
+        limit = getattr(getattr(self._session, "connector", None), "limit", 0) or 0
+        stats = {
+            "limit": limit,
+            "busy": self._on_wire,
+            "utilization": self._on_wire / limit if limit else 0.0,
+            "in_flight": self._in_flight,
+            "max_concurrent_requests": self._max_concurrent_requests,
+            **self._connections,
+        }
+        if self._keys is not None:
+            stats["keys"] = self._keys.stats()
+        if self._scheduler is not None:
+            stats["scheduler"] = self._scheduler.stats()
+        return stats
+
+    @staticmethod
+    def _prepare(request: WebSearchRequest | PreparedWebSearchRequest) -> PreparedWebSearchRequest:
+        if isinstance(request, PreparedWebSearchRequest):
+            return request
+        return request.prepare()
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fetch` once for all concurrent callers sharing `key`.
+
+        Callers that arrive while a request for the same key is in flight wait
+        for it and receive the same result object (or exception). Only calls
+        of the same scheduling() priority share a request, so an interactive
+        call never waits in a batch queue. A caller joining a request already
+        in flight waits at most until its own deadline.
+        """
+        job = current_job()
+        key = f"{key}#{job.priority}" if self._scheduler is not None else key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shield so one caller being cancelled does not cancel the shared request
+            return await asyncio.shield(task)
+        self.stats.coalesced += 1
+        if job.deadline is None:
+            return await asyncio.shield(task)
+        try:
+            async with asyncio.timeout(max(job.deadline - time.monotonic(), 0.0)):
+                return await asyncio.shield(task)
+        except TimeoutError:
+            if task.done():
+                raise
+            raise DeadlineExceeded("Joined request was not answered before the deadline") from None
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot, counting the request as in flight."""
+        async with self._concurrency:
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+    async def _send(
+        self, endpoint: str, params: dict, query: str | None, sent: asyncio.Event | None = None
+    ) -> tuple[int, bytes, Any]:
+        """Send one request, charged against the concurrency cap and rate limiter.
+
+        With a key pool the request is charged to the limiter of the key it is
+        sent with instead of the client's limiter. With a scheduler, requests
+        wait in its queues and only the one it picks next goes on to take a
+        concurrency slot and rate-limit token. `query` is `params` already
+        URL-encoded, if the caller has it. `sent` is set once the request
+        goes out on the wire.
+        """
+        queued = time.perf_counter()
+        if self._scheduler is None:
+            async with self._slot():
+                if self._keys is None:
+                    async with self._limiter:
+                        return await self._request(endpoint, params, query, self._headers[endpoint], queued, sent)
+                return await self._request_with_key(endpoint, params, query, await self._keys.acquire(), queued, sent)
+
+        async with AsyncExitStack() as stack:
+            key = None
+            async with self._scheduler.turn(current_job()):
+                if self._tracer.enabled:
+                    self._tracer.record("schedule_wait", time.perf_counter() - queued, endpoint=endpoint)
+                await stack.enter_async_context(self._slot())
+                if self._keys is None:
+                    await stack.enter_async_context(self._limiter)
+                else:
+                    key = await self._keys.acquire()
+            if key is None:
+                return await self._request(endpoint, params, query, self._headers[endpoint], queued, sent)
+            return await self._request_with_key(endpoint, params, query, key, queued, sent)
+
+    async def _request_with_key(
+        self,
+        endpoint: str,
+        params: dict,
+        query: str | None,
+        key: ApiKey,
+        queued: float,
+        sent: asyncio.Event | None,
+    ) -> tuple[int, bytes, Any]:
+        status = headers = None
+        try:
+            status, body, headers = await self._request(
+                endpoint,
+                params,
+                query,
+                {**self._headers[endpoint], "X-Subscription-Token": key.token},
+                queued,
+                sent,
+            )
+        finally:
+            self._keys.release(key, headers, status)
+        return status, body, headers
+
+    async def _request(
+        self,
+        endpoint: str,
+        params: dict,
+        query: str | None,
+        headers: dict,
+        queued: float,
+        sent: asyncio.Event | None = None,
+    ) -> tuple[int, bytes, Any]:
+        tracer = self._tracer
+        started = time.perf_counter()
+        if tracer.enabled:
+            tracer.record("limiter_wait", started - queued, endpoint=endpoint)
+        if sent is not None:
+            sent.set()
+        url = self._api_path[endpoint]
+        if query is not None and self._encoded_url is not None:
+            # Send the query string as encoded by prepare() instead of having
+            # aiohttp encode params again; sessions passed in still get params
+            url, params = self._encoded_url(f"{url}?{query}"), None
+        self._on_wire += 1
+        try:
+            async with self._session.get(url, params=params, headers=headers) as resp:
+                if tracer.enabled:
+                    received = time.perf_counter()
+                    tracer.record("response_wait", received - started, endpoint=endpoint, status=resp.status)
+                body = await self._read_body(resp)
+                if tracer.enabled:
+                    tracer.record("body_read", time.perf_counter() - received, endpoint=endpoint, size=len(body))
+                return resp.status, body, resp.headers
+        finally:
+            self._on_wire -= 1
+
+    async def _read_body(self, resp: Any) -> bytes:
+        """Read and, if needed, decompress a response body, counting its bytes."""
+        encoding = resp.headers.get("Content-Encoding", "")
+        # Sessions passed in by the caller normally decompress bodies themselves
+        decompress = bool(encoding) and not getattr(self._session, "auto_decompress", True)
+        if not decompress and not self._connection.stream_body:
+            body = await resp.read()
+            wire = int(resp.headers.get("Content-Length", len(body))) if encoding else len(body)
+            self.stats.bytes_received += wire
+            self.stats.bytes_decoded += len(body)
+            return body
+
+        decompressor = make_decompressor(encoding) if decompress else None
+        buffer = bytearray()
+        content = getattr(resp, "content", None)
+        # Replayed responses and other stand-ins have no stream to read from
+        chunks = content.iter_chunked(BODY_CHUNK_SIZE) if content is not None else _whole_body(resp)
+        async for chunk in chunks:
+            self.stats.bytes_received += len(chunk)
+            buffer += decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor is not None:
+            buffer += decompressor.flush()
+        self.stats.bytes_decoded += len(buffer)
+        # Returned without copying; every consumer accepts a bytearray
+        return buffer
+
+    async def _send_hedged(self, endpoint: str, params: dict, query: str | None) -> tuple[int, bytes, Any]:
+        """Send a request, and a second copy if the first is slow to answer.
+
+        The hedge delay is counted from when the first copy goes on the wire,
+        so time spent queued for the rate limiter never triggers a hedge. A
+        200 from either copy wins and the other is cancelled; otherwise the
+        first copy's outcome is returned.
+        """
+        hedger = self._hedger
+        self.stats.hedge_candidates += 1
+        hedger.sent()
+        on_wire = asyncio.Event()
+        primary = asyncio.ensure_future(self._send(endpoint, params, query, on_wire))
+        tasks = [primary]
+        try:
+            wire = asyncio.ensure_future(on_wire.wait())
+            tasks.append(wire)
+            await asyncio.wait((primary, wire), return_when=asyncio.FIRST_COMPLETED)
+            started = time.perf_counter()
+            done, _ = await asyncio.wait((primary,), timeout=hedger.delay(endpoint))
+            if not done:
+                # Only hedge with a free concurrency slot, so hedges never
+                # hold back primary requests waiting for one
+                if self._concurrency.locked() or not hedger.try_hedge():
+                    self.stats.hedges_skipped += 1
+                else:
+                    self.stats.hedges += 1
+                    hedge = asyncio.ensure_future(self._send(endpoint, params, query))
+                    tasks.append(hedge)
+                    done, _ = await asyncio.wait((primary, hedge), return_when=asyncio.FIRST_COMPLETED)
+                    winner = self._hedge_winner(primary, hedge, done)
+                    if winner is None:
+                        await asyncio.wait((primary, hedge))
+                        winner = self._hedge_winner(primary, hedge, {primary, hedge}) or primary
+                    elapsed = time.perf_counter() - started
+                    if winner is hedge:
+                        self.stats.hedge_wins += 1
+                        self.stats.hedge_saved_seconds += hedger.saved(endpoint, elapsed)
+                    hedger.observe(endpoint, elapsed)
+                    return winner.result()
+            result = await primary
+            hedger.observe(endpoint, time.perf_counter() - started)
+            return result
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()  # a losing copy's error is not worth a warning
+                task.cancel()
+
+    @staticmethod
+    def _hedge_winner(primary: asyncio.Task, hedge: asyncio.Task, done: set) -> asyncio.Task | None:
+        """The first finished copy that got a 200, preferring the primary."""
+        for task in (primary, hedge):
+            if task in done and task.exception() is None and task.result()[0] == 200:
+                return task
+        return None
+
+    async def _backoff(self, delay: float) -> None:
+        self.stats.retries += 1
+        self.stats.backoff_seconds += delay
+        with self._tracer.span("backoff"):
+            await asyncio.sleep(delay)
+
+    async def _attempt(
+        self,
+        send: Callable[..., Awaitable[tuple[int, bytes, Any]]],
+        endpoint: str,
+        params: dict,
+        query: str | None,
+        started: float,
+    ) -> tuple[int, bytes, Any]:
+        """Send one attempt, bounded by what is left of the retry policy's deadline."""
+        policy = self._retry
+        if policy is None or policy.deadline is None:
+            return await send(endpoint, params, query)
+        async with asyncio.timeout(max(policy.deadline - (time.monotonic() - started), 0.0)):
+            return await send(endpoint, params, query)
+
+    def _throttled(self, status: int, headers: Any, adaptive: bool) -> bool:
+        """Feed a failed response to the limiter and say whether to wait out a 429.
+
+        The adaptive limiter holds every caller until the rate window resets,
+        and a key pool ejects the throttled key, so the request can be resent
+        without spending a retry.
+        """
+        paused = self._limiter.update(headers, status) if adaptive else 0.0
+        return status == 429 and bool(paused or self._keys is not None)
+
+    def _retry_delay(self, attempt: int, started: float, retry_after: float | None = None) -> float | None:
+        """Backoff before the next attempt, or None if the retry policy allows no more."""
+        delay = self._retry.backoff(attempt, retry_after)
+        return delay if self._retry.allows(attempt, time.monotonic() - started, delay) else None
+
+    def _status_retry_delay(
+        self, status: int, body: bytes, headers: Any, attempt: int, started: float
+    ) -> float:
+        """Backoff before retrying an error response, raising BraveApiError if it is not retried."""
+        policy = self._retry
+        if policy is not None and policy.retries_status(status):
+            delay = self._retry_delay(attempt, started, parse_retry_after(headers.get("Retry-After")))
+            if delay is not None:
+                return delay
+        raise BraveApiError(status, _error_data(body))
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: dict,
+        key: str,
+        ttl: float | None = None,
+        cache_if: Callable[[bytes], bool] | None = None,
+        query: str | None = None,
+    ) -> bytes:
+        """GET an endpoint through the cache and rate limiter, returning the raw body.
+
+        `query` is `params` already URL-encoded, if the caller has it.
+        Successful bodies are cached unless `cache_if` rejects them. Failed
+        attempts are retried according to the client's RetryPolicy. The
+        backoff happens outside the limiter, and each new attempt takes a
+        fresh rate-limit token.
+        """
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
         await self._ensure_session()
+        policy = self._retry
+        # A key pool tracks rate-limit headers per key instead
+        adaptive = self._keys is None and isinstance(self._limiter, AdaptiveLimiter)
+        hedged = self._hedger is not None and self._hedger.hedges(endpoint)
+        send = self._send_hedged if hedged else self._send
+        started = time.monotonic()
+        attempt = 0
+        throttle_waits = 0
+        while True:
+            attempt += 1
+            try:
+                status, body, headers = await self._attempt(send, endpoint, params, query, started)
+            except Exception as exc:
+                retried = policy is not None and policy.retries_exception(exc)
+                delay = self._retry_delay(attempt, started) if retried else None
+                if delay is None:
+                    raise
+                await self._backoff(delay)
+                continue
+
+            if status == 200:
+                break
+            if self._throttled(status, headers, adaptive) and throttle_waits < MAX_THROTTLE_WAITS:
+                throttle_waits += 1
+                attempt -= 1
+                continue
+            await self._backoff(self._status_retry_delay(status, body, headers, attempt, started))
+
+        if adaptive:
+            self._limiter.update(headers, status)
+        if self._cache is not None and (cache_if is None or cache_if(body)):
+            self._cache.set(key, body, self._cache.ttl_for(None) if ttl is None else ttl)
+        return body
+
+    async def web_search(
+        self, request: WebSearchRequest | PreparedWebSearchRequest
+    ) -> WebSearchApiResponse:
+        """Perform a web search query and return a parsed WebSearchApiResponse.
+
+        A WebSearchRequest is checked against the API limits and encoded on
+        every call (raising ValueError before any request is sent); pass the
+        result of ``request.prepare()`` to do that once for repeated calls.
+
+        Concurrent calls with identical parameters share a single HTTP request
+        and the same parsed response object. With ``decode_mode="raw"`` a dict
+        is returned instead, and with ``"bytes"`` the undecoded response body.
+        """
+        prepared = self._prepare(request)
+        params, key = prepared.params, prepared.key
+        ttl = self._cache.ttl_for(prepared.request.freshness) if self._cache is not None else None
+
+        async def fetch() -> WebSearchApiResponse:
+            with self._tracer.span("request", endpoint="web"):
+                body = await self._get("web", params, key, ttl, query=prepared.query_string)
+                with self._tracer.span("decode", endpoint="web", mode=self._decode_mode):
+                    return decode(WebSearchApiResponse, body, self._decode_mode)
+
+        return await self._single_flight(key, fetch)
+
+    async def web_search_many(
+        self, requests: Iterable[WebSearchRequest | PreparedWebSearchRequest], ordered: bool = True
+    ) -> AsyncIterator[BatchResult]:
+        """Run many web searches within the client's rate and concurrency budgets.
+
+        Yields a BatchResult per request, in input order when `ordered` is true
+        and as each completes otherwise. A failing request is reported on its
+        BatchResult and does not cancel the rest of the batch. `requests` is
+        consumed lazily, so arbitrarily large batches use bounded memory.
+        """
+
+        async def run(index: int, request: WebSearchRequest | PreparedWebSearchRequest) -> BatchResult:
+            return BatchResult(index, request, response=await self.web_search(request))
+
+        async for result in self._run_batch(requests, run, ordered):
+            yield result
+
+    async def _run_batch(
+        self,
+        requests: Iterable[WebSearchRequest | PreparedWebSearchRequest],
+        run: Callable[[int, WebSearchRequest | PreparedWebSearchRequest], Awaitable[BatchResult]],
+        ordered: bool,
+    ) -> AsyncIterator[BatchResult]:
+        """Drive `run` over `requests` in a bounded window of concurrent tasks."""
+
+        async def guarded(index: int, request: WebSearchRequest | PreparedWebSearchRequest) -> BatchResult:
+            try:
+                return await run(index, request)
+            except Exception as exc:
+                return BatchResult(index, request, error=exc)
+
+        # Keep enough tasks queued to saturate the concurrency cap while the
+        # head of the window is still in flight.
+        window = 2 * self._max_concurrent_requests
+        items = enumerate(requests)
+        pending: deque[asyncio.Task[BatchResult]] = deque()
+
+        def refill() -> None:
+            for index, request in items:
+                pending.append(asyncio.ensure_future(guarded(index, request)))
+                if len(pending) >= window:
+                    return
+
+        drain = self._next_in_order if ordered else self._next_completed
+        try:
+            refill()
+            while pending:
+                for result in await drain(pending):
+                    yield result
+                refill()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _next_in_order(pending: deque[asyncio.Task[BatchResult]]) -> list[BatchResult]:
+        """Wait for the task at the head of the window and remove it."""
+        return [await pending.popleft()]
+
+    @staticmethod
+    async def _next_completed(pending: deque[asyncio.Task[BatchResult]]) -> list[BatchResult]:
+        """Wait for at least one task in the window to finish and remove those that did."""
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            pending.remove(task)
+        return [task.result() for task in done]
+
+    @staticmethod
+    def _summary_key(response: Any) -> str | None:
+        """Pull the summarizer key out of a web search response in any decode mode."""
+        if isinstance(response, bytes):
+            response = loads(response)
+        if isinstance(response, dict):
+            return (response.get("summarizer") or {}).get("key")
+        summarizer = response.summarizer
+        if isinstance(summarizer, dict):
+            return summarizer.get("key")
+        return summarizer.key if summarizer is not None else None
+
+    async def search_and_summarize(
+        self, request: WebSearchRequest | PreparedWebSearchRequest, entity_info: bool = False
+    ) -> tuple[WebSearchApiResponse, Summarizer | None]:
+        """Run a web search with `summary` enabled and fetch its summary.
+
+        Returns the search response and the summary, or None when the search
+        produced no summarizer key.
+        """
+        request = self._prepare(request)
+        if not request.request.summary:
+            request = request.replace(summary=True)
+        response = await self.web_search(request)
+        key = self._summary_key(response)
+        if key is None:
+            return response, None
+        return response, await self.summarizer_search(key, entity_info=entity_info)
+
+    async def search_and_summarize_many(
+        self,
+        requests: Iterable[WebSearchRequest | PreparedWebSearchRequest],
+        entity_info: bool = False,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """Pipeline search_and_summarize over many requests.
+
+        Each request's summarizer call is issued as soon as its search returns,
+        so summaries for earlier queries overlap with searches for later ones.
+        Both stages share the client's rate limiter and concurrency cap.
+        """
+
+        async def run(index: int, request: WebSearchRequest | PreparedWebSearchRequest) -> BatchResult:
+            prepared = self._prepare(request)
+            if not prepared.request.summary:
+                prepared = prepared.replace(summary=True)
+            response = await self.web_search(prepared)
+            key = self._summary_key(response)
+            if key is None:
+                return BatchResult(index, request, response=response)
+            try:
+                summary = await self.summarizer_search(key, entity_info=entity_info)
+            except Exception as exc:
+                # Keep the search result even though its summary failed
+                return BatchResult(index, request, response=response, error=exc)
+            return BatchResult(index, request, response=response, summary=summary)
+
+        async for result in self._run_batch(requests, run, ordered):
+            yield result
+
+    async def iter_web_results(
+        self, request: WebSearchRequest | PreparedWebSearchRequest, max_pages: int = MAX_WEB_OFFSET + 1
+    ) -> AsyncIterator[SearchResult]:
+        """Yield web results page by page, starting at `request.offset`.
+
+        The next page is requested (through the rate limiter) as soon as a page
+        reports `more_results_available`, so it downloads while the caller
+        consumes the current one. Results whose URL was already yielded on an
+        earlier page are skipped.
+        """
+        if self._decode_mode in ("raw", "bytes"):
+            raise ValueError(f"iter_web_results needs parsed responses, not decode_mode={self._decode_mode!r}")
+        prepared = self._prepare(request)
+        first = prepared.request.offset or 0
+        last = min(MAX_WEB_OFFSET, first + max_pages - 1)
+
+        def fetch(offset: int) -> asyncio.Future[WebSearchApiResponse]:
+            page = prepared if offset == first else prepared.page(offset)
+            return asyncio.ensure_future(self.web_search(page))
+
+        seen: set[str] = set()
+        next_page: asyncio.Future[WebSearchApiResponse] | None = fetch(first)
+        try:
+            for offset in range(first, last + 1):
+                response = await next_page
+                next_page = None
+                results = response.web.results if response.web else []
+                more = bool(
+                    results and response.query and response.query.more_results_available
+                )
+                if more and offset < last:
+                    next_page = fetch(offset + 1)
+                for result in results:
+                    if result.url is not None:
+                        if result.url in seen:
+                            continue
+                        seen.add(result.url)
+                    yield result
+                if not more:
+                    break
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _fetch_summary(self, key: str, entity_info: bool, mode: DecodeMode) -> Any:
         params: dict[str, int | str] = {"key": key}
         if entity_info:
             params["entity_info"] = 1
+        flight_key = cache_key("summarizer", params)
+
+        async def fetch() -> Summarizer:
+            with self._tracer.span("request", endpoint="summarizer"):
+                body = await self._get("summarizer", params, flight_key, cache_if=_summary_complete)
+                with self._tracer.span("decode", endpoint="summarizer", mode=mode):
+                    return decode(Summarizer, body, mode)
+
+        return await self._single_flight(flight_key + ":" + mode, fetch)
+
+    async def _poll_summary(
+        self, key: str, entity_info: bool, poll: PollPolicy
+    ) -> AsyncIterator[Summarizer]:
+        """Yield each polled summarizer response until it finishes or the budget runs out."""
+        deadline = time.monotonic() + poll.budget
+        delays = poll.delays()
+        while True:
+            summary = await self._fetch_summary(key, entity_info, "validate")
+            yield summary
+            if summary.is_finished:
+                return
+            delay = next(delays, None)
+            if delay is None or time.monotonic() + delay > deadline:
+                return
+            await asyncio.sleep(delay)
+
+    async def summarizer_search(
+        self, key: str, entity_info: bool = False, poll: PollPolicy | None = None
+    ) -> Summarizer:
+        """Fetch a summary using a summary key from a previous web search.
 
-        async with self._limiter:
-            async with self._session.get(
-                self._api_path["summarizer"], params=params, headers=self._headers["summarizer"]
-            ) as resp:
-                data = await resp.json()
-                if resp.status != 200:
-                    raise BraveApiError(resp.status, data)
-                return Summarizer.model_validate(data)
+        Concurrent calls for the same `(key, entity_info)` share one request.
+        With a PollPolicy the summary is re-requested until its status is
+        complete or failed, and the last response is returned even if the
+        poll budget ran out first.
+        """
+        if poll is None:
+            return await self._fetch_summary(key, entity_info, self._decode_mode)
+        polls = self._poll_summary(key, entity_info, poll)
+        # The first poll always yields (or raises); keep the last one
+        summary = await anext(polls)
+        async for polled in polls:
+            summary = polled
+        return summary
+
+    async def iter_summary(
+        self, key: str, entity_info: bool = False, poll: PollPolicy | None = None
+    ) -> AsyncIterator[SummaryMessage]:
+        """Yield summary segments as they appear while the summary is generated.
+
+        Polls the summarizer according to `poll` and yields only the segments
+        added since the previous poll, stopping once the summary is finished.
+        """
+        seen = 0
+        async for summary in self._poll_summary(key, entity_info, poll or PollPolicy()):
+            messages = summary.summary or []
+            for message in messages[seen:]:
+                yield message
+            seen = max(seen, len(messages))
 
     async def close(self) -> None:
         """Close the underlying HTTP session."""
-        await self._session.close()
+        if self._session is not None:
+            await self._session.close()
 
     async def __aenter__(self):
+        await self._ensure_session()
+        if self._connection.warmup:
+            await self.warmup(self._connection.warmup)
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
         await self.close()
+
+
+class SyncBraveClient:
+    """Blocking facade over BraveClient for synchronous code.
+
+    A background thread runs one event loop that owns the BraveClient, so
+    every call shares its session, connection pool, limiter, cache and
+    in-flight requests. Methods may be called from any number of threads at
+    once; each blocks until its request completes or `call_timeout` passes.
+    Takes the same arguments as BraveClient.
+    """
+
+    def __init__(self, *args: Any, call_timeout: float | None = None, **kwargs: Any) -> None:
+        self._call_timeout = call_timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="brave-client", daemon=True)
+        self._thread.start()
+        self._closed = False
+        try:
+            # Built on the loop so its semaphore, limiter and session belong to it
+            self._client: BraveClient = self._run(self._open(args, kwargs))
+        except BaseException:
+            self._stop()
+            raise
+
+    @staticmethod
+    async def _open(args: tuple, kwargs: dict) -> BraveClient:
+        return await BraveClient(*args, **kwargs).__aenter__()
+
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncBraveClient cannot be called from its own event loop")
+        if self._closed:
+            coro.close()
+            raise RuntimeError("SyncBraveClient is closed")
+        # Carry the caller's scheduling() settings over to the loop thread
+        future = asyncio.run_coroutine_threadsafe(with_job(coro, current_job()), self._loop)
+        try:
+            return future.result(self._call_timeout)
+        except BaseException:
+            # Timed out or interrupted: do not leave the request running
+            future.cancel()
+            raise
+
+    def _iterate(self, agen: AsyncIterator[Any]) -> Iterator[Any]:
+        try:
+            while True:
+                try:
+                    yield self._run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._closed:
+                self._run(agen.aclose())
+
+    @property
+    def stats(self) -> ClientStats:
+        return self._client.stats
+
+    def pool_stats(self) -> dict[str, Any]:
+        return self._client.pool_stats()
+
+    def web_search(self, request: WebSearchRequest | PreparedWebSearchRequest) -> WebSearchApiResponse:
+        return self._run(self._client.web_search(request))
+
+    def summarizer_search(
+        self, key: str, entity_info: bool = False, poll: PollPolicy | None = None
+    ) -> Summarizer:
+        return self._run(self._client.summarizer_search(key, entity_info=entity_info, poll=poll))
+
+    def search_and_summarize(
+        self, request: WebSearchRequest | PreparedWebSearchRequest, entity_info: bool = False
+    ) -> tuple[WebSearchApiResponse, Summarizer | None]:
+        return self._run(self._client.search_and_summarize(request, entity_info=entity_info))
+
+    def web_search_many(
+        self, requests: Iterable[WebSearchRequest | PreparedWebSearchRequest], ordered: bool = True
+    ) -> Iterator[BatchResult]:
+        """Blocking iterator over BraveClient.web_search_many."""
+        return self._iterate(self._client.web_search_many(requests, ordered=ordered))
+
+    def search_and_summarize_many(
+        self,
+        requests: Iterable[WebSearchRequest | PreparedWebSearchRequest],
+        entity_info: bool = False,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """Blocking iterator over BraveClient.search_and_summarize_many."""
+        return self._iterate(
+            self._client.search_and_summarize_many(requests, entity_info=entity_info, ordered=ordered)
+        )
+
+    def close(self) -> None:
+        """Close the session and stop the background loop. Safe to call twice."""
+        if self._closed:
+            return
+        try:
+            self._run(self._client.close())
+        finally:
+            self._stop()
+
+    def _stop(self) -> None:
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> SyncBraveClient:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
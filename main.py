@@ -1,34 +1,26 @@
+from __future__ import annotations
+
 import asyncio
 import json
 import logging
 import os
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin
-from rich.logging import RichHandler
-
-from aiohttp import ClientSession, ClientTimeout, TCPConnector
-from aiolimiter import AsyncLimiter
-
-# Configure logger
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[RichHandler()]
-)
+
+# rich, aiohttp and aiolimiter are imported where they are used so that
+# importing this module does not pay for them
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
 log = logging.getLogger(__name__)
 
 # Request rate and concurrency
 API_MAX_CONCURRENT_REQUESTS = 1
 API_RPS = 1
-API_RATE_LIMIT = AsyncLimiter(API_RPS, 1)
 API_TIMEOUT = 20
 
 # Brave Search API Key
-try:
-    API_KEY = os.getenv("BRAVE_API_KEY")
-    log.info("Api key set")
-except Exception as e:
-    log.error("Api key not set")
+API_KEY = os.getenv("BRAVE_API_KEY")
 
 # Brave Search API host
 API_HOST = "https://api.search.brave.com"
@@ -95,8 +87,27 @@ async def get_summary(session: ClientSession) -> None:
         log.info(json.dumps(data, indent=2))
 
 
+def configure_logging() -> None:
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        handlers=[RichHandler()]
+    )
+
+
 async def main():
-    async with API_RATE_LIMIT:
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector
+    from aiolimiter import AsyncLimiter
+
+    if API_KEY:
+        log.info("Api key set")
+    else:
+        log.error("Api key not set")
+
+    async with AsyncLimiter(API_RPS, 1):
         async with ClientSession(
             connector=TCPConnector(limit=API_MAX_CONCURRENT_REQUESTS),
             timeout=ClientTimeout(API_TIMEOUT),
@@ -105,5 +116,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    configure_logging()
     asyncio.run(main())
 
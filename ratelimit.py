@@ -0,0 +1,258 @@
+"""Rate limiters that can be used in place of aiolimiter.AsyncLimiter."""
+
+from __future__ import annotations
+
+import asyncio
+import mmap
+import os
+import struct
+import time
+import uuid
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def parse_rate_limit_header(value: str | None) -> list[int]:
+    """Parse a comma separated X-RateLimit-* header such as "1, 15000"."""
+    if not value:
+        return []
+    parsed = []
+    for part in value.split(","):
+        try:
+            parsed.append(int(float(part.strip())))
+        except ValueError:
+            return []
+    return parsed
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def boot_id() -> bytes:
+    """16 bytes identifying the current boot, which time.monotonic() counts from."""
+    try:
+        with open("/proc/sys/kernel/random/boot_id", encoding="ascii") as f:
+            return uuid.UUID(f.read().strip()).bytes
+    except (OSError, ValueError):
+        # Elsewhere, the boot time to the minute stands in for the boot ID
+        booted = round((time.time() - time.monotonic()) / 60)
+        return booted.to_bytes(16, "big", signed=True)
+
+
+class AdaptiveLimiter:
+    """Token-bucket limiter that follows Brave's X-RateLimit-* response headers.
+
+    Brave reports one entry per policy window, shortest first, e.g.
+    ``X-RateLimit-Limit: 1, 15000`` for 1 request/second and 15000/month.
+    The per-second limit becomes the send rate, and a window with no requests
+    remaining pauses every caller until it resets, as long as that is within
+    `max_pause` seconds.
+    """
+
+    def __init__(self, rate: float = 1.0, max_pause: float = 60.0) -> None:
+        self.rate = float(rate)
+        self.max_pause = max_pause
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            capacity = max(self.rate, 1.0)
+            self._tokens = min(capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        # The lock keeps waiters in FIFO order while one of them sleeps
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for `seconds`, emptying the bucket."""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated_at = max(self._updated_at, self._paused_until)
+
+    def update(self, headers: Mapping[str, str], status: int = 200) -> float:
+        """Adjust to the rate-limit headers of a response.
+
+        Returns the number of seconds callers are paused for, or 0.0 if the
+        limiter is not paused (including when the reset is beyond `max_pause`).
+        """
+        limits = parse_rate_limit_header(headers.get("X-RateLimit-Limit"))
+        remaining = parse_rate_limit_header(headers.get("X-RateLimit-Remaining"))
+        resets = parse_rate_limit_header(headers.get("X-RateLimit-Reset"))
+
+        if limits and limits[0] > 0:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = float(limits[0])
+
+        pause = 0.0
+        for left, reset in zip(remaining, resets, strict=False):
+            if left <= 0:
+                pause = max(pause, float(reset))
+        if status == 429 and pause == 0.0:
+            # Throttled without a usable window; back off for one interval
+            pause = parse_retry_after(headers.get("Retry-After")) or 1.0 / self.rate
+
+        if 0.0 < pause <= self.max_pause:
+            self.pause(pause)
+            return pause
+        return 0.0
+
+
+class SharedLimiter(AdaptiveLimiter):
+    """AdaptiveLimiter whose bucket is shared by every process on the host.
+
+    The bucket lives in a small memory-mapped file at `path` and every
+    change to it is made under an exclusive ``flock``, so any number of
+    worker processes pointing at the same file share one send rate. Pauses
+    learned from X-RateLimit-* headers apply to all of them too. The lock is
+    only held while the state is read and written, never while waiting.
+    Requires a POSIX system.
+
+    Opening an existing file applies `rate` unless the API has reported a
+    rate since the file was created; `reset` discards the stored state
+    entirely. State written before the last reboot, or with timestamps out
+    of range, is discarded too, since time.monotonic() restarts at boot.
+    """
+
+    # boot_id, rate, tokens, updated_at, paused_until, rate_reported
+    _STATE = struct.Struct("=16sdddd?")
+
+    def __init__(self, path: str, rate: float = 1.0, max_pause: float = 60.0, reset: bool = False) -> None:
+        if fcntl is None:
+            raise RuntimeError("SharedLimiter requires fcntl (POSIX)")
+        super().__init__(rate, max_pause)
+        self.path = path
+        self._boot_id = boot_id()
+        self._reported = False
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._held = False
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != self._STATE.size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self._STATE.size)
+            self._map = mmap.mmap(self._fd, self._STATE.size)
+            if reset or not self._load():
+                self._init_state(rate)
+            elif not self._reported:
+                self.rate = float(rate)
+            self._store()
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _init_state(self, rate: float) -> None:
+        self.rate = float(rate)
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._reported = False
+
+    def _load(self) -> bool:
+        """Read the shared state; False if it is missing, from another boot or out of range."""
+        boot, rate, tokens, updated_at, paused_until, reported = self._STATE.unpack_from(self._map)
+        now = time.monotonic()
+        if (
+            boot != self._boot_id
+            or not rate > 0
+            or updated_at > now + 1.0
+            or paused_until > now + self.max_pause
+        ):
+            return False
+        self.rate, self._tokens, self._updated_at, self._paused_until = rate, tokens, updated_at, paused_until
+        self._reported = reported
+        return True
+
+    def _store(self) -> None:
+        self._STATE.pack_into(
+            self._map,
+            0,
+            self._boot_id,
+            self.rate,
+            self._tokens,
+            self._updated_at,
+            self._paused_until,
+            self._reported,
+        )
+
+    @contextmanager
+    def _shared(self) -> Iterator[None]:
+        """Load the shared state, let the caller change it, and store it back."""
+        if self._held:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._held = True
+        try:
+            if not self._load():
+                self._init_state(self.rate)
+            yield
+            self._store()
+        finally:
+            self._held = False
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent by this or any other process."""
+        async with self._lock:
+            while True:
+                with self._shared():
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        wait = self._paused_until - now
+                    else:
+                        self._refill(now)
+                        if self._tokens >= 1.0:
+                            self._tokens -= 1.0
+                            return
+                        wait = (1.0 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._shared():
+            super().pause(seconds)
+
+    def update(self, headers: Mapping[str, str], status: int = 200) -> float:
+        with self._shared():
+            limits = parse_rate_limit_header(headers.get("X-RateLimit-Limit"))
+            if limits and limits[0] > 0:
+                self._reported = True
+            return super().update(headers, status)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,199 @@
+"""Record and replay Brave API responses without touching the network.
+
+A Cassette stores responses keyed by endpoint path and query params, one JSON
+object per line (gzip-compressed when the path ends in ``.gz``).
+RecordingSession and ReplaySession can be passed to ``BraveClient(session=...)``
+in place of an aiohttp ClientSession.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import IO, Any
+from urllib.parse import urlsplit
+
+try:
+    from aiohttp import ClientSession
+except ImportError:
+    ClientSession = None
+
+try:
+    from multidict import CIMultiDict
+except ImportError:
+    CIMultiDict = dict
+
+from cache import cache_key
+
+# Response headers worth keeping in a recording
+RECORDED_HEADERS = (
+    "Content-Type",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Policy",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+)
+
+
+def recording_key(url: str, params: dict[str, Any] | None) -> str:
+    """Key a request by URL path and params, as seen on either side of the wire.
+
+    Each param becomes a list of strings, so a repeated param such as
+    ``goggles`` keys the same whether it arrives as a tuple from the client
+    or as the values of a query string on the server.
+    """
+    query = {
+        k: [str(item) for item in v] if isinstance(v, (list, tuple)) else [str(v)]
+        for k, v in (params or {}).items()
+    }
+    return cache_key(urlsplit(url).path, query)
+
+
+class CassetteMiss(KeyError):
+    """Raised when replaying a request that was never recorded."""
+
+
+@dataclass
+class Recording:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def to_json(self, key: str) -> str:
+        return json.dumps(
+            {
+                "key": key,
+                "status": self.status,
+                "headers": self.headers,
+                "body": self.body.decode(),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> tuple[str, Recording]:
+        entry = json.loads(line)
+        return entry["key"], cls(entry["status"], entry["headers"], entry["body"].encode())
+
+
+class Cassette:
+    """Recorded responses, optionally backed by a JSON-lines file."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.recordings: dict[str, Recording] = {}
+        if path and os.path.exists(path):
+            with self._open("rt") as f:
+                for line in f:
+                    if line.strip():
+                        key, recording = Recording.from_json(line)
+                        self.recordings[key] = recording
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode, encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self.recordings)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.recordings
+
+    def get(self, key: str) -> Recording | None:
+        return self.recordings.get(key)
+
+    def for_path(self, path: str) -> list[Recording]:
+        """All recordings made against an endpoint path."""
+        prefix = path + ":"
+        return [r for k, r in self.recordings.items() if k.startswith(prefix)]
+
+    def record(self, key: str, recording: Recording) -> None:
+        """Add a recording, appending it to the cassette file if there is one."""
+        self.recordings[key] = recording
+        if self.path:
+            with self._open("at") as f:
+                f.write(recording.to_json(key) + "\n")
+
+
+class ReplayResponse:
+    """Minimal stand-in for aiohttp.ClientResponse serving a Recording."""
+
+    def __init__(self, url: str, recording: Recording) -> None:
+        self.url = url
+        self.status = recording.status
+        self.headers = CIMultiDict(recording.headers)
+        self._body = recording.body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+    async def __aenter__(self) -> ReplayResponse:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class ReplaySession:
+    """Session that serves every request from a Cassette."""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    def get(
+        self, url: str, params: dict | None = None, headers: dict | None = None
+    ) -> ReplayResponse:
+        key = recording_key(url, params)
+        recording = self.cassette.get(key)
+        if recording is None:
+            raise CassetteMiss(key)
+        return ReplayResponse(url, recording)
+
+    async def close(self) -> None:
+        pass
+
+
+class _RecordingRequest:
+    def __init__(self, owner: RecordingSession, url: str, kwargs: dict) -> None:
+        self._owner = owner
+        self._url = url
+        self._kwargs = kwargs
+
+    async def __aenter__(self) -> ReplayResponse:
+        session = await self._owner._ensure_session()
+        async with session.get(self._url, **self._kwargs) as resp:
+            body = await resp.read()
+            headers = {h: resp.headers[h] for h in RECORDED_HEADERS if h in resp.headers}
+            recording = Recording(resp.status, headers, body)
+        self._owner.cassette.record(recording_key(self._url, self._kwargs.get("params")), recording)
+        return ReplayResponse(self._url, recording)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class RecordingSession:
+    """Session that forwards requests to a real ClientSession and records them."""
+
+    def __init__(self, cassette: Cassette, session: ClientSession | None = None) -> None:
+        self.cassette = cassette
+        self._session = session
+
+    async def _ensure_session(self) -> ClientSession:
+        if self._session is None:
+            self._session = ClientSession()
+        return self._session
+
+    def get(self, url: str, **kwargs: Any) -> _RecordingRequest:
+        return _RecordingRequest(self, url, kwargs)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,94 @@
+"""Retry and polling policies for BraveClient requests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+
+# Statuses that are usually transient: throttling and upstream failures
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@cache
+def default_retry_exceptions() -> tuple[type[BaseException], ...]:
+    """Timeouts and aiohttp client errors, imported on first use."""
+    try:
+        from aiohttp import ClientError
+    except ImportError:
+        ClientError = OSError
+    return (asyncio.TimeoutError, ClientError)
+
+
+def __getattr__(name: str) -> Any:
+    # DEFAULT_RETRY_EXCEPTIONS is resolved lazily to keep aiohttp out of import
+    if name == "DEFAULT_RETRY_EXCEPTIONS":
+        return default_retry_exceptions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Which failures to retry, how often, and how long to back off between tries.
+
+    Backoff uses full jitter: attempt n sleeps a uniformly random time in
+    ``[0, min(max_delay, base_delay * 2 ** (n - 1))]``. A ``Retry-After``
+    header, when present and honored, is used as a lower bound. ``deadline``
+    caps the total time spent on a call, attempts and backoff included.
+    """
+
+    max_attempts: int = 3
+    retry_statuses: frozenset[int] = DEFAULT_RETRY_STATUSES
+    # None retries timeouts and aiohttp client errors
+    retry_exceptions: tuple[type[BaseException], ...] | None = None
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    respect_retry_after: bool = True
+    deadline: float | None = None
+    rng: random.Random = field(default_factory=random.Random, compare=False, repr=False)
+
+    def retries_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def retries_exception(self, exc: BaseException) -> bool:
+        return isinstance(exc, self.retry_exceptions or default_retry_exceptions())
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self.rng.uniform(0.0, cap)
+        if self.respect_retry_after and retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def allows(self, attempt: int, elapsed: float, delay: float) -> bool:
+        """Whether another attempt may follow attempt `attempt` after `delay`."""
+        if attempt >= self.max_attempts:
+            return False
+        return self.deadline is None or elapsed + delay < self.deadline
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """How often to re-request a summary that is still being generated.
+
+    Polls start `interval` seconds apart and the gap grows by `multiplier` up
+    to `max_interval`. Polling stops after `max_polls` requests or once
+    `budget` seconds have passed, whichever comes first.
+    """
+
+    interval: float = 0.25
+    multiplier: float = 1.5
+    max_interval: float = 2.0
+    max_polls: int = 20
+    budget: float = 30.0
+
+    def delays(self) -> Iterator[float]:
+        """Yield the wait before each poll after the first."""
+        delay = self.interval
+        for _ in range(self.max_polls - 1):
+            yield delay
+            delay = min(self.max_interval, delay * self.multiplier)
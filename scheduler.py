@@ -0,0 +1,302 @@
+"""Priority, deadline and tenant-aware ordering of requests in front of the limiter.
+
+A rate limiter serves waiters first come, first served, so a large batch
+queued ahead of an interactive search delays it by the batch's whole length.
+Scheduler keeps waiters in its own queues and lets exactly one at a time go
+on to take a concurrency slot and rate-limit token. The next one is chosen
+by priority class first, then fairly between tenants of that class in
+proportion to their weights.
+
+A request whose deadline passes while it is queued fails with
+DeadlineExceeded. So does one that, judging by the recent dispatch rate and
+the queue ahead of it, could not be sent in time. Both happen before any
+rate budget is spent on it.
+
+Calls are tagged with ``scheduling()``, which applies to every request made
+inside it, including retries, pagination and batch helpers::
+
+    with scheduling(Priority.BATCH, tenant="nightly-etl"):
+        async for item in client.web_search_many(requests):
+            ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import enum
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Coroutine, Iterator, Mapping
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+# Queue wait samples kept per priority class for the percentiles in stats()
+WAIT_WINDOW = 1024
+
+# Smoothing factor for the observed interval between dispatches
+INTERVAL_ALPHA = 0.2
+
+
+class Priority(enum.IntEnum):
+    """Priority classes; a lower value is always dispatched first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a request cannot be sent before its deadline."""
+
+
+@dataclass(frozen=True)
+class Job:
+    """How the requests of one call are scheduled.
+
+    `deadline` is a time.monotonic() value by which each request must have
+    been sent; it does not limit how long the response may take.
+    """
+
+    priority: Priority = Priority.NORMAL
+    tenant: str = "default"
+    deadline: float | None = None
+
+
+_DEFAULT_JOB = Job()
+_current_job: contextvars.ContextVar[Job] = contextvars.ContextVar("brave_job")
+
+
+def current_job() -> Job:
+    return _current_job.get(_DEFAULT_JOB)
+
+
+@contextmanager
+def scheduling(
+    priority: Priority | None = None,
+    tenant: str | None = None,
+    timeout: float | None = None,
+) -> Iterator[Job]:
+    """Schedule the requests made in this block with the given settings.
+
+    Unset arguments are inherited from an enclosing block. `timeout` is in
+    seconds from now; a nested timeout never extends an outer deadline.
+    """
+    outer = current_job()
+    deadline = outer.deadline
+    if timeout is not None:
+        deadline = time.monotonic() + timeout if deadline is None else min(deadline, time.monotonic() + timeout)
+    job = Job(
+        outer.priority if priority is None else Priority(priority),
+        outer.tenant if tenant is None else tenant,
+        deadline,
+    )
+    token = _current_job.set(job)
+    try:
+        yield job
+    finally:
+        _current_job.reset(token)
+
+
+async def with_job(coro: Coroutine[Any, Any, Any], job: Job) -> Any:
+    """Await `coro` with `job` as the current job, e.g. in another thread's loop."""
+    _current_job.set(job)
+    return await coro
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+@dataclass
+class _Waiter:
+    job: Job
+    future: asyncio.Future[None]
+    queued: float
+
+
+class Scheduler:
+    """Orders requests by priority class, then by weighted fair share of tenants.
+
+    `weights` gives tenants their relative share of dispatches within a
+    priority class; unlisted tenants get `default_weight`. Higher classes
+    are served strictly first, so BATCH only receives budget that
+    INTERACTIVE and NORMAL traffic leave unused.
+    """
+
+    def __init__(self, weights: Mapping[str, float] | None = None, default_weight: float = 1.0) -> None:
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self._queues: dict[Priority, dict[str, deque[_Waiter]]] = {p: {} for p in Priority}
+        # Start-time fair queueing: each tenant's virtual time advances by
+        # 1/weight per dispatch, and the tenant furthest behind goes next
+        self._vtime: dict[str, float] = {}
+        self._busy = False
+        self._last_dispatch: float | None = None
+        self._interval = 0.0
+        self._waits: dict[Priority, deque[float]] = {p: deque(maxlen=WAIT_WINDOW) for p in Priority}
+        self._dispatched: dict[Priority, int] = dict.fromkeys(Priority, 0)
+        self._expired: dict[Priority, int] = dict.fromkeys(Priority, 0)
+
+    def weight(self, tenant: str) -> float:
+        return self.weights.get(tenant, self.default_weight)
+
+    def depth(self, priority: Priority | None = None) -> int:
+        """Requests waiting in one priority class, or in all of them."""
+        classes = Priority if priority is None else (priority,)
+        return sum(len(q) for p in classes for q in self._queues[p].values())
+
+    def estimated_wait(self, job: Job) -> float:
+        """Seconds before a request for `job` queued now would be dispatched."""
+        ahead = sum(self.depth(p) for p in Priority if p < job.priority) + int(self._busy)
+        tenants = self._queues[job.priority]
+        own = len(tenants.get(job.tenant, ()))
+        # While the tenant's own queue drains, other tenants of the class get
+        # dispatches in proportion to their weights
+        others = sum(self.weight(t) for t in tenants if t != job.tenant)
+        share = (own + 1) * others / self.weight(job.tenant)
+        ahead += own + min(self.depth(job.priority) - own, share)
+        return ahead * self._interval
+
+    @asynccontextmanager
+    async def turn(self, job: Job | None = None) -> AsyncIterator[None]:
+        """Wait until `job` is next, and hold the turn for the block.
+
+        The block should take whatever the request needs before it can be
+        sent (a concurrency slot, a rate-limit token); the next request is
+        chosen when it exits. The block is also bounded by the deadline.
+        """
+        job = job or current_job()
+        await self._acquire(job)
+        try:
+            if job.deadline is None:
+                yield
+                return
+            timeout = asyncio.timeout(max(job.deadline - time.monotonic(), 0.0))
+            try:
+                async with timeout:
+                    yield
+            except TimeoutError:
+                if not timeout.expired():
+                    raise
+                self._expired[job.priority] += 1
+                raise DeadlineExceeded("Request could not be sent before its deadline") from None
+        finally:
+            self._release()
+
+    async def _acquire(self, job: Job) -> None:
+        now = time.monotonic()
+        if job.deadline is not None and now + self.estimated_wait(job) > job.deadline:
+            self._expired[job.priority] += 1
+            raise DeadlineExceeded("Request cannot be sent before its deadline at the current rate")
+        if not self._busy and not self.depth():
+            self._dispatch(job, now, now)
+            return
+
+        if not self._waiting(job.tenant):
+            # An idle tenant does not bank credit for the time it sent nothing
+            self._vtime[job.tenant] = max(self._vtime.get(job.tenant, 0.0), self._floor())
+        waiter = _Waiter(job, asyncio.get_running_loop().create_future(), now)
+        self._queues[job.priority].setdefault(job.tenant, deque()).append(waiter)
+        try:
+            if job.deadline is None:
+                await waiter.future
+            else:
+                async with asyncio.timeout(max(job.deadline - now, 0.0)):
+                    await waiter.future
+        except BaseException as exc:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted the turn just as the wait was abandoned: pass it on
+                self._release()
+            else:
+                waiter.future.cancel()
+                self._discard(waiter)
+            if isinstance(exc, TimeoutError):
+                self._expired[job.priority] += 1
+                raise DeadlineExceeded("Request could not be sent before its deadline") from None
+            raise
+
+    def _waiting(self, tenant: str) -> bool:
+        return any(tenant in queues for queues in self._queues.values())
+
+    def _floor(self) -> float:
+        """Virtual time of the furthest-behind tenant with requests waiting."""
+        waiting = [self._vtime[t] for queues in self._queues.values() for t in queues]
+        return min(waiting, default=max(self._vtime.values(), default=0.0))
+
+    def _discard(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.job.priority].get(waiter.job.tenant)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[waiter.job.priority][waiter.job.tenant]
+
+    def _next(self) -> _Waiter | None:
+        for priority in Priority:
+            tenants = self._queues[priority]
+            if not tenants:
+                continue
+            tenant = min(tenants, key=lambda t: self._vtime.get(t, 0.0))
+            queue = tenants[tenant]
+            waiter = queue.popleft()
+            if not queue:
+                del tenants[tenant]
+            return waiter
+        return None
+
+    def _dispatch(self, job: Job, queued: float, now: float) -> None:
+        self._busy = True
+        self._vtime[job.tenant] = self._vtime.get(job.tenant, 0.0) + 1.0 / self.weight(job.tenant)
+        self._waits[job.priority].append(now - queued)
+        self._dispatched[job.priority] += 1
+
+    def _release(self) -> None:
+        now = time.monotonic()
+        backlogged = self.depth() > 0
+        if backlogged and self._last_dispatch is not None:
+            # Only gaps with a backlog measure how fast requests can be sent
+            sample = now - self._last_dispatch
+            self._interval = sample if not self._interval else (
+                INTERVAL_ALPHA * sample + (1 - INTERVAL_ALPHA) * self._interval
+            )
+        self._last_dispatch = now
+        self._busy = False
+        while True:
+            waiter = self._next()
+            if waiter is None:
+                return
+            if not waiter.future.done():
+                self._dispatch(waiter.job, waiter.queued, now)
+                waiter.future.set_result(None)
+                return
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, dispatches, expirations and wait percentiles per class."""
+        classes = {}
+        for priority in Priority:
+            waits = list(self._waits[priority])
+            classes[priority.name.lower()] = {
+                "depth": self.depth(priority),
+                "dispatched": self._dispatched[priority],
+                "expired": self._expired[priority],
+                "wait_p50_ms": _percentile(waits, 50) * 1000,
+                "wait_p99_ms": _percentile(waits, 99) * 1000,
+            }
+        tenants: dict[str, int] = {}
+        for queues in self._queues.values():
+            for tenant, queue in queues.items():
+                tenants[tenant] = tenants.get(tenant, 0) + len(queue)
+        return {
+            "depth": self.depth(),
+            "classes": classes,
+            "tenants": tenants,
+            "dispatch_interval_ms": self._interval * 1000,
+        }
@@ -0,0 +1,170 @@
+"""Local stand-in for the Brave Search API serving responses from a Cassette.
+
+Usage:
+  python stubserver.py --cassette recorded.jsonl.gz --port 8080 \\
+      --latency 0.05 --jitter 0.02 --error-rate 0.01 --rps 50
+
+Point a client at it with ``BraveClient(api_host="http://localhost:8080")``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+
+from replay import Cassette, Recording, recording_key
+
+WEB_PATH = "/res/v1/web/search"
+SUMMARIZER_PATH = "/res/v1/summarizer/search"
+
+# Counters of requests served, injected errors and throttled requests
+STATS = web.AppKey("stats", dict)
+
+
+class _RateWindow:
+    """Fixed one-second window counting requests, mirroring Brave's headers."""
+
+    def __init__(self, rps: int, monthly: int) -> None:
+        self.rps = rps
+        self.monthly = monthly
+        self.monthly_used = 0
+        self._window = 0
+        self._count = 0
+
+    def hit(self) -> tuple[bool, dict[str, str]]:
+        now = time.monotonic()
+        window = int(now)
+        if window != self._window:
+            self._window = window
+            self._count = 0
+        allowed = self._count < self.rps and self.monthly_used < self.monthly
+        if allowed:
+            self._count += 1
+            self.monthly_used += 1
+        reset = max(1, round(self._window + 1 - now))
+        headers = {
+            "X-RateLimit-Limit": f"{self.rps}, {self.monthly}",
+            "X-RateLimit-Policy": f"{self.rps};w=1, {self.monthly};w=2592000",
+            "X-RateLimit-Remaining": f"{self.rps - self._count}, {self.monthly - self.monthly_used}",
+            "X-RateLimit-Reset": f"{reset}, 2592000",
+        }
+        return allowed, headers
+
+
+def make_app(
+    cassette: Cassette,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    rps: int | None = None,
+    monthly_quota: int = 15_000_000,
+    fallback: bool = True,
+    seed: int | None = None,
+) -> web.Application:
+    """Build an aiohttp app serving the web and summarizer search endpoints.
+
+    Requests are answered with the recording for their exact params. With
+    `fallback`, unknown params get any recording for the same endpoint so a
+    small cassette can serve an arbitrary query mix. `error_rate` of requests
+    fail with `error_status`, and with `rps` set the server enforces a rate
+    limit per subscription token and sends X-RateLimit-* headers like the
+    real API.
+    """
+    rng = random.Random(seed)
+    windows: dict[str, _RateWindow] = {}
+    fallbacks = {path: cassette.for_path(path) for path in (WEB_PATH, SUMMARIZER_PATH)}
+    stats = {"requests": 0, "errors": 0, "throttled": 0}
+
+    async def handler(request: web.Request) -> web.Response:
+        stats["requests"] += 1
+        delay = latency + (rng.uniform(0.0, jitter) if jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        headers: dict[str, str] = {}
+        if rps:
+            token = request.headers.get("X-Subscription-Token", "")
+            window = windows.get(token)
+            if window is None:
+                window = windows[token] = _RateWindow(rps, monthly_quota)
+            allowed, headers = window.hit()
+            if not allowed:
+                stats["throttled"] += 1
+                return _json_response(429, {"type": "ErrorResponse", "error": {"code": "RATE_LIMITED"}}, headers)
+        if error_rate and rng.random() < error_rate:
+            stats["errors"] += 1
+            return _json_response(error_status, {"type": "ErrorResponse", "error": {"code": "INJECTED"}}, headers)
+
+        recording = cassette.get(recording_key(request.path, {k: request.query.getall(k) for k in request.query}))
+        if recording is None and fallback and fallbacks[request.path]:
+            recording = rng.choice(fallbacks[request.path])
+        if recording is None:
+            return _json_response(404, {"type": "ErrorResponse", "error": {"code": "NOT_RECORDED"}}, headers)
+        return _recorded_response(recording, headers)
+
+    app = web.Application()
+    app[STATS] = stats
+    app.router.add_get(WEB_PATH, handler)
+    app.router.add_get(SUMMARIZER_PATH, handler)
+    return app
+
+
+def _json_response(status: int, data: dict, headers: dict[str, str]) -> web.Response:
+    return web.Response(
+        status=status, body=json.dumps(data).encode(), content_type="application/json", headers=headers
+    )
+
+
+def _recorded_response(recording: Recording, headers: dict[str, str]) -> web.Response:
+    merged = {k: v for k, v in recording.headers.items() if k.lower() != "content-type"}
+    merged.update(headers)
+    return web.Response(
+        status=recording.status, body=recording.body, content_type="application/json", headers=merged
+    )
+
+
+async def start_server(
+    app: web.Application, host: str = "localhost", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Start `app` in the running loop and return its runner and base URL."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded Brave API responses locally")
+    parser.add_argument("--cassette", required=True, help="Cassette file to serve")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base delay per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests to fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rps", type=int, default=None, help="Enforce a per-second rate limit")
+    parser.add_argument("--no-fallback", action="store_true", help="404 on unrecorded params")
+    args = parser.parse_args()
+
+    app = make_app(
+        Cassette(args.cassette),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rps=args.rps,
+        fallback=not args.no_fallback,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from batch import BatchConfig, read_queries, run_batch
+from replay import Cassette, Recording, recording_key
+from stubserver import STATS, make_app, start_server
+
+
+@pytest.fixture
+def stub_server():
+    """Serve a one-recording cassette from a background thread."""
+    cassette = Cassette()
+    body = json.dumps({"type": "search", "query": {"original": "x"}}).encode()
+    cassette.record(recording_key("/res/v1/web/search", {"q": "x"}), Recording(200, {}, body))
+    app = make_app(cassette)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    runner, base_url = asyncio.run_coroutine_threadsafe(start_server(app), loop).result()
+    yield app, base_url
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def test_read_queries_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "q.jsonl"
+    jsonl.write_text('"plain"\n{"q": "with count", "count": 3}\n\n')
+    assert list(read_queries(str(jsonl))) == [{"q": "plain"}, {"q": "with count", "count": 3}]
+
+    table = tmp_path / "q.csv"
+    table.write_text("q,count\nfirst,5\nsecond,\n")
+    assert list(read_queries(str(table))) == [{"q": "first", "count": "5"}, {"q": "second"}]
+
+
+def test_batch_writes_parts_and_resumes_from_cache(tmp_path, stub_server):
+    app, base_url = stub_server
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text("".join(json.dumps({"q": f"query {i}"}) + "\n" for i in range(7)) + '{"q": "bad", "count": "many"}\n')
+    config = BatchConfig(
+        output=str(tmp_path / "out"), workers=2, chunk_size=3, rps=1000, api_key="key", api_host=base_url
+    )
+
+    summary = run_batch(str(queries), config)
+    assert (summary.chunks_written, summary.ok, summary.errors) == (3, 7, 1)
+    parts = sorted(p for p in os.listdir(config.output) if p.startswith("part-"))
+    assert parts == ["part-000000000.jsonl", "part-000000003.jsonl", "part-000000006.jsonl"]
+    records = [json.loads(line) for p in parts for line in open(os.path.join(config.output, p))]
+    assert [r["index"] for r in records] == list(range(8))
+    assert records[0]["response"]["query"]["original"] == "x"
+    assert not records[7]["ok"]  # an invalid count fails validation
+    served = app[STATS]["requests"]
+    assert served == 7
+
+    # An interrupted chunk is refetched from the shared cache, not the API
+    os.remove(os.path.join(config.output, parts[1]))
+    summary = run_batch(str(queries), config)
+    assert (summary.chunks_written, summary.chunks_skipped) == (1, 2)
+    assert app[STATS]["requests"] == served
+
+
+def test_resumed_batch_uses_its_own_rate(tmp_path):
+    from batch import RATE_BUCKET_FILE
+    from ratelimit import SharedLimiter
+
+    output = tmp_path / "out"
+    output.mkdir()
+    bucket = str(output / RATE_BUCKET_FILE)
+    # Left behind by an earlier run that learned 1 rps from the API
+    earlier = SharedLimiter(bucket, rate=1)
+    earlier.update({"X-RateLimit-Limit": "1"})
+    earlier.close()
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text("")
+
+    run_batch(str(queries), BatchConfig(output=str(output), rps=25, api_key="key"))
+    with open(bucket, "rb") as f:
+        _, rate, *_, reported = SharedLimiter._STATE.unpack(f.read())
+    assert (rate, reported) == (25, False)
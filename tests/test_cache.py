@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from cache import MemoryCache, ResponseCache, SqliteCache, cache_key
+
+
+def test_cache_key_is_order_independent():
+    assert cache_key("web", {"q": "a", "count": 5}) == cache_key("web", {"count": 5, "q": "a"})
+    assert cache_key("web", {"q": "a"}) != cache_key("summarizer", {"q": "a"})
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", {"v": 1}, ttl=60)
+    cache.set("b", {"v": 2}, ttl=60)
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3}, ttl=60)
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+    assert cache.hits == 3
+    assert cache.misses == 1
+
+
+def test_memory_cache_ttl_expiry():
+    cache = MemoryCache()
+    cache.set("a", {"v": 1}, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_freshness_ttl():
+    cache = MemoryCache(ttl=10, freshness_ttl={"pd": 1})
+    assert cache.ttl_for(None) == 10
+    assert cache.ttl_for("pd") == 1
+    assert cache.ttl_for("2022-04-01to2022-07-30") == 10
+
+
+def test_sqlite_cache_roundtrip(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SqliteCache(path, maxsize=2)
+    cache.set("a", b"1", ttl=60)
+    cache.set("b", b"2", ttl=60)
+    cache.get("a")
+    cache.set("c", b"3", ttl=60)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    cache.close()
+
+    reopened = SqliteCache(path)
+    assert reopened.get("a") == b"1"
+    assert reopened.get("c") == b"3"
+    reopened.close()
+
+
+def test_sqlite_cache_is_shared_between_open_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    # Separate connections, as in separate worker processes
+    writer, reader = SqliteCache(path), SqliteCache(path)
+    writer.set("a", b"1", ttl=60)
+    assert reader.get("a") == b"1"
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_cache_evicts_in_batches(tmp_path):
+    cache = SqliteCache(str(tmp_path / "cache.db"), maxsize=20)
+    for i in range(20):
+        cache.set(str(i), b"x", ttl=60)
+    cache.set("0", b"y", ttl=60)  # replacing an entry does not grow the cache
+    assert len(cache) == 20
+    cache.set("20", b"x", ttl=60)
+    # The three least recently used entries go at once, leaving room for two more
+    assert len(cache) == 18
+    assert [cache.get(k) for k in ("1", "2", "3")] == [None, None, None]
+    assert cache.get("0") == b"y"
+    cache.set("21", b"x", ttl=60)
+    cache.set("22", b"x", ttl=60)
+    assert len(cache) == 20
+    cache.close()
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
@@ -1,22 +1,32 @@
 import asyncio
+import json
+import os
+import subprocess
+import sys
 
 import pytest
 
+from cache import MemoryCache
 from lib import BraveClient, BraveApiError
+from retry import PollPolicy, RetryPolicy
 from httpobjects import WebSearchRequest, WebSearchApiResponse, Summarizer
 
 
 class DummyResponse:
     """Stand-in for aiohttp.ClientResponse supporting async context manager."""
 
-    def __init__(self, status: int, json_data: dict):
+    def __init__(self, status: int, json_data: dict, headers: dict | None = None):
         self.status = status
         self._json_data = json_data
+        self.headers = headers or {}
         self.url = "dummy://"
 
     async def json(self) -> dict:
         return self._json_data
 
+    async def read(self) -> bytes:
+        return json.dumps(self._json_data).encode()
+
     async def __aenter__(self):
         return self
 
@@ -76,13 +86,18 @@ def test_web_search_error():
 
 
 def test_summarizer_search_success():
-    dummy_json = {"summary": "This is a summary"}
+    dummy_json = {
+        "type": "summarizer",
+        "status": "complete",
+        "summary": [{"type": "token", "data": "This is a summary"}],
+    }
     dummy_resp = DummyResponse(200, dummy_json)
     session = DummySession(dummy_resp)
     limiter = DummyLimiter()
     client = BraveClient(api_key="test-key", session=session, limiter=limiter)
     response = asyncio.run(client.summarizer_search("summary-key", entity_info=True))
     assert isinstance(response, Summarizer)
+    assert response.text == "This is a summary"
 
 
 def test_summarizer_search_error():
@@ -113,3 +128,515 @@ def test_web_search_bool_params_conversion():
     assert params.get("extra_snippets") == 1
     assert params.get("spellcheck") == 0
     assert params.get("summary") == 1
+
+
+def test_web_search_accepts_prepared_request():
+    session = DummySession(DummyResponse(200, {"type": "search", "query": {"original": "k2"}}))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter(), cache=MemoryCache())
+    prepared = WebSearchRequest(q="k2", extra_snippets=True).prepare()
+    asyncio.run(client.web_search(prepared))
+    # The same request unprepared resolves to the same cache entry
+    asyncio.run(client.web_search(WebSearchRequest(q=" k2 ", extra_snippets=True)))
+    assert len(session.requests) == 1
+    assert session.requests[0][1] == {"q": "k2", "extra_snippets": 1}
+
+
+def test_web_search_rejects_invalid_request_before_sending():
+    session = DummySession(DummyResponse(200, {}))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+    with pytest.raises(ValueError):
+        asyncio.run(client.web_search(WebSearchRequest(q="k2", count=21)))
+    assert session.requests == []
+
+
+class CountingLimiter(DummyLimiter):
+    """Limiter that records how many times it was entered."""
+
+    def __init__(self):
+        self.entered = 0
+
+    async def __aenter__(self):
+        self.entered += 1
+
+
+def test_web_search_cache_hit_skips_limiter_and_http():
+    dummy_json = {"type": "search", "query": {"original": "cached"}}
+    session = DummySession(DummyResponse(200, dummy_json))
+    limiter = CountingLimiter()
+    cache = MemoryCache()
+    client = BraveClient(api_key="test-key", session=session, limiter=limiter, cache=cache)
+
+    async def go():
+        first = await client.web_search(WebSearchRequest(q="cached"))
+        second = await client.web_search(WebSearchRequest(q="cached"))
+        return first, second
+
+    first, second = asyncio.run(go())
+    assert first == second
+    assert len(session.requests) == 1
+    assert limiter.entered == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_web_search_error_not_cached():
+    session = DummySession(DummyResponse(500, {"error": "boom"}))
+    cache = MemoryCache()
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter(), cache=cache)
+    for _ in range(2):
+        with pytest.raises(BraveApiError):
+            asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert len(session.requests) == 2
+    assert len(cache) == 0
+
+
+class RoutingSession(DummySession):
+    """Session returning a response chosen from the request params."""
+
+    def __init__(self, route):
+        super().__init__(None)
+        self._route = route
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+        self.requests.append((url, params, headers))
+        return self._route(params)
+
+
+def _search_route(params):
+    if params["q"].startswith("bad"):
+        return DummyResponse(422, {"error": params["q"]})
+    return DummyResponse(200, {"type": "search", "query": {"original": params["q"]}})
+
+
+def test_web_search_many_ordered_with_errors():
+    session = RoutingSession(_search_route)
+    client = BraveClient(
+        api_key="test-key", session=session, limiter=DummyLimiter(), max_concurrent_requests=3
+    )
+    queries = ["a", "bad-1", "b", "c", "bad-2", "d", "e"]
+
+    async def go():
+        return [r async for r in client.web_search_many(WebSearchRequest(q=q) for q in queries)]
+
+    results = asyncio.run(go())
+    assert [r.index for r in results] == list(range(len(queries)))
+    assert [r.ok for r in results] == [not q.startswith("bad") for q in queries]
+    assert results[0].response.query.original == "a"
+    assert isinstance(results[1].error, BraveApiError)
+    assert results[1].error.status == 422
+    assert len(session.requests) == len(queries)
+
+
+def test_web_search_many_as_completed():
+    session = RoutingSession(_search_route)
+    client = BraveClient(
+        api_key="test-key", session=session, limiter=DummyLimiter(), max_concurrent_requests=2
+    )
+
+    async def go():
+        requests = [WebSearchRequest(q=str(i)) for i in range(5)]
+        return [r async for r in client.web_search_many(requests, ordered=False)]
+
+    results = asyncio.run(go())
+    assert sorted(r.index for r in results) == list(range(5))
+    assert all(r.ok for r in results)
+
+
+class SlowResponse(DummyResponse):
+    """Response that yields to the event loop before returning its body."""
+
+    async def read(self) -> bytes:
+        await asyncio.sleep(0.01)
+        return await super().read()
+
+
+def test_web_search_coalesces_identical_inflight_requests():
+    dummy_json = {"type": "search", "query": {"original": "trending"}}
+    session = DummySession(SlowResponse(200, dummy_json))
+    limiter = CountingLimiter()
+    client = BraveClient(api_key="test-key", session=session, limiter=limiter)
+
+    async def go():
+        return await asyncio.gather(
+            *(client.web_search(WebSearchRequest(q="trending")) for _ in range(5)),
+            client.web_search(WebSearchRequest(q="other")),
+        )
+
+    results = asyncio.run(go())
+    assert len(session.requests) == 2
+    assert limiter.entered == 2
+    assert all(r is results[0] for r in results[:5])
+    assert client.stats.coalesced == 4
+    assert client._inflight == {}
+
+
+def test_pool_stats_counts_requests_in_flight():
+    session = DummySession(SlowResponse(200, {"type": "search"}))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter(), max_concurrent_requests=2)
+
+    async def go():
+        searches = [asyncio.ensure_future(client.web_search(WebSearchRequest(q=f"q{i}"))) for i in range(3)]
+        await asyncio.sleep(0.005)
+        during = client.pool_stats()
+        await asyncio.gather(*searches)
+        return during, client.pool_stats()
+
+    during, after = asyncio.run(go())
+    # The third search waits for a concurrency slot
+    assert during["in_flight"] == 2 and during["busy"] == 2
+    assert after["in_flight"] == 0 and after["busy"] == 0
+
+
+def test_summarizer_search_coalesces_on_key_and_entity_info():
+    session = DummySession(SlowResponse(200, {"type": "summarizer", "status": "complete"}))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+
+    async def go():
+        return await asyncio.gather(
+            client.summarizer_search("k", entity_info=True),
+            client.summarizer_search("k", entity_info=True),
+            client.summarizer_search("k", entity_info=False),
+        )
+
+    asyncio.run(go())
+    assert len(session.requests) == 2
+    assert client.stats.coalesced == 1
+
+
+def test_coalesced_callers_share_errors():
+    session = DummySession(SlowResponse(429, {"error": "rate limited"}))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+
+    async def go():
+        return await asyncio.gather(
+            *(client.web_search(WebSearchRequest(q="x")) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(go())
+    assert len(session.requests) == 1
+    assert all(isinstance(r, BraveApiError) and r.status == 429 for r in results)
+
+
+class SequenceSession(DummySession):
+    """Session returning the given responses in turn."""
+
+    def __init__(self, responses):
+        super().__init__(None)
+        self._responses = list(responses)
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+        self.requests.append((url, params, headers))
+        return self._responses.pop(0)
+
+
+def test_adaptive_limiter_waits_out_429_instead_of_failing():
+    throttled = DummyResponse(
+        429,
+        {"error": "rate limited"},
+        {"X-RateLimit-Limit": "10, 15000", "X-RateLimit-Remaining": "0, 100", "X-RateLimit-Reset": "1, 100"},
+    )
+    ok = DummyResponse(200, {"type": "search", "query": {"original": "x"}})
+    session = SequenceSession([throttled, ok])
+    client = BraveClient(api_key="test-key", session=session, adaptive_rate_limit=True)
+    response = asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert response.query.original == "x"
+    assert len(session.requests) == 2
+    assert client._limiter.rate == 10.0
+
+
+def test_retry_policy_retries_transient_statuses():
+    ok = DummyResponse(200, {"type": "search", "query": {"original": "x"}})
+    session = SequenceSession(
+        [DummyResponse(503, {}), DummyResponse(429, {}, {"Retry-After": "0.02"}), ok]
+    )
+    limiter = CountingLimiter()
+    client = BraveClient(
+        api_key="test-key",
+        session=session,
+        limiter=limiter,
+        retry=RetryPolicy(max_attempts=3, base_delay=0.001),
+    )
+    response = asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert response.query.original == "x"
+    # Every attempt is charged against the limiter
+    assert limiter.entered == 3
+    assert client.stats.retries == 2
+    assert client.stats.backoff_seconds >= 0.02
+
+
+def test_retry_policy_gives_up_after_max_attempts():
+    session = SequenceSession([DummyResponse(503, {"n": i}) for i in range(3)])
+    client = BraveClient(
+        api_key="test-key",
+        session=session,
+        limiter=DummyLimiter(),
+        retry=RetryPolicy(max_attempts=2, base_delay=0.001),
+    )
+    with pytest.raises(BraveApiError) as exc:
+        asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert exc.value.data == {"n": 1}
+    assert len(session.requests) == 2
+
+
+def test_retry_policy_does_not_retry_client_errors():
+    session = SequenceSession([DummyResponse(401, {}), DummyResponse(200, {})])
+    client = BraveClient(
+        api_key="test-key", session=session, limiter=DummyLimiter(), retry=RetryPolicy()
+    )
+    with pytest.raises(BraveApiError):
+        asyncio.run(client.summarizer_search("k"))
+    assert len(session.requests) == 1
+
+
+class TimeoutResponse(DummyResponse):
+    async def __aenter__(self):
+        raise asyncio.TimeoutError()
+
+
+def test_retry_policy_retries_timeouts():
+    ok = DummyResponse(200, {"type": "search", "query": {"original": "x"}})
+    session = SequenceSession([TimeoutResponse(0, {}), ok])
+    client = BraveClient(
+        api_key="test-key",
+        session=session,
+        limiter=DummyLimiter(),
+        retry=RetryPolicy(base_delay=0.001),
+    )
+    response = asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert response.query.original == "x"
+    assert client.stats.retries == 1
+
+
+def test_retry_policy_deadline_stops_retries():
+    session = SequenceSession([DummyResponse(503, {}, {"Retry-After": "5"}), DummyResponse(200, {})])
+    client = BraveClient(
+        api_key="test-key",
+        session=session,
+        limiter=DummyLimiter(),
+        retry=RetryPolicy(deadline=1.0),
+    )
+    with pytest.raises(BraveApiError):
+        asyncio.run(client.web_search(WebSearchRequest(q="x")))
+    assert len(session.requests) == 1
+    assert client.stats.retries == 0
+
+
+@pytest.mark.parametrize("mode", ["validate", "raw"])
+def test_web_search_decode_modes(mode):
+    dummy_json = {"type": "search", "query": {"original": "mode"}}
+    session = DummySession(DummyResponse(200, dummy_json))
+    client = BraveClient(
+        api_key="test-key", session=session, limiter=DummyLimiter(), decode_mode=mode
+    )
+    response = asyncio.run(client.web_search(WebSearchRequest(q="mode")))
+    if mode == "raw":
+        assert response == dummy_json
+    else:
+        assert isinstance(response, WebSearchApiResponse)
+        assert response.query.original == "mode"
+
+
+def test_invalid_decode_mode():
+    with pytest.raises(ValueError):
+        BraveClient(api_key="test-key", decode_mode="fast")
+
+
+def _page(offset: int, urls: list[str], more: bool) -> DummyResponse:
+    results = [
+        {
+            "type": "search_result",
+            "subtype": "generic",
+            "title": url,
+            "url": url,
+            "is_source_local": False,
+            "is_source_both": False,
+            "family_friendly": True,
+            "is_live": False,
+            "language": "en",
+        }
+        for url in urls
+    ]
+    return DummyResponse(
+        200,
+        {
+            "type": "search",
+            "query": {"original": "pages", "more_results_available": more},
+            "web": {"type": "search", "results": results, "family_friendly": True},
+        },
+    )
+
+
+def test_iter_web_results_paginates_and_dedupes():
+    pages = {
+        0: _page(0, ["a", "b"], True),
+        1: _page(1, ["b", "c"], True),
+        2: _page(2, ["d"], False),
+    }
+    session = RoutingSession(lambda params: pages[params.get("offset", 0)])
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+
+    async def go():
+        return [r.url async for r in client.iter_web_results(WebSearchRequest(q="pages"))]
+
+    assert asyncio.run(go()) == ["a", "b", "c", "d"]
+    assert [p[1].get("offset", 0) for p in session.requests] == [0, 1, 2]
+
+
+def test_iter_web_results_respects_max_pages():
+    session = RoutingSession(lambda params: _page(params.get("offset", 0), [str(params.get("offset", 0))], True))
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+
+    async def go():
+        request = WebSearchRequest(q="pages", offset=3)
+        return [r.url async for r in client.iter_web_results(request, max_pages=2)]
+
+    assert asyncio.run(go()) == ["3", "4"]
+    assert len(session.requests) == 2
+
+
+def _summary_route(params):
+    if "key" in params:
+        if params["key"] == "key-bad":
+            return DummyResponse(500, {"error": "summary failed"})
+        return DummyResponse(200, {"type": "summarizer", "key": params["key"]})
+    response = {"type": "search", "query": {"original": params["q"]}}
+    if params["q"] != "no-summary":
+        response["summarizer"] = {"type": "summarizer", "key": f"key-{params['q']}"}
+    return DummyResponse(200, response)
+
+
+def test_search_and_summarize():
+    session = RoutingSession(_summary_route)
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+    search, summary = asyncio.run(client.search_and_summarize(WebSearchRequest(q="k2"), entity_info=True))
+    assert search.query.original == "k2"
+    assert summary.key == "key-k2"
+    assert session.requests[0][1]["summary"] == 1
+    assert session.requests[1][1] == {"key": "key-k2", "entity_info": 1}
+
+
+def test_search_and_summarize_many_pipelines_stages():
+    session = RoutingSession(_summary_route)
+    client = BraveClient(
+        api_key="test-key", session=session, limiter=DummyLimiter(), max_concurrent_requests=2
+    )
+    queries = ["a", "no-summary", "bad", "b", "c", "d", "e", "f"]
+
+    async def go():
+        return [
+            r async for r in client.search_and_summarize_many(WebSearchRequest(q=q) for q in queries)
+        ]
+
+    results = asyncio.run(go())
+    assert [r.response.query.original for r in results] == queries
+    assert results[0].summary.key == "key-a"
+    assert results[1].ok and results[1].summary is None
+    assert isinstance(results[2].error, BraveApiError) and results[2].response is not None
+    assert [r.summary.key for r in results[3:]] == [f"key-{q}" for q in queries[3:]]
+    # Summaries for early queries were requested before later searches finished
+    order = ["key" in p[1] for p in session.requests]
+    assert order.index(True) < len(order) - 1 - order[::-1].index(False)
+
+
+def _summary_poll(status, tokens):
+    return DummyResponse(
+        200,
+        {
+            "type": "summarizer",
+            "status": status,
+            "summary": [{"type": "token", "data": t} for t in tokens],
+        },
+    )
+
+
+FAST_POLL = PollPolicy(interval=0.001, max_interval=0.001)
+
+
+def test_summarizer_search_polls_until_complete():
+    session = SequenceSession(
+        [_summary_poll(None, []), _summary_poll(None, ["K2 "]), _summary_poll("complete", ["K2 ", "is tall."])]
+    )
+    cache = MemoryCache()
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter(), cache=cache)
+
+    async def go():
+        summary = await client.summarizer_search("k", poll=FAST_POLL)
+        # Only the finished summary was cached
+        cached = await client.summarizer_search("k", poll=FAST_POLL)
+        return summary, cached
+
+    summary, cached = asyncio.run(go())
+    assert summary.status == "complete"
+    assert summary.text == "K2 is tall."
+    assert cached.text == summary.text
+    assert len(session.requests) == 3
+    assert cache.hits == 1
+
+
+def test_summarizer_search_poll_budget():
+    session = SequenceSession([_summary_poll(None, ["a"]) for _ in range(3)])
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+    poll = PollPolicy(interval=0.001, max_polls=3)
+    summary = asyncio.run(client.summarizer_search("k", poll=poll))
+    assert not summary.is_finished
+    assert len(session.requests) == 3
+
+
+def test_iter_summary_streams_new_segments():
+    session = SequenceSession(
+        [
+            _summary_poll(None, ["The "]),
+            _summary_poll(None, ["The ", "second "]),
+            _summary_poll(None, ["The ", "second "]),
+            _summary_poll("complete", ["The ", "second ", "highest."]),
+        ]
+    )
+    client = BraveClient(api_key="test-key", session=session, limiter=DummyLimiter())
+
+    async def go():
+        return [m.data async for m in client.iter_summary("k", poll=FAST_POLL)]
+
+    assert asyncio.run(go()) == ["The ", "second ", "highest."]
+    assert len(session.requests) == 4
+
+
+def test_sync_client_shares_one_loop_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from lib import SyncBraveClient
+
+    session = DummySession(DummyResponse(200, {"type": "search", "query": {"original": "sync"}}))
+    with SyncBraveClient(api_key="key", session=session, limiter=DummyLimiter(), max_concurrent_requests=4) as client:
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(pool.map(lambda i: client.web_search(WebSearchRequest(q=f"q{i}")), range(32)))
+        assert all(r.query.original == "sync" for r in responses)
+        assert len(session.requests) == 32
+
+        results = list(client.web_search_many(WebSearchRequest(q=f"b{i}") for i in range(5)))
+        assert [r.index for r in results] == list(range(5))
+        # Abandoning the iterator early closes the underlying batch
+        batch = client.web_search_many(WebSearchRequest(q=f"c{i}") for i in range(5))
+        next(batch)
+        batch.close()
+    with pytest.raises(RuntimeError):
+        client.web_search(WebSearchRequest(q="after close"))
+
+
+def test_sync_client_reports_construction_errors(monkeypatch):
+    from lib import SyncBraveClient
+
+    monkeypatch.delenv("BRAVE_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        SyncBraveClient()
+
+
+def test_importing_lib_defers_heavy_dependencies():
+    code = (
+        "import sys, lib, httpobjects\n"
+        "print(sorted(m for m in ('aiohttp', 'aiolimiter', 'rich') if m in sys.modules))\n"
+        "print(httpobjects.WebSearchApiResponse.__pydantic_complete__)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.split("\n")[:2] == ["[]", "False"]
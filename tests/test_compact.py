@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from benchmarks.payloads import web_search_payload
+from compact import ResultBatch, ResultRecord, iter_results
+from decoding import decode
+from httpobjects import WebSearchApiResponse
+
+PAYLOAD = web_search_payload(results=8, extra_snippets=False)
+BODY = json.dumps(PAYLOAD).encode()
+
+
+@pytest.mark.parametrize("mode", ["validate", "raw", "lazy"])
+def test_iter_results_in_every_decode_mode(mode):
+    records = [r for r in iter_results(decode(WebSearchApiResponse, BODY, mode)) if r.kind != "news"]
+    web = PAYLOAD["web"]["results"]
+    assert [r.kind for r in records] == ["web"] * 8 + ["discussion"] * 2
+    assert records[0] == ResultRecord(
+        "web", web[0]["url"], web[0]["title"], web[0]["description"], web[0]["age"],
+        web[0]["meta_url"]["netloc"], "en", "generic",
+    )
+
+
+def test_records_are_slotted_frozen_and_interned():
+    first, second = list(iter_results(json.loads(BODY)))[:2]
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.url = "changed"
+    assert hash(first) != hash(second)
+    other = next(iter_results(json.loads(BODY)))
+    assert other.language is first.language and other.netloc is first.netloc
+
+
+def test_raw_responses_include_news():
+    kinds = {r.kind for r in iter_results(json.loads(BODY))}
+    assert kinds == {"web", "discussion", "news"}
+
+
+def test_result_batch_columns_roundtrip():
+    batch = ResultBatch([json.loads(BODY), json.loads(BODY)])
+    records = list(iter_results(json.loads(BODY)))
+    assert len(batch) == 2 * len(records)
+    assert list(batch)[: len(records)] == records
+    assert batch.column("url")[: len(records)] == [r.url for r in records]
+    assert batch.column("language") == ["en"] * len(batch)
+    # Each distinct categorical value is stored once
+    assert len(batch.vocabulary) == len(set(batch.vocabulary))
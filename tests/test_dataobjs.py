@@ -1,3 +1,5 @@
+import pytest
+
 from httpobjects import WebSearchRequest, ForumData, DiscussionResult
 
 
@@ -26,6 +28,11 @@ def test_discussionresult_model():
     raw = {
         "type": "discussion",
         "subtype": "generic",
+        "title": "Test thread",
+        "url": "https://forum.example.com/t/1",
+        "is_source_local": False,
+        "is_source_both": False,
+        "family_friendly": True,
         "is_live": False,
         "language": "en",
         "data": {"forum_name": "TestForum"},
@@ -35,3 +42,90 @@ def test_discussionresult_model():
     assert dr.subtype == "generic"
     assert dr.data and dr.data.forum_name == "TestForum"
 
+
+def test_lazy_response_validates_sections_on_access():
+    from httpobjects import LazyWebSearchApiResponse, Query, Search
+
+    raw = {
+        "type": "search",
+        "query": {"original": "lazy"},
+        "web": {"type": "search", "results": [], "family_friendly": True},
+        # Invalid section that is never read, so never validated
+        "news": {"type": "not-news"},
+    }
+    lazy = LazyWebSearchApiResponse(raw)
+    assert "web" not in lazy.__dict__
+    assert isinstance(lazy.web, Search)
+    assert lazy.web is lazy.web
+    assert isinstance(lazy.query, Query) and lazy.query.original == "lazy"
+    assert lazy.videos is None
+    assert "news" not in lazy.__dict__
+
+
+def test_prepare_normalizes_equivalent_requests():
+    a = WebSearchRequest(q="  hello   World ", country="us", ui_lang="EN-gb", extra_snippets=True).prepare()
+    b = WebSearchRequest(q="hello World", country="US", ui_lang="en-GB", extra_snippets=True).prepare()
+    assert a.request.q == "hello World"
+    assert dict(a.params) == {"q": "hello World", "extra_snippets": 1, "ui_lang": "en-GB"}
+    assert a.query_string == "q=hello+World&extra_snippets=1&ui_lang=en-GB"
+    assert a == b and hash(a) == hash(b)
+    assert len({a, b}) == 1
+
+
+def test_prepare_rejects_requests_over_the_limits():
+    with pytest.raises(ValueError) as exc:
+        WebSearchRequest(q=" ".join(["word"] * 60), count=50, offset=10, freshness="yesterday").prepare()
+    message = str(exc.value)
+    for field in ("words", "count", "offset", "freshness"):
+        assert field in message
+    with pytest.raises(ValueError):
+        WebSearchRequest(q="   ").prepare()
+
+
+def test_prepared_request_is_immutable():
+    prepared = WebSearchRequest(q="k2", goggles=["https://a", "https://b"]).prepare()
+    with pytest.raises(TypeError):
+        prepared.params["q"] = "other"
+    with pytest.raises(AttributeError):
+        prepared.key = "other"
+    assert prepared.params["goggles"] == ("https://a", "https://b")
+
+
+def test_prepared_page_and_replace():
+    prepared = WebSearchRequest(q="k2", count=5).prepare()
+    second = prepared.page(1)
+    assert second.params["offset"] == 1 and second.params["count"] == 5
+    assert second != prepared
+    assert second.page(0) == prepared
+    assert prepared.replace(summary=True).params["summary"] == 1
+    with pytest.raises(ValueError):
+        prepared.page(10)
+
+
+def test_response_models_are_the_generated_ones():
+    import httpobjects
+    import httpobjects_gen
+    from benchmarks.payloads import web_search_payload
+
+    response = httpobjects.WebSearchApiResponse.model_validate(web_search_payload())
+    assert httpobjects.WebSearchApiResponse is httpobjects_gen.WebSearchApiResponse
+    assert isinstance(response.news.results[0], httpobjects.NewsResult)
+    assert response.news.results[0].url
+
+
+def test_search_result_accepts_live_subtypes():
+    from httpobjects import Discussions, SearchResult
+
+    raw = {
+        "type": "search_result",
+        "subtype": "article",
+        "title": "An article",
+        "url": "https://example.com/article",
+        "is_source_local": False,
+        "is_source_both": False,
+        "family_friendly": True,
+        "is_live": False,
+        "language": "en",
+    }
+    assert SearchResult.model_validate(raw).subtype == "article"
+    assert Discussions.model_validate({"type": "search", "results": []}).mutated_by_goggles is False
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from decoding import decode
+from httpobjects import WebSearchApiResponse
+
+PAYLOAD = {
+    "type": "search",
+    "query": {"original": "decode"},
+    "web": {
+        "type": "search",
+        "family_friendly": True,
+        "results": [
+            {
+                "type": "search_result",
+                "subtype": "generic",
+                "title": "A",
+                "url": "https://a.com/",
+                "is_source_local": False,
+                "is_source_both": False,
+                "family_friendly": True,
+                "is_live": False,
+                "language": "en",
+                "meta_url": {"scheme": "https", "netloc": "a.com", "favicon": "f", "path": "/"},
+            }
+        ],
+    },
+}
+
+
+def test_validate_mode_matches_model_validate():
+    raw = json.dumps(PAYLOAD).encode()
+    assert decode(WebSearchApiResponse, raw) == WebSearchApiResponse.model_validate(PAYLOAD)
+
+
+def test_raw_mode_returns_dict():
+    assert decode(WebSearchApiResponse, json.dumps(PAYLOAD).encode(), "raw") == PAYLOAD
+
+
+def test_bytes_mode_returns_body_undecoded():
+    body = bytearray(json.dumps(PAYLOAD).encode())
+    assert decode(WebSearchApiResponse, body, "bytes") == bytes(body)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        decode(WebSearchApiResponse, b"{}", "fast")
+
+
+def test_lazy_mode_wraps_web_search_responses():
+    from httpobjects import LazyWebSearchApiResponse, Summarizer
+
+    lazy = decode(WebSearchApiResponse, json.dumps(PAYLOAD).encode(), "lazy")
+    assert isinstance(lazy, LazyWebSearchApiResponse)
+    assert lazy.web.results[0].meta_url.netloc == "a.com"
+    assert lazy.to_model() == WebSearchApiResponse.model_validate(PAYLOAD)
+    # Models without a lazy counterpart are validated eagerly
+    assert isinstance(decode(Summarizer, b"{}", "lazy"), Summarizer)
+
+
+def test_make_decompressor_gzip_in_chunks():
+    import gzip
+
+    from decoding import make_decompressor
+
+    data = json.dumps(PAYLOAD).encode() * 50
+    compressed = gzip.compress(data)
+    decompressor = make_decompressor("gzip")
+    out = b"".join(decompressor.decompress(compressed[i : i + 100]) for i in range(0, len(compressed), 100))
+    assert out + decompressor.flush() == data
+    assert make_decompressor("identity") is None
+    with pytest.raises(ValueError):
+        make_decompressor("compress")
@@ -0,0 +1,46 @@
+import importlib.util
+import json
+import os
+
+import pytest
+from pydantic import ValidationError
+
+import httpobjects_gen as gen
+from benchmarks.bench_models import infobox_payload
+from benchmarks.payloads import web_search_payload
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_generated_models_validate_full_payload():
+    response = gen.WebSearchApiResponse.model_validate_json(json.dumps(web_search_payload()))
+    assert isinstance(response.web.results[0], gen.SearchResult)
+    assert isinstance(response.discussions.results[0], gen.DiscussionResult)
+    assert response.news.results[0].breaking is False
+    assert response.videos.results[0].video.duration == "12:34"
+
+
+def test_infobox_union_dispatches_on_subtype():
+    infobox = gen.GraphInfobox.model_validate({"type": "graph", "results": json.loads(infobox_payload(5))})
+    assert [type(r) for r in infobox.results] == [
+        gen.EntityInfobox, gen.InfoboxWithLocation, gen.InfoboxPlace, gen.QAInfobox, gen.GenericInfobox
+    ]
+    bad = json.loads(infobox_payload(1))
+    bad[0]["subtype"] = "unknown"
+    with pytest.raises(ValidationError, match="union_tag_invalid"):
+        gen.GraphInfobox.model_validate({"type": "graph", "results": bad})
+
+
+def test_generated_module_is_up_to_date():
+    pytest.importorskip("bs4")
+    from bs4 import BeautifulSoup
+
+    spec = importlib.util.spec_from_file_location(
+        "generate_models", os.path.join(ROOT, "docs", "utils", "generate_models.py")
+    )
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    with open(os.path.join(ROOT, "docs", "raw", "parsed_api_docs.html"), encoding="utf-8") as f:
+        models = generator.extract_models(BeautifulSoup(f, "html.parser"))
+    with open(os.path.join(ROOT, "httpobjects_gen.py"), encoding="utf-8") as f:
+        assert generator.render_models(models, source="docs/raw/parsed_api_docs.html") == f.read()
@@ -0,0 +1,127 @@
+import asyncio
+
+from hedging import HedgePolicy, Hedger
+from httpobjects import WebSearchRequest
+from lib import BraveClient
+from ratelimit import AdaptiveLimiter
+from tests.test_client import DummyLimiter, DummyResponse
+
+
+class DelayedResponse(DummyResponse):
+    """Response whose headers arrive after `delay` seconds."""
+
+    def __init__(self, delay: float, json_data: dict, log: list):
+        super().__init__(200, json_data)
+        self.delay = delay
+        self.log = log
+
+    async def __aenter__(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.log.append("cancelled")
+            raise
+        self.log.append("answered")
+        return self
+
+
+class DelayedSession:
+    """Session answering the n-th request after delays[n] seconds."""
+
+    def __init__(self, delays: list[float]):
+        self.delays = delays
+        self.requests: list[dict] = []
+        self.log: list[str] = []
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None):
+        delay = self.delays[len(self.requests) % len(self.delays)]
+        self.requests.append(dict(params))
+        return DelayedResponse(delay, {"type": "search", "query": {"original": params["q"]}}, self.log)
+
+    async def close(self):
+        pass
+
+
+def test_hedge_delay_follows_observed_latency():
+    hedger = Hedger(HedgePolicy(percentile=90, initial_delay=0.5, min_samples=10, min_delay=0.001))
+    assert hedger.delay("web") == 0.5
+    for ms in range(1, 101):
+        hedger.observe("web", ms / 1000)
+    assert hedger.delay("web") == 0.091
+    assert hedger.delay("summarizer") == 0.5
+    # Expected finish of a request still running after 80ms: mean of 81..100ms
+    assert abs(hedger.saved("web", 0.08) - 0.0105) < 1e-9
+
+
+def test_hedge_credit_is_a_share_of_primaries():
+    hedger = Hedger(HedgePolicy(budget=0.1, burst=2))
+    granted = 0
+    for _ in range(100):
+        hedger.sent()
+        granted += hedger.try_hedge()
+    # One starting credit plus 0.1 per primary
+    assert granted == 11
+
+
+def test_slow_request_is_hedged_and_loser_cancelled():
+    session = DelayedSession([1.0, 0.01])
+    client = BraveClient(
+        api_key="k",
+        session=session,
+        limiter=DummyLimiter(),
+        max_concurrent_requests=4,
+        hedge=HedgePolicy(initial_delay=0.05),
+    )
+
+    async def go():
+        started = asyncio.get_running_loop().time()
+        response = await client.web_search(WebSearchRequest(q="k2"))
+        return response, asyncio.get_running_loop().time() - started
+
+    response, elapsed = asyncio.run(go())
+    assert response.query.original == "k2"
+    assert elapsed < 0.5
+    assert len(session.requests) == 2
+    assert session.log == ["answered", "cancelled"]
+    stats = client.stats
+    assert (stats.hedge_candidates, stats.hedges, stats.hedge_wins) == (1, 1, 1)
+    assert stats.hedge_rate == 1.0
+
+
+def test_hedges_stay_within_budget():
+    session = DelayedSession([0.05])
+    client = BraveClient(
+        api_key="k",
+        session=session,
+        limiter=DummyLimiter(),
+        max_concurrent_requests=16,
+        hedge=HedgePolicy(initial_delay=0.01, min_samples=1000, budget=0.1, burst=1),
+    )
+
+    async def go():
+        await asyncio.gather(*(client.web_search(WebSearchRequest(q=f"q{i}")) for i in range(40)))
+
+    asyncio.run(go())
+    stats = client.stats
+    assert stats.hedge_candidates == 40
+    assert stats.hedges <= 1 + 0.1 * 40
+    assert stats.hedges + stats.hedges_skipped == 40
+    assert len(session.requests) == 40 + stats.hedges
+
+
+def test_time_queued_for_the_limiter_does_not_trigger_hedges():
+    session = DelayedSession([0.0])
+    client = BraveClient(
+        api_key="k",
+        session=session,
+        limiter=AdaptiveLimiter(20),
+        max_concurrent_requests=8,
+        hedge=HedgePolicy(initial_delay=0.02),
+    )
+
+    async def go():
+        await asyncio.gather(*(client.web_search(WebSearchRequest(q=f"q{i}")) for i in range(8)))
+
+    asyncio.run(go())
+    assert client.stats.hedges == 0
+    assert len(session.requests) == 8
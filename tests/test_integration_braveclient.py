@@ -34,12 +34,46 @@ def test_web_search_integration():
     assert response.query.original == "integration"
 
 
+def test_prepared_request_integration():
+    sent = []
+    request = WebSearchRequest(q="prepared request", goggles=["https://a", "https://b"], extra_snippets=True)
+    prepared = request.prepare()
+
+    async def go():
+        async def handler(request):
+            sent.append(request.rel_url.raw_query_string)
+            assert request.query.getall("goggles") == ["https://a", "https://b"]
+            assert request.query.get("extra_snippets") == "1"
+            return web.json_response({"type": "search", "query": {"original": request.query["q"]}})
+
+        app = web.Application()
+        app.router.add_get("/res/v1/web/search", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = BraveClient(api_key="test-key", api_host=f"http://localhost:{port}")
+        try:
+            return await client.web_search(prepared)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    response = asyncio.run(go())
+    assert response.query.original == "prepared request"
+    # The query string encoded by prepare() goes on the wire unchanged
+    assert sent == [prepared.query_string]
+
+
 def test_summarizer_search_integration():
     async def go():
         async def handler(request):
             assert request.query.get("key") == "abc"
             assert request.query.get("entity_info") == "1"
-            return web.json_response({"summary": "test"})
+            return web.json_response(
+                {"type": "summarizer", "status": "complete", "summary": [{"type": "token", "data": "test"}]}
+            )
 
         app = web.Application()
         app.router.add_get("/res/v1/summarizer/search", handler)
@@ -58,4 +92,119 @@ def test_summarizer_search_integration():
         return response
 
     response = asyncio.run(go())
-    assert isinstance(response, Summarizer)
\ No newline at end of file
+    assert isinstance(response, Summarizer)
+
+def test_warmup_opens_pooled_connections():
+    from lib import ConnectionConfig
+
+    async def go():
+        async def handler(request):
+            return web.json_response({"type": "search", "query": {"original": "warm"}})
+
+        app = web.Application()
+        app.router.add_get("/res/v1/web/search", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = BraveClient(
+            api_key="test-key",
+            api_host=f"http://localhost:{port}",
+            max_concurrent_requests=2,
+            connection=ConnectionConfig(limit=4, warmup=3),
+        )
+        try:
+            async with client:
+                warmed = client.pool_stats()
+                await client.web_search(WebSearchRequest(q="warm"))
+                after = client.pool_stats()
+        finally:
+            await runner.cleanup()
+        return warmed, after
+
+    warmed, after = asyncio.run(go())
+    assert warmed["limit"] == 4
+    assert warmed["opened"] == 3
+    assert warmed["busy"] == 0
+    assert warmed["max_concurrent_requests"] == 2
+    # The search reused a warm connection instead of opening a new one
+    assert after["opened"] == 3
+    assert after["reused"] == 1
+    assert after["in_flight"] == 0
+
+
+def test_gzip_response_is_decompressed_and_counted():
+    import gzip
+    import json
+
+    from lib import ConnectionConfig
+
+    payload = {"type": "search", "query": {"original": "gzip " * 200}}
+
+    async def go(config):
+        async def handler(request):
+            assert "gzip" in request.headers["Accept-Encoding"]
+            body = gzip.compress(json.dumps(payload).encode())
+            return web.Response(
+                body=body, content_type="application/json", headers={"Content-Encoding": "gzip"}
+            )
+
+        app = web.Application()
+        app.router.add_get("/res/v1/web/search", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = BraveClient(api_key="test-key", api_host=f"http://localhost:{port}", connection=config)
+        try:
+            response = await client.web_search(WebSearchRequest(q="gzip"))
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return response, client.stats
+
+    for config in (ConnectionConfig(), ConnectionConfig(stream_body=True)):
+        response, stats = asyncio.run(go(config))
+        assert response.query.original == payload["query"]["original"]
+        assert stats.bytes_decoded == len(json.dumps(payload).encode())
+        assert stats.bytes_received < stats.bytes_decoded
+        assert stats.compression_ratio > 5
+
+
+def test_sync_client_reuses_connections_between_calls():
+    import threading
+
+    from lib import SyncBraveClient
+
+    peers = set()
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.json_response({"type": "search", "query": {"original": request.query["q"]}})
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def serve():
+        app = web.Application()
+        app.router.add_get("/res/v1/web/search", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0)
+        await site.start()
+        return runner, site._server.sockets[0].getsockname()[1]
+
+    runner, port = asyncio.run_coroutine_threadsafe(serve(), loop).result()
+    try:
+        with SyncBraveClient(api_key="test-key", api_host=f"http://localhost:{port}", rps=1000) as client:
+            for i in range(5):
+                assert client.web_search(WebSearchRequest(q=f"sync {i}")).query.original == f"sync {i}"
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+    # Every call went over the same keep-alive connection
+    assert len(peers) == 1
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from httpobjects import WebSearchRequest
+from keypool import ApiKey, KeyPool, KeyPoolExhausted
+from lib import BraveClient
+from replay import Cassette, Recording, recording_key
+from stubserver import STATS, make_app, start_server
+
+
+def test_acquire_prefers_least_loaded_key_by_weight():
+    pool = KeyPool([ApiKey("a", rps=1000, weight=1), ApiKey("b", rps=1000, weight=3)])
+
+    async def go():
+        return [(await pool.acquire()).token for _ in range(8)]
+
+    picked = asyncio.run(go())
+    assert picked.count("a") == 2
+    assert picked.count("b") == 6
+
+
+def test_throttled_key_is_ejected_until_reset():
+    pool = KeyPool([ApiKey("a", rps=1000), ApiKey("b", rps=1000)], eject_seconds=0.5)
+
+    async def go():
+        key = await pool.acquire()
+        pool.release(key, {"Retry-After": "2"}, 429)
+        return key, [(await pool.acquire()).token for _ in range(3)]
+
+    ejected, picked = asyncio.run(go())
+    assert ejected.throttled == 1
+    assert ejected.ejected_until - time.monotonic() > 1.5
+    assert ejected.token not in picked
+
+
+def test_spent_quota_ejects_and_pool_gives_up_past_max_wait():
+    pool = KeyPool(["only"], max_wait=5)
+    headers = {"X-RateLimit-Remaining": "1, 0", "X-RateLimit-Reset": "1, 86400"}
+
+    async def go():
+        key = await pool.acquire()
+        pool.release(key, headers, 200)
+        await pool.acquire()
+
+    with pytest.raises(KeyPoolExhausted):
+        asyncio.run(go())
+    assert pool.stats()[0]["remaining"] == 0
+
+
+def test_client_throughput_scales_with_keys():
+    cassette = Cassette()
+    body = json.dumps({"type": "search", "query": {"original": "x"}}).encode()
+    cassette.record(recording_key("/res/v1/web/search", {"q": "x"}), Recording(200, {}, body))
+    app = make_app(cassette, rps=10)
+    keys = [ApiKey(f"key-{i}", rps=10) for i in range(3)]
+
+    async def go():
+        runner, base_url = await start_server(app)
+        client = BraveClient(api_host=base_url, api_keys=keys, max_concurrent_requests=30)
+        try:
+            started = time.monotonic()
+            results = [r async for r in client.web_search_many(WebSearchRequest(q=str(i)) for i in range(30))]
+            return results, time.monotonic() - started, client.pool_stats()
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    results, elapsed, stats = asyncio.run(go())
+    assert all(r.ok for r in results)
+    # One key at 10 rps would need three seconds
+    assert elapsed < 2.5
+    assert all(k["requests"] >= 8 for k in stats["keys"])
+    assert app[STATS]["requests"] == 30 + app[STATS]["throttled"]
@@ -0,0 +1,170 @@
+import asyncio
+import multiprocessing
+import time
+
+from ratelimit import (
+    AdaptiveLimiter,
+    SharedLimiter,
+    parse_rate_limit_header,
+    parse_retry_after,
+)
+
+
+def test_parse_rate_limit_header():
+    assert parse_rate_limit_header("1, 15000") == [1, 15000]
+    assert parse_rate_limit_header("20") == [20]
+    assert parse_rate_limit_header(None) == []
+    assert parse_rate_limit_header("garbage") == []
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+def test_update_follows_per_second_limit():
+    limiter = AdaptiveLimiter(rate=1)
+    paused = limiter.update(
+        {
+            "X-RateLimit-Limit": "20, 15000",
+            "X-RateLimit-Remaining": "19, 14000",
+            "X-RateLimit-Reset": "1, 86400",
+        }
+    )
+    assert paused == 0.0
+    assert limiter.rate == 20.0
+
+
+def test_update_pauses_until_short_window_resets():
+    limiter = AdaptiveLimiter(rate=50, max_pause=5)
+    paused = limiter.update(
+        {
+            "X-RateLimit-Limit": "50, 15000",
+            "X-RateLimit-Remaining": "0, 14000",
+            "X-RateLimit-Reset": "1, 86400",
+        },
+        status=429,
+    )
+    assert paused == 1.0
+
+    async def go():
+        start = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(go()) >= 0.9
+
+
+def test_update_does_not_pause_beyond_max_pause():
+    limiter = AdaptiveLimiter(rate=1, max_pause=5)
+    paused = limiter.update(
+        {
+            "X-RateLimit-Limit": "1, 15000",
+            "X-RateLimit-Remaining": "1, 0",
+            "X-RateLimit-Reset": "1, 86400",
+        },
+        status=429,
+    )
+    assert paused == 0.0
+
+
+def test_acquire_spaces_requests_at_rate():
+    limiter = AdaptiveLimiter(rate=20)
+
+    async def go():
+        start = time.monotonic()
+        for _ in range(21):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    # 1 token available up front, then 20 more at 20/s
+    assert 0.9 <= asyncio.run(go()) < 1.5
+
+
+def _take_tokens(path: str, rate: float, count: int, queue) -> None:
+    async def go():
+        limiter = SharedLimiter(path, rate)
+        stamps = []
+        for _ in range(count):
+            await limiter.acquire()
+            stamps.append(time.monotonic())
+        limiter.close()
+        return stamps
+
+    queue.put(asyncio.run(go()))
+
+
+def test_shared_limiter_enforces_one_rate_across_processes(tmp_path):
+    path = str(tmp_path / "bucket")
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_take_tokens, args=(path, 10, 8, queue)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    stamps = sorted(t for _ in workers for t in queue.get(timeout=30))
+    for worker in workers:
+        worker.join()
+
+    # 24 tokens at 10/s with a bucket of at most 10; separate limiters would take 0.7s
+    assert stamps[-1] - stamps[0] >= 1.2
+
+
+def test_shared_limiter_pause_is_seen_by_other_instances(tmp_path):
+    path = str(tmp_path / "bucket")
+    first = SharedLimiter(path, rate=100)
+    second = SharedLimiter(path, rate=100)
+    assert first.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1"}, 429) == 1.0
+
+    async def go():
+        start = time.monotonic()
+        await second.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(go()) >= 0.9
+    first.close()
+    second.close()
+
+
+def test_shared_limiter_reopened_with_new_rate_uses_it(tmp_path):
+    path = str(tmp_path / "bucket")
+    SharedLimiter(path, rate=1).close()
+    limiter = SharedLimiter(path, rate=50)
+    assert limiter.rate == 50
+
+    async def go():
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(go()) < 0.5
+    limiter.close()
+
+
+def test_shared_limiter_keeps_a_rate_reported_by_the_api(tmp_path):
+    path = str(tmp_path / "bucket")
+    first = SharedLimiter(path, rate=10)
+    first.update({"X-RateLimit-Limit": "2, 15000"})
+    first.close()
+    assert SharedLimiter(path, rate=10).rate == 2
+    assert SharedLimiter(path, rate=10, reset=True).rate == 10
+
+
+def test_shared_limiter_discards_state_from_another_boot(tmp_path):
+    path = str(tmp_path / "bucket")
+    SharedLimiter(path, rate=100).close()
+    # Rewrite the file as if by an earlier boot whose clock ran far ahead
+    state = SharedLimiter._STATE
+    with open(path, "r+b") as f:
+        f.write(state.pack(b"\0" * 16, 1.0, 0.0, time.monotonic() + 1e6, time.monotonic() + 1e6, True))
+    limiter = SharedLimiter(path, rate=100)
+    assert limiter.rate == 100
+
+    async def go():
+        start = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(go()) < 0.5
+    limiter.close()
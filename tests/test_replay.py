@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+
+from httpobjects import WebSearchApiResponse, WebSearchRequest
+from lib import BraveApiError, BraveClient, ConnectionConfig
+from replay import (
+    Cassette,
+    CassetteMiss,
+    Recording,
+    RecordingSession,
+    ReplaySession,
+    recording_key,
+)
+from stubserver import STATS, make_app, start_server
+
+
+def _search_body(q: str) -> bytes:
+    return json.dumps({"type": "search", "query": {"original": q}}).encode()
+
+
+def test_recording_key_matches_client_and_server_params():
+    client_side = recording_key("https://api.search.brave.com/res/v1/web/search", {"q": "x", "summary": 1})
+    server_side = recording_key("/res/v1/web/search", {"summary": "1", "q": "x"})
+    assert client_side == server_side
+
+
+def test_recording_key_keeps_every_value_of_a_repeated_param():
+    client_side = recording_key("/res/v1/web/search", {"q": "x", "goggles": ("a", "b")})
+    server_side = recording_key("/res/v1/web/search", {"q": ["x"], "goggles": ["a", "b"]})
+    assert client_side == server_side
+    assert client_side != recording_key("/res/v1/web/search", {"q": "x", "goggles": ("a",)})
+
+
+@pytest.mark.parametrize("name", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_cassette_persists_recordings(tmp_path, name):
+    path = str(tmp_path / name)
+    cassette = Cassette(path)
+    cassette.record("k1", Recording(200, {"X-RateLimit-Limit": "1, 15000"}, b'{"a": 1}'))
+    cassette.record("k2", Recording(429, {}, b"{}"))
+
+    reloaded = Cassette(path)
+    assert len(reloaded) == 2
+    assert reloaded.get("k1") == Recording(200, {"X-RateLimit-Limit": "1, 15000"}, b'{"a": 1}')
+
+
+def test_replay_session_serves_client():
+    cassette = Cassette()
+    key = recording_key("/res/v1/web/search", {"q": "replayed"})
+    cassette.record(key, Recording(200, {}, _search_body("replayed")))
+    client = BraveClient(api_key="test-key", session=ReplaySession(cassette), rps=1000)
+
+    async def go():
+        response = await client.web_search(WebSearchRequest(q="replayed"))
+        with pytest.raises(CassetteMiss):
+            await client.web_search(WebSearchRequest(q="unknown"))
+        return response
+
+    assert asyncio.run(go()).query.original == "replayed"
+
+
+def test_replay_session_serves_streaming_client():
+    cassette = Cassette()
+    key = recording_key("/res/v1/web/search", {"q": "streamed"})
+    cassette.record(key, Recording(200, {}, _search_body("streamed")))
+    client = BraveClient(
+        api_key="test-key",
+        session=ReplaySession(cassette),
+        rps=1000,
+        connection=ConnectionConfig(stream_body=True),
+    )
+
+    response = asyncio.run(client.web_search(WebSearchRequest(q="streamed")))
+    assert response.query.original == "streamed"
+    assert client.stats.bytes_received == len(_search_body("streamed"))
+
+
+def test_record_through_stub_server_then_replay(tmp_path):
+    source = Cassette()
+    key = recording_key("/res/v1/web/search", {"q": "live", "goggles": ("a", "b")})
+    source.record(key, Recording(200, {}, _search_body("live")))
+    request = WebSearchRequest(q="live", goggles=["a", "b"])
+    path = str(tmp_path / "recorded.jsonl")
+
+    async def record():
+        runner, base_url = await start_server(make_app(source))
+        client = BraveClient(
+            api_key="test-key", api_host=base_url, session=RecordingSession(Cassette(path)), rps=1000
+        )
+        try:
+            return await client.web_search(request)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    recorded = asyncio.run(record())
+    replay_client = BraveClient(api_key="test-key", session=ReplaySession(Cassette(path)), rps=1000)
+    replayed = asyncio.run(replay_client.web_search(request))
+    assert isinstance(replayed, WebSearchApiResponse)
+    assert replayed == recorded
+
+
+def test_stub_server_injects_errors_and_rate_limits():
+    cassette = Cassette()
+    cassette.record(recording_key("/res/v1/web/search", {"q": "x"}), Recording(200, {}, _search_body("x")))
+
+    async def go(app, queries):
+        runner, base_url = await start_server(app)
+        client = BraveClient(api_key="test-key", api_host=base_url, rps=1000, max_concurrent_requests=10)
+        try:
+            return [r async for r in client.web_search_many(WebSearchRequest(q=q) for q in queries)]
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    # Unknown queries fall back to any recording for the endpoint
+    failing = make_app(cassette, error_rate=1.0, error_status=502, seed=1)
+    results = asyncio.run(go(failing, ["x", "y"]))
+    assert all(isinstance(r.error, BraveApiError) and r.error.status == 502 for r in results)
+    assert failing[STATS]["errors"] == 2
+
+    limited = make_app(cassette, rps=3)
+    results = asyncio.run(go(limited, [str(i) for i in range(10)]))
+    # At most two one-second windows are touched by the burst
+    assert 3 <= sum(r.ok for r in results) <= 6
+    assert {r.error.status for r in results if not r.ok} == {429}
+    assert limited[STATS]["throttled"] == 10 - sum(r.ok for r in results)
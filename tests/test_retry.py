@@ -0,0 +1,35 @@
+import asyncio
+import random
+
+from retry import RetryPolicy
+
+
+def test_backoff_is_full_jitter_within_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, rng=random.Random(0))
+    for attempt, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (10, 4.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0.0 <= d <= cap for d in delays)
+        assert max(delays) > cap / 2
+
+
+def test_backoff_honors_retry_after():
+    policy = RetryPolicy(base_delay=0.1)
+    assert policy.backoff(1, retry_after=5.0) == 5.0
+    ignoring = RetryPolicy(base_delay=0.1, respect_retry_after=False)
+    assert ignoring.backoff(1, retry_after=5.0) <= 0.1
+
+
+def test_allows_respects_attempts_and_deadline():
+    policy = RetryPolicy(max_attempts=3, deadline=10.0)
+    assert policy.allows(1, elapsed=0.0, delay=1.0)
+    assert not policy.allows(3, elapsed=0.0, delay=1.0)
+    assert not policy.allows(1, elapsed=9.5, delay=1.0)
+
+
+def test_default_retryable_failures():
+    policy = RetryPolicy()
+    assert policy.retries_status(503)
+    assert policy.retries_status(429)
+    assert not policy.retries_status(401)
+    assert policy.retries_exception(asyncio.TimeoutError())
+    assert not policy.retries_exception(ValueError())
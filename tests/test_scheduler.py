@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from httpobjects import WebSearchRequest
+from lib import BraveClient, SyncBraveClient
+from ratelimit import AdaptiveLimiter
+from scheduler import (
+    DeadlineExceeded,
+    Job,
+    Priority,
+    Scheduler,
+    current_job,
+    scheduling,
+)
+from tests.test_client import DummyLimiter, DummyResponse, DummySession
+
+
+async def _dispatch_order(scheduler: Scheduler, jobs: list[tuple[str, Job]]) -> list[str]:
+    """Queue `jobs` behind a held turn, then release it and record the order they go in."""
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def holder():
+        async with scheduler.turn(Job()):
+            await release.wait()
+
+    async def waiter(name: str, job: Job):
+        async with scheduler.turn(job):
+            order.append(name)
+
+    hold = asyncio.ensure_future(holder())
+    await asyncio.sleep(0)
+    tasks = []
+    for name, job in jobs:
+        tasks.append(asyncio.ensure_future(waiter(name, job)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(hold, *tasks)
+    return order
+
+
+def test_higher_priority_classes_go_first():
+    jobs = [(f"batch{i}", Job(Priority.BATCH)) for i in range(3)]
+    jobs += [("normal", Job(Priority.NORMAL)), ("interactive", Job(Priority.INTERACTIVE))]
+    order = asyncio.run(_dispatch_order(Scheduler(), jobs))
+    assert order == ["interactive", "normal", "batch0", "batch1", "batch2"]
+
+
+def test_tenants_share_a_class_by_weight():
+    jobs = [(f"a{i}", Job(Priority.BATCH, "a")) for i in range(8)]
+    jobs += [(f"b{i}", Job(Priority.BATCH, "b")) for i in range(8)]
+    order = asyncio.run(_dispatch_order(Scheduler(weights={"a": 3, "b": 1}), jobs))
+    first = [name[0] for name in order[:8]]
+    assert first.count("a") == 6
+    assert first.count("b") == 2
+    # Each tenant's own requests stay in order
+    assert [n for n in order if n[0] == "b"] == [f"b{i}" for i in range(8)]
+
+
+def test_deadline_expires_while_queued():
+    scheduler = Scheduler()
+
+    async def go():
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.turn(Job()):
+                await release.wait()
+
+        hold = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        with pytest.raises(DeadlineExceeded):
+            async with scheduler.turn(Job(deadline=time.monotonic() + 0.05)):
+                pass
+        assert scheduler.depth() == 0
+        release.set()
+        await hold
+        # The turn is free again
+        async with scheduler.turn(Job()):
+            pass
+
+    asyncio.run(go())
+    assert scheduler.stats()["classes"]["normal"]["expired"] == 1
+
+
+def test_request_that_cannot_make_its_deadline_is_rejected_up_front():
+    scheduler = Scheduler()
+    limiter = AdaptiveLimiter(20)
+
+    async def go():
+        async def send(job: Job):
+            async with scheduler.turn(job):
+                await limiter.acquire()
+
+        # A backlog teaches the scheduler the dispatch interval (~50ms)
+        backlog = [asyncio.ensure_future(send(Job())) for _ in range(10)]
+        await asyncio.sleep(0.2)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await send(Job(deadline=time.monotonic() + 0.1))
+        elapsed = time.monotonic() - started
+        await asyncio.gather(*backlog)
+        return elapsed
+
+    assert asyncio.run(go()) < 0.01
+    assert scheduler.stats()["classes"]["normal"]["expired"] == 1
+
+
+def test_scheduling_blocks_nest():
+    assert current_job() == Job()
+    with scheduling(Priority.BATCH, tenant="etl", timeout=10) as outer:
+        with scheduling(Priority.INTERACTIVE, timeout=60) as inner:
+            assert inner.tenant == "etl"
+            assert inner.priority == Priority.INTERACTIVE
+            assert inner.deadline == outer.deadline
+        assert current_job() == outer
+    assert current_job() == Job()
+
+
+def test_interactive_request_overtakes_queued_batch():
+    session = DummySession(DummyResponse(200, {"type": "search"}))
+    scheduler = Scheduler()
+    client = BraveClient(api_key="k", session=session, limiter=AdaptiveLimiter(50), scheduler=scheduler)
+
+    async def go():
+        with scheduling(Priority.BATCH, tenant="etl"):
+            batch = [
+                asyncio.ensure_future(client.web_search(WebSearchRequest(q=f"batch {i}"))) for i in range(20)
+            ]
+        await asyncio.sleep(0.05)
+        with scheduling(Priority.INTERACTIVE):
+            await client.web_search(WebSearchRequest(q="interactive"))
+        sent = [params["q"] for _, params, _ in session.requests]
+        await asyncio.gather(*batch)
+        return sent
+
+    sent = asyncio.run(go())
+    # Sent right after the batch requests that were already dispatched
+    assert sent.index("interactive") <= 5
+    stats = client.pool_stats()["scheduler"]
+    assert stats["classes"]["batch"]["dispatched"] == 20
+    assert stats["classes"]["interactive"]["dispatched"] == 1
+    assert stats["depth"] == 0
+
+
+def test_deadline_fails_fast_without_retrying():
+    session = DummySession(DummyResponse(200, {"type": "search"}))
+    client = BraveClient(api_key="k", session=session, limiter=AdaptiveLimiter(2), scheduler=Scheduler())
+
+    async def go():
+        await client.web_search(WebSearchRequest(q="first"))
+        with scheduling(timeout=0.05):
+            with pytest.raises(DeadlineExceeded):
+                # The limiter's next token is ~0.5s away
+                await client.web_search(WebSearchRequest(q="second"))
+
+    asyncio.run(go())
+    assert [params["q"] for _, params, _ in session.requests] == ["first"]
+
+
+def test_sync_client_carries_scheduling_to_its_loop():
+    seen = []
+
+    class RecordingLimiter(DummyLimiter):
+        async def __aenter__(self):
+            seen.append(current_job())
+
+    session = DummySession(DummyResponse(200, {"type": "search"}))
+    with SyncBraveClient(api_key="k", session=session, limiter=RecordingLimiter(), scheduler=Scheduler()) as client:
+        with scheduling(Priority.BATCH, tenant="etl"):
+            client.web_search(WebSearchRequest(q="k2"))
+        assert threading.current_thread() is threading.main_thread()
+    assert seen[0].priority == Priority.BATCH
+    assert seen[0].tenant == "etl"
+
+
+def test_interactive_call_does_not_join_a_queued_batch_request():
+    session = DummySession(DummyResponse(200, {"type": "search"}))
+    client = BraveClient(api_key="k", session=session, limiter=AdaptiveLimiter(20), scheduler=Scheduler())
+
+    async def go():
+        with scheduling(Priority.BATCH):
+            batch = [asyncio.ensure_future(client.web_search(WebSearchRequest(q=f"b{i}"))) for i in range(20)]
+            batch.append(asyncio.ensure_future(client.web_search(WebSearchRequest(q="hot"))))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        with scheduling(Priority.INTERACTIVE, timeout=0.5):
+            await client.web_search(WebSearchRequest(q="hot"))
+        waited = time.monotonic() - started
+        await asyncio.gather(*batch)
+        return waited
+
+    assert asyncio.run(go()) < 0.3
+    assert client.stats.coalesced == 0
+
+
+def test_joining_caller_is_bounded_by_its_deadline():
+    session = DummySession(DummyResponse(200, {"type": "search"}))
+    client = BraveClient(api_key="k", session=session, limiter=AdaptiveLimiter(20), scheduler=Scheduler())
+
+    async def go():
+        backlog = [asyncio.ensure_future(client.web_search(WebSearchRequest(q=f"n{i}"))) for i in range(20)]
+        backlog.append(asyncio.ensure_future(client.web_search(WebSearchRequest(q="hot"))))
+        await asyncio.sleep(0.01)
+        started = time.monotonic()
+        with scheduling(timeout=0.2):
+            with pytest.raises(DeadlineExceeded):
+                await client.web_search(WebSearchRequest(q="hot"))
+        waited = time.monotonic() - started
+        await asyncio.gather(*backlog)
+        return waited
+
+    assert asyncio.run(go()) < 0.4
+    assert client.stats.coalesced == 1
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from httpobjects import WebSearchRequest
+from lib import BraveClient
+from tests.test_client import DummyLimiter, DummyResponse, DummySession
+from tracing import PrometheusTracer, Tracer
+
+
+def test_default_tracer_is_noop():
+    tracer = Tracer()
+    assert not tracer.enabled
+    with tracer.span("request", endpoint="web"):
+        pass
+    # The same shared object is handed out every time
+    assert tracer.span("a") is tracer.span("b")
+
+
+def test_prometheus_histogram_buckets_and_render():
+    tracer = PrometheusTracer(buckets=(0.01, 0.1))
+    tracer.record("decode", 0.005, endpoint="web")
+    tracer.record("decode", 0.05, endpoint="web")
+    tracer.record("decode", 5.0, endpoint="web")
+    assert tracer.count("decode", "web") == 3
+
+    text = tracer.render()
+    assert "# TYPE brave_client_phase_seconds histogram" in text
+    assert 'brave_client_phase_seconds_bucket{phase="decode",endpoint="web",le="0.01"} 1' in text
+    assert 'brave_client_phase_seconds_bucket{phase="decode",endpoint="web",le="0.1"} 2' in text
+    assert 'brave_client_phase_seconds_bucket{phase="decode",endpoint="web",le="+Inf"} 3' in text
+    assert 'brave_client_phase_seconds_count{phase="decode",endpoint="web"} 3' in text
+
+
+def test_client_reports_request_phases():
+    tracer = PrometheusTracer()
+    session = DummySession(DummyResponse(200, {"type": "search", "query": {"original": "q"}}))
+    client = BraveClient(api_key="key", session=session, limiter=DummyLimiter(), tracer=tracer)
+
+    asyncio.run(client.web_search(WebSearchRequest(q="q")))
+
+    for phase in ("request", "limiter_wait", "response_wait", "body_read", "decode"):
+        assert tracer.count(phase, "web") == 1, phase
+    text = tracer.render(client.stats)
+    assert "brave_client_retries 0" in text
+    assert "brave_client_bytes_received" in text
+
+
+def test_otel_tracer_requires_opentelemetry():
+    pytest.importorskip("opentelemetry")
+    from tracing import OTelTracer
+
+    tracer = OTelTracer()
+    with tracer.span("request", endpoint="web"):
+        tracer.record("decode", 0.001, endpoint="web")
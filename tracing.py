@@ -0,0 +1,178 @@
+"""Instrumentation hooks for the phases of a BraveClient request.
+
+BraveClient reports these phases to its tracer:
+
+* ``request`` - a whole web_search/summarizer_search call, cache and retries included
+* ``limiter_wait`` - waiting for the concurrency cap and the rate limiter
+* ``connection_queue`` - waiting for a free connection in the pool
+* ``connection_create`` - opening a new connection (DNS, TCP, TLS)
+* ``response_wait`` - sending the request until response headers arrive
+* ``body_read`` - reading (and decompressing) the response body
+* ``backoff`` - sleeping before a retry
+* ``decode`` - JSON decoding and model validation
+
+The default Tracer does nothing. PrometheusTracer keeps histograms that can
+be rendered in the Prometheus text format, and OTelTracer forwards spans and
+histograms to OpenTelemetry.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _NoopSpan:
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """No-op tracer. Subclasses set `enabled` and implement `record`."""
+
+    enabled = False
+
+    def record(self, phase: str, seconds: float, **attributes: Any) -> None:
+        """Record a finished phase that took `seconds`."""
+
+    def span(self, phase: str, **attributes: Any) -> Any:
+        """Context manager timing a phase."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return self._timed(phase, attributes)
+
+    @contextmanager
+    def _timed(self, phase: str, attributes: dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, **attributes)
+
+
+class PrometheusTracer(Tracer):
+    """Collects per-phase latency histograms labelled by phase and endpoint."""
+
+    enabled = True
+
+    def __init__(self, namespace: str = "brave_client", buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.namespace = namespace
+        self.buckets = buckets
+        # (phase, endpoint) -> [bucket counts..., sum, count]
+        self._histograms: dict[tuple[str, str], list[float]] = {}
+
+    def record(self, phase: str, seconds: float, **attributes: Any) -> None:
+        key = (phase, str(attributes.get("endpoint", "")))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
+
+    def count(self, phase: str, endpoint: str = "") -> int:
+        histogram = self._histograms.get((phase, endpoint))
+        return int(histogram[-1]) if histogram else 0
+
+    def render(self, stats: Any | None = None) -> str:
+        """Render histograms, and optionally a ClientStats, as Prometheus text."""
+        name = f"{self.namespace}_phase_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each phase of a Brave API request.",
+            f"# TYPE {name} histogram",
+        ]
+        for (phase, endpoint), histogram in sorted(self._histograms.items()):
+            labels = f'phase="{phase}",endpoint="{endpoint}"'
+            for bound, count in zip(self.buckets, histogram, strict=False):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {int(count)}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {int(histogram[-1])}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram[-2]}")
+            lines.append(f"{name}_count{{{labels}}} {int(histogram[-1])}")
+        if stats is not None:
+            for field, value in dataclasses.asdict(stats).items():
+                metric = f"{self.namespace}_{field}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class OTelTracer(Tracer):
+    """Forwards phases to OpenTelemetry as spans and a duration histogram.
+
+    Requires ``opentelemetry-api``; without a configured SDK the calls are
+    cheap no-ops provided by OpenTelemetry itself.
+    """
+
+    enabled = True
+
+    def __init__(self, name: str = "braveapi") -> None:
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as exc:
+            raise ImportError(
+                "OTelTracer requires opentelemetry-api. Install with: pip install opentelemetry-api"
+            ) from exc
+        self._tracer = trace.get_tracer(name)
+        self._histogram = metrics.get_meter(name).create_histogram(
+            "brave_client.phase.duration", unit="s", description="Time spent in each request phase"
+        )
+
+    def record(self, phase: str, seconds: float, **attributes: Any) -> None:
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+        self._histogram.record(seconds, attributes={"phase": phase, **attributes})
+        end = time.time_ns()
+        span = self._tracer.start_span(
+            f"brave.{phase}", start_time=end - int(seconds * 1e9), attributes=attributes
+        )
+        span.end(end_time=end)
+
+    @contextmanager
+    def _timed(self, phase: str, attributes: dict[str, Any]) -> Iterator[None]:
+        # A live span, so phases recorded inside it become its children
+        start = time.perf_counter()
+        with self._tracer.start_as_current_span(f"brave.{phase}", attributes=attributes):
+            try:
+                yield
+            finally:
+                seconds = time.perf_counter() - start
+                self._histogram.record(seconds, attributes={"phase": phase, **attributes})
+
+
+def aiohttp_trace_config(tracer: Tracer) -> Any:
+    """Build an aiohttp TraceConfig reporting connection queueing and creation."""
+    from aiohttp import TraceConfig
+
+    config = TraceConfig()
+
+    def timer(phase: str):
+        async def start(session, ctx, params) -> None:
+            setattr(ctx, phase, time.perf_counter())
+
+        async def end(session, ctx, params) -> None:
+            started = getattr(ctx, phase, None)
+            if started is not None:
+                tracer.record(phase, time.perf_counter() - started)
+
+        return start, end
+
+    queued_start, queued_end = timer("connection_queue")
+    create_start, create_end = timer("connection_create")
+    config.on_connection_queued_start.append(queued_start)
+    config.on_connection_queued_end.append(queued_end)
+    config.on_connection_create_start.append(create_start)
+    config.on_connection_create_end.append(create_end)
+    return config